@@ -0,0 +1,133 @@
+from typing import Optional
+import numpy as np
+import pandas as pd
+from analytical_functions.binning import second_bins
+
+# Способы переноса ряда на сетку времени
+ALIGN_METHODS = ('nearest', 'interp', 'asof')
+
+
+def time_grid(times: list[np.ndarray], step: float = 1.0, how: str = 'outer') -> np.ndarray:
+    """
+    Общая сетка времени k·step для нескольких рядов. Последний узел - конец интервала binning.second_bins,
+    в который попадает самая поздняя точка, как у посекундных рядов и overlay.resample_to_grid.
+    :param times: list[np.ndarray] - время точек каждого ряда.
+    :param how: str - 'outer' - от начала самого раннего до конца самого позднего ряда,
+    'inner' - только общий для всех рядов промежуток.
+    :return: np.ndarray - узлы сетки.
+    """
+    spans = [(np.nanmin(time), np.nanmax(time)) for time in times if np.count_nonzero(~np.isnan(time))]
+    if not spans or (how == 'inner' and len(spans) < len(times)):
+        return np.empty(0, dtype=float)
+    if how == 'outer':
+        low, high = min(span[0] for span in spans), max(span[1] for span in spans)
+    elif how == 'inner':
+        low, high = max(span[0] for span in spans), min(span[1] for span in spans)
+    else:
+        raise ValueError(f'Неизвестный способ построения сетки: {how}')
+    first, last = np.floor(low / step), second_bins(high, step)
+    return np.arange(first, last + 1) * step if last >= first else np.empty(0, dtype=float)
+
+
+def align_to_grid(time: np.ndarray,
+                  values: np.ndarray,
+                  grid: np.ndarray,
+                  method: str = 'nearest',
+                  tolerance: Optional[float] = None) -> np.ndarray:
+    """
+    Перенос ряда на узлы сетки бинарным поиском по отсортированному времени, без объединения по ключу.
+    :param time: np.ndarray - время точек ряда.
+    :param values: np.ndarray - значения точек, одномерный массив или матрица (точки x столбцы).
+    :param grid: np.ndarray - равномерные возрастающие узлы сетки, см. time_grid.
+    :param method: str - 'nearest' - значение ближайшей точки не дальше tolerance (по умолчанию половина шага сетки),
+    'interp' - линейная интерполяция между соседними точками, вне ряда NaN,
+    'asof' - значение последней точки с временем не больше узла и не раньше узла на tolerance
+    (по умолчанию шаг сетки), как pd.merge_asof.
+    :return: np.ndarray - значения в узлах, NaN там, где значения нет.
+    """
+    if method not in ALIGN_METHODS:
+        raise ValueError(f'Неизвестный способ выравнивания: {method}')
+    time = np.asarray(time, dtype=float)
+    values = np.asarray(values, dtype=float)
+    grid = np.asarray(grid, dtype=float)
+    valid = ~np.isnan(time)
+    if not valid.all():
+        time, values = time[valid], values[valid]
+    if time.size > 1 and (np.diff(time) < 0).any():
+        order = np.argsort(time, kind='stable')
+        time, values = time[order], values[order]
+    result = np.full((grid.size,) + values.shape[1:], np.nan)
+    if time.size == 0 or grid.size == 0:
+        return result
+    step = grid[1] - grid[0] if grid.size > 1 else 1.0
+
+    if method == 'interp':
+        inside = (grid >= time[0]) & (grid <= time[-1])
+        if time.size == 1:
+            result[inside] = values[0]
+            return result
+        right = np.clip(np.searchsorted(time, grid[inside], side='left'), 1, time.size - 1)
+        left = right - 1
+        span = time[right] - time[left]
+        weight = np.divide(grid[inside] - time[left], span, out=np.zeros(left.size), where=span > 0)
+        weight = weight.reshape((-1,) + (1,) * (values.ndim - 1))
+        result[inside] = values[left] * (1 - weight) + values[right] * weight
+        return result
+
+    if method == 'asof':
+        tolerance = step if tolerance is None else tolerance
+        index = np.searchsorted(time, grid, side='right') - 1
+        found = index >= 0
+        found[found] = grid[found] - time[index[found]] <= tolerance
+    else:
+        # Сетка равномерная, поэтому ближайший узел точки вычисляется без поиска: round((t - t0) / step)
+        tolerance = step / 2 if tolerance is None else tolerance
+        position = (time - grid[0]) / step
+        node = np.rint(position)
+        distance = np.abs(position - node) * step
+        keep = (node >= 0) & (node < grid.size) & (distance <= tolerance)
+        node = node.astype(np.int64)
+        if not keep.all():
+            point = np.flatnonzero(keep)
+            node, distance, values = node[point], distance[point], values[point]
+        if node.size > 1 and (np.diff(node) == 0).any():
+            # В узел попало несколько точек: остается ближайшая (при равенстве - более ранняя)
+            order = np.lexsort((distance, node))
+            order = order[np.concatenate(([True], np.diff(node[order]) != 0))]
+            node, values = node[order], values[order]
+        result[node] = values
+        return result
+    result[found] = values[index[found]]
+    return result
+
+
+def align_frames(frames: list[pd.DataFrame],
+                 method: str = 'nearest',
+                 step: float = 1.0,
+                 how: str = 'outer',
+                 tolerance: Optional[float] = None) -> pd.DataFrame:
+    """
+    Объединение таблиц с общим столбцом Time на общей сетке времени с шагом step.
+    Заменяет pd.merge(how='outer', on='Time') по времени с плавающей точкой: точки с почти равным временем
+    попадают в одну строку, а не в разные строки с NaN. Узлы, в которых нет значений ни одной таблицы, не выводятся.
+    :param frames: list[pd.DataFrame] - таблицы со столбцом Time и столбцами значений, имена столбцов
+    значений не должны повторяться.
+    :param method: str - способ выравнивания, см. align_to_grid.
+    :param how: str - сетка по всем рядам ('outer') или только по общему промежутку ('inner'), см. time_grid.
+    :return: pd.DataFrame - столбец Time и столбцы значений всех таблиц.
+    """
+    grid = time_grid([frame['Time'].to_numpy(dtype=float) for frame in frames], step, how)
+    filled = np.zeros(grid.size, dtype=bool)
+    columns = {'Time': grid}
+    for frame in frames:
+        names = [name for name in frame.columns if name != 'Time']
+        aligned = align_to_grid(frame['Time'].to_numpy(dtype=float), frame[names].to_numpy(dtype=float), grid,
+                                method, tolerance)
+        filled |= ~np.isnan(aligned).all(axis=1)
+        for number, name in enumerate(names):
+            if name in columns:
+                raise ValueError(f'Столбец {name} есть в нескольких таблицах')
+            columns[name] = aligned[:, number]
+    if not filled.all():
+        columns = {name: values[filled] for name, values in columns.items()}
+    return pd.DataFrame(columns)
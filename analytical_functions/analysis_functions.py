@@ -3,89 +3,44 @@ import numpy as np
 import re
 import pandas as pd
 from analytical_functions.constant import dict_rename_coating, dict_rename_material
+from analytical_functions.time_processing import processing_time, adding_time_in_temperature, pass_bounds
+from analytical_functions.baseline import correct_baseline
+from analytical_functions.regression import least_squares, trimmed_least_squares
 from typing import Optional
 from pprint import pprint
 import os
 
 
-def processing_time(start_time: np.ndarray) -> np.ndarray:
-    """
-    :param start_time: np.ndarray: Необработанное время после соединения данных в один файл.
-    :return: np.ndarray - Обработанное время, которое учитывает простои при фрезеровании
-    """
-    if any(elem < 0 for elem in start_time):
-        raise ValueError("Некорректное время")
-    start_time_shift: np.ndarray = np.insert(start_time, 0, start_time[0])
-    start_time_shift: np.ndarray = np.delete(start_time_shift, start_time_shift.size - 1)
-    new_time: np.ndarray = start_time - start_time_shift
-    # Получаем новое время, которое будем складывать
-    for i in range(new_time.size):
-        if new_time[i] < 0:
-            new_time[i] = 0
-    processed_time = np.arange(new_time.size, dtype=float)
-    for i in range(new_time.size):
-        processed_time[i] = new_time[:i + 1].sum()
-    return processed_time
-
-
-def adding_time_in_temperature(arr: np.ndarray, processing_time_: Optional[float] = None) -> np.ndarray:
-    """
-    Изнанчально в данных о температуре нет времени, так как при фрезеровании время не записывалось в файл.
-    Поэтому мы создаем столбец со временем, в зависимости от данных, которые записывались в файл сил.
-
-    :param processing_time_: Время обработки
-    :param arr: nd.ndarray[None],со временем из данных о температуре
-    :return: np.ndarray со временем для температуры.
-    """
-    # Вычисляем время, берем суммарное время
-    # обработки и делим на величину массива и умножаем на шаг
-
-    if processing_time_:
-        for i in range(arr.size):
-            arr[i] = (processing_time_ / arr.size) * i
-        return arr
-    else:
-        for i in range(arr.size):
-            arr[i] = 0.28 * i
-    return arr
-
-
-def determination_zero_strength(strength_dataframe: pd.DataFrame, min_strength: float) -> List[pd.DataFrame]:
+def determination_zero_strength(strength_dataframe: pd.DataFrame, min_strength: float,
+                                estimator: str = 'median') -> pd.DataFrame:
     """
     При записи разных проходов настроки устройства сбиваются, из-за чего силы в состоянии покоя показываются разные,
-    данная функция вычисляет эту сила состояния покоя и прибавляет ее ко всем данным об этом проходе.
-    :param strength_dataframe: Список DataFrame с данными о силе
+    данная функция вычисляет эту сила состояния покоя и вычитает ее из всех данных об этом проходе.
+    :param strength_dataframe: DataFrame с данными о силе
     :param min_strength: Минимальная сила, меньше которой мы считаем обработка не происходит.
-    :return: Измененный DataFrame где к прибавлена константа нуля.
+    :param estimator: Способ оценки силы покоя, см. baseline.BASELINE_ESTIMATORS.
+    :return: Новый DataFrame с учтенным нулем, исходный не изменяется.
     """
-    try:
-        first_index = strength_dataframe.loc[strength_dataframe['Fy'] > min_strength].index.values[0]
-        median_const = strength_dataframe['Fy'][:first_index].sort_values().median()
-        strength_dataframe['Fy'] = strength_dataframe['Fy'] - median_const
-        return strength_dataframe
-    except IndexError:
-        raise IndexError(f'В одном из файлов нет сил > {min_strength}')
+    return determination_zero_strength_list([strength_dataframe], min_strength, estimator)[0]
 
 
-def determination_zero_strength_list(list_strenght_dataframe: List[pd.DataFrame], min_strength: float) -> \
-        List[pd.DataFrame]:
+def determination_zero_strength_list(list_strenght_dataframe: List[pd.DataFrame], min_strength: float,
+                                     estimator: str = 'median') -> List[pd.DataFrame]:
     """
     При записи разных проходов настроки устройства сбиваются, из-за чего силы в состоянии покоя показываются разные,
-    данная функция вычисляет эту сила состояния покоя и прибавляет ее ко всем данным об этом проходе.
+    данная функция вычисляет эту сила состояния покоя и вычитает ее из всех данных об этом проходе.
+    Силы всех проходов обрабатываются одним массивом, см. baseline.correct_baseline.
     :param list_strenght_dataframe: Список DataFrame с данными о силе
     :param min_strength: Минимальная сила, меньше которой мы считаем обработка не происходит.
-    :return: Новый список с измененными Таблицами DataFrame где к прибавлена константа нуля.
+    :param estimator: Способ оценки силы покоя, см. baseline.BASELINE_ESTIMATORS.
+    :return: Новый список с новыми Таблицами DataFrame с учтенным нулем, исходные таблицы не изменяются.
     """
-    new_list_dataframe: list[pd.DataFrame] = []
-    for data_frame_strength in list_strenght_dataframe:
-        try:
-            first_index = data_frame_strength.loc[data_frame_strength['Fy'] > min_strength].index.values[0]
-            median_const = data_frame_strength['Fy'][:first_index].sort_values().median()
-            data_frame_strength['Fy'] = data_frame_strength['Fy'] - median_const
-            new_list_dataframe.append(data_frame_strength)
-        except IndexError:
-            raise IndexError(f'В одном из файлов нет сил > {min_strength}')
-    return new_list_dataframe
+    list_fy = [data_frame['Fy'].to_numpy(dtype=float) for data_frame in list_strenght_dataframe]
+    bounds = pass_bounds(list_fy)
+    fy = correct_baseline(np.concatenate(list_fy) if list_fy else np.zeros(0), bounds, min_strength, estimator)
+    sizes = [elem.size for elem in list_fy]
+    return [data_frame.assign(Fy=part) for data_frame, part in
+            zip(list_strenght_dataframe, np.split(fy, np.cumsum(sizes)[:-1]))]
 
 
 def add_names_fields(data: pd.DataFrame) -> pd.DataFrame:
@@ -101,21 +56,7 @@ def determining_coefficients(dataframe: pd.DataFrame) -> tuple[float, float]:
     :param dataframe: pd.DataFrame
     :return: tuple (w0, w1), коэффициенты для прямой.
     """
-    x = dataframe[dataframe.columns[0]].to_numpy()
-    y = dataframe[dataframe.columns[1]].to_numpy()
-    size = len(x)
-    avg_x = sum(x) / size
-    avg_y = sum(y) / size
-    avg_xy = sum(x[i] * y[i] for i in range(0, size)) / size
-
-    std_x = (sum((x[i] - avg_x) ** 2 for i in range(0, size)) / size) ** 0.5
-    std_y = (sum((y[i] - avg_y) ** 2 for i in range(0, size)) / size) ** 0.5
-
-    corr_xy = (avg_xy - avg_x * avg_y) / (std_x * std_y)
-    w1 = corr_xy * std_y / std_x
-    w0 = avg_y - avg_x * w1
-
-    return w0, w1
+    return least_squares(dataframe.iloc[:, 0].to_numpy(), dataframe.iloc[:, 1].to_numpy())
 
 
 def determining_coefficient_without_bad_data(data: pd.DataFrame, percent: float = 0.22) -> tuple[float, float]:
@@ -127,40 +68,18 @@ def determining_coefficient_without_bad_data(data: pd.DataFrame, percent: float
     :param percent: Процент отбрасываемых данных.
     :return: tuple (w0, w1), коэффициенты для прямой.
     """
-    kol_minus = int(np.ceil(len(data) * percent))
-    w1, w2 = determining_coefficients(data)
-
-    x = data.iloc[:, 0]
-    data = data.copy()
-    data['Result'] = predict(w1, w2, x)
-
-    y_1 = data.iloc[:, 1]
-    y_2 = data.iloc[:, 2]
-    data['fail'] = quadratic_error(y_1, y_2)
-
-    for i in range(kol_minus):
-        data = data.sort_values(by='fail', ascending=False).iloc[1:].copy()
-        data = data.sort_values(by=data.columns[0], ascending=True)
-        w1, w2 = determining_coefficients(data)
-        x = data.iloc[:, 0]
-        data['Result'] = predict(w1, w2, x)
-        y_1 = data.iloc[:, 1]
-        y_2 = data.iloc[:, 2]
-        data['fail'] = quadratic_error(y_1, y_2)
-    return w1, w2
+    return trimmed_least_squares(data.iloc[:, 0].to_numpy(), data.iloc[:, 1].to_numpy(), percent)
 
 
-def predict(w1: float, w2: float, x_scale: pd.Series) -> List[np.float64 | Any]:
+def predict(w1: float, w2: float, x_scale: pd.Series) -> np.ndarray:
     """
     Построение прямой в с помщью коэффициентов.
     :param w1: свободный коэффициент прямой.
     :param w2: коэффициент роста прямой.
-    :param x_scale: list[np.float64], значения времени.
-    :return: list[np.float64], список предсказанных значений.
+    :param x_scale: pd.Series, значения времени.
+    :return: np.ndarray, предсказанные значения.
     """
-    x_scale = x_scale.to_numpy()
-    y_pred = [w1 + x_scale[i] * w2 for i in range(len(x_scale))]
-    return y_pred
+    return w1 + np.asarray(x_scale, dtype=float) * w2
 
 
 def quadratic_error(x: pd.Series, y: pd.Series) -> np.ndarray:
@@ -240,7 +159,7 @@ def list_all_path_strength_temperature(path: str) -> List[str]:
     all_files_and_dirs = os.walk(path)
     list_path = []
     for path, dirs, files in all_files_and_dirs:
-        if dirs == ['Силы', 'Температура']:
+        if sorted(dirs) == ['Силы', 'Температура']:
             strength = os.path.join(path, 'Силы').replace('\\', '/')
             temperature = os.path.join(path, 'Температура').replace('\\', '/')
             list_path.append((strength, temperature))
@@ -0,0 +1,131 @@
+from typing import Callable, Optional
+import numpy as np
+from analytical_functions.regression import least_squares
+
+# Доля значений, отбрасываемых с каждой стороны в trimmed_mean_baseline
+TRIM_PROPORTION = 0.1
+
+
+def median_baseline(idle: np.ndarray) -> tuple[float, float]:
+    """
+    Ноль сил - медиана точек до начала обработки, пропуски (NaN) не учитываются, как в pd.Series.median.
+    :param idle: np.ndarray - силы прохода до первого превышения минимальной силы.
+    :return: tuple (w0, w1) - ноль в точке с номером i равен w0 + w1·i, здесь w1 = 0.
+    """
+    return float(np.nanmedian(idle)), 0.0
+
+
+def trimmed_mean_baseline(idle: np.ndarray, proportion: float = TRIM_PROPORTION) -> tuple[float, float]:
+    """
+    Ноль сил - среднее точек до начала обработки без доли proportion наименьших и наибольших значений.
+    Для отбора используется np.partition без полной сортировки.
+    """
+    idle = idle[~np.isnan(idle)]
+    cut = int(idle.size * proportion)
+    if cut == 0:
+        return float(idle.mean()), 0.0
+    return float(np.partition(idle, (cut, idle.size - cut - 1))[cut:idle.size - cut].mean()), 0.0
+
+
+def linear_drift_baseline(idle: np.ndarray) -> tuple[float, float]:
+    """
+    Ноль сил с линейным дрейфом: прямая МНК по точкам до начала обработки от номера точки в проходе,
+    продолженная на весь проход. Если точек меньше двух, используется медиана.
+    """
+    positions = np.flatnonzero(~np.isnan(idle))
+    if positions.size < 2:
+        return median_baseline(idle)
+    return least_squares(positions, idle[positions])
+
+
+BASELINE_ESTIMATORS: dict[str, Callable[[np.ndarray], tuple[float, float]]] = {
+    'median': median_baseline,
+    'trimmed_mean': trimmed_mean_baseline,
+    'linear': linear_drift_baseline,
+}
+DEFAULT_ESTIMATOR = 'median'
+
+
+def first_crossings(values: np.ndarray, bounds: np.ndarray, threshold: float | int) -> np.ndarray:
+    """
+    Номера первых точек каждого прохода со значением больше threshold за один проход по массиву.
+    :param values: np.ndarray - значения всех проходов в объединенном массиве.
+    :param bounds: np.ndarray - индексы начала проходов (см. time_processing.pass_bounds).
+    :param threshold: float - порог.
+    :return: np.ndarray - номера точек относительно начала прохода.
+    """
+    bounds = np.asarray(bounds, dtype=np.int64)
+    ends = np.append(bounds[1:], values.size)
+    above = values > threshold
+    # Начала участков превышения порога: превышение в начале прохода или после точки без превышения.
+    # Таких точек намного меньше, чем точек выше порога, поэтому массив индексов остается маленьким.
+    rising = np.empty_like(above)
+    rising[:1] = above[:1]
+    np.greater(above[1:], above[:-1], out=rising[1:])
+    rising[bounds[bounds < values.size]] = above[bounds[bounds < values.size]]
+    starts = np.flatnonzero(rising)
+    first = np.append(starts, values.size)[np.searchsorted(starts, bounds)]
+    if (first >= ends).any():
+        raise IndexError(f'В одном из файлов нет сил > {threshold}')
+    return first - bounds
+
+
+def pass_baselines(values: np.ndarray,
+                   bounds: np.ndarray,
+                   threshold: float | int,
+                   estimator: str = 'median') -> np.ndarray:
+    """
+    Ноль сил каждого прохода по точкам до начала обработки. Оценка считается по срезам объединенного
+    массива без копирования проходов.
+    Если проход начинается с превышения порога, точек покоя нет и ноль равен NaN.
+    :param estimator: str - способ оценки нуля из BASELINE_ESTIMATORS.
+    :return: np.ndarray - массив (количество проходов, 2) с коэффициентами (w0, w1) нуля каждого прохода.
+    """
+    if estimator not in BASELINE_ESTIMATORS:
+        raise KeyError(f'Нет способа оценки нуля: {estimator}')
+    estimate = BASELINE_ESTIMATORS[estimator]
+    bounds = np.asarray(bounds, dtype=np.int64)
+    first = first_crossings(values, bounds, threshold)
+    coefficients = np.full((bounds.size, 2), np.nan)
+    for number, (start, count) in enumerate(zip(bounds.tolist(), first.tolist())):
+        if count:
+            coefficients[number] = estimate(values[start:start + count])
+    return coefficients
+
+
+def subtract_baseline(values: np.ndarray,
+                      coefficients: tuple[float, float],
+                      start: int = 0,
+                      out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Вычитание нуля w0 + w1·i из значений, начинающихся с точки start прохода.
+    :param out: np.ndarray - массив для результата, по умолчанию создается новый.
+    :return: np.ndarray - массив с результатом.
+    """
+    w0, w1 = coefficients
+    out = np.subtract(values, w0, out=out)
+    if w1 != 0:
+        out -= w1 * np.arange(start, start + values.size, dtype=float)
+    return out
+
+
+def correct_baseline(values: np.ndarray,
+                     bounds: np.ndarray,
+                     threshold: float | int,
+                     estimator: str = 'median') -> np.ndarray:
+    """
+    Учет нуля сил во всех проходах объединенного массива.
+    :param values: np.ndarray - силы всех проходов.
+    :param bounds: np.ndarray - индексы начала проходов (см. time_processing.pass_bounds).
+    :param threshold: float - минимальная сила, меньше которой обработка не происходит.
+    :param estimator: str - способ оценки нуля из BASELINE_ESTIMATORS.
+    :return: np.ndarray - новый массив сил, исходный не изменяется.
+    """
+    values = np.asarray(values, dtype=float)
+    bounds = np.asarray(bounds, dtype=np.int64)
+    coefficients = pass_baselines(values, bounds, threshold, estimator)
+    result = np.empty_like(values)
+    ends = np.append(bounds[1:], values.size)
+    for start, end, pass_coefficients in zip(bounds.tolist(), ends.tolist(), coefficients.tolist()):
+        subtract_baseline(values[start:end], pass_coefficients, out=result[start:end])
+    return result
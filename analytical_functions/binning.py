@@ -0,0 +1,132 @@
+from typing import Iterable
+import numpy as np
+import pandas as pd
+
+# Статистики интервала: имя -> суффикс столбца в таблице результата
+STATISTICS = {
+    'mean': '',
+    'max': '_max',
+    'std': '_std',
+    'count': '_count',
+}
+
+
+def second_bins(time: np.ndarray, step: float = 1.0) -> np.ndarray:
+    """
+    Номер интервала точки: ceil(t / step), как при groupby по округленному вверх времени.
+    Интервал k содержит точки (k-1)*step < t <= k*step. Эти же границы используют overlay и alignment.
+    """
+    return np.ceil(time if step == 1.0 else time / step).astype(np.int64)
+
+
+class SecondBins:
+    """
+    Накопление статистик по секундным интервалам без хранения исходных точек.
+    Точка со временем t попадает в интервал ceil(t / step), как при groupby по округленному вверх времени,
+    точки с NaN во времени или значении не учитываются.
+    Для каждого интервала хранятся количество точек, сумма, максимум и сумма квадратов отклонений от среднего,
+    все считается через np.bincount и np.maximum.at без сортировки и вызовов Python на каждую точку.
+    Суммы квадратов отклонений частей объединяются по формуле Чана, поэтому std не теряет точность
+    при больших значениях. Память пропорциональна длительности испытания в секундах, а не количеству точек.
+    """
+
+    def __init__(self, step: float = 1.0):
+        """
+        :param step: float - длина интервала в секундах.
+        """
+        self.step = step
+        self.sums = np.zeros(0, dtype=float)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.maxs = np.zeros(0, dtype=float)
+        self.squares = np.zeros(0, dtype=float)
+
+    def _grow(self, size: int) -> None:
+        size = max(size, 2 * self.counts.size)
+        extra = size - self.counts.size
+        self.sums = np.concatenate((self.sums, np.zeros(extra)))
+        self.counts = np.concatenate((self.counts, np.zeros(extra, dtype=np.int64)))
+        self.maxs = np.concatenate((self.maxs, np.full(extra, -np.inf)))
+        self.squares = np.concatenate((self.squares, np.zeros(extra)))
+
+    def add(self, time: np.ndarray, values: np.ndarray) -> None:
+        """
+        :param time: np.ndarray - неотрицательное время точек.
+        :param values: np.ndarray - значения точек.
+        """
+        valid = ~(np.isnan(time) | np.isnan(values))
+        if not valid.all():
+            time, values = time[valid], values[valid]
+        if time.size == 0:
+            return
+        bins = second_bins(time, self.step)
+        low, high = bins.min(), bins.max()
+        if high >= self.counts.size:
+            self._grow(high + 1)
+        bins -= low
+        size = high - low + 1
+        sums = np.bincount(bins, weights=values, minlength=size)
+        counts = np.bincount(bins, minlength=size)
+        filled = counts > 0
+        means = np.divide(sums, counts, out=np.zeros(size), where=filled)
+        squares = np.bincount(bins, weights=(values - means[bins]) ** 2, minlength=size)
+
+        part = slice(low, high + 1)
+        old_counts = self.counts[part]
+        old_means = np.divide(self.sums[part], old_counts, out=np.zeros(size), where=old_counts > 0)
+        total = old_counts + counts
+        correction = np.divide((means - old_means) ** 2 * old_counts * counts, total,
+                               out=np.zeros(size), where=(old_counts > 0) & filled)
+        self.squares[part] += squares + correction
+        self.sums[part] += sums
+        self.counts[part] = total
+        np.maximum.at(self.maxs, bins + low, values)
+
+    def means(self) -> np.ndarray:
+        """
+        Средние значения интервалов от 0 до последнего интервала с точками без округления,
+        пустые интервалы - NaN.
+        """
+        filled = np.flatnonzero(self.counts)
+        size = filled[-1] + 1 if filled.size else 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.sums[:size] / self.counts[:size]
+
+    def frame(self, column: str, statistics: Iterable[str] = ('mean',)) -> pd.DataFrame:
+        """
+        :param column: str - имя столбца со средними значениями.
+        :param statistics: Iterable[str] - статистики из STATISTICS. Среднее записывается в столбец column,
+        остальные - в столбцы column + суффикс (например Fy_max). std - выборочное стандартное отклонение
+        (ddof=1, как у groupby().std()), для интервала из одной точки - NaN.
+        Среднее, максимум и std округляются до сотых.
+        :return: pd.DataFrame - столбцы Time (конец интервала, k*step) и статистики только для непустых интервалов.
+        """
+        unknown = set(statistics) - set(STATISTICS)
+        if unknown:
+            raise KeyError(f'Нет статистик: {", ".join(sorted(unknown))}')
+        filled = np.flatnonzero(self.counts)
+        counts = self.counts[filled]
+        columns = {'Time': filled * float(self.step)}
+        for name in statistics:
+            if name == 'mean':
+                values = np.round(self.sums[filled] / counts, 2)
+            elif name == 'max':
+                values = np.round(self.maxs[filled], 2)
+            elif name == 'std':
+                values = np.round(np.sqrt(self.squares[filled] / np.where(counts > 1, counts - 1, np.nan)), 2)
+            else:
+                values = counts.copy()
+            columns[column + STATISTICS[name]] = values
+        return pd.DataFrame(columns)
+
+
+def bin_statistics(time: np.ndarray,
+                   values: np.ndarray,
+                   column: str,
+                   statistics: Iterable[str] = ('mean',)) -> pd.DataFrame:
+    """
+    Статистики значений по секундным интервалам за один вызов, см. SecondBins.frame.
+    Заменяет data_frame.groupby(np.ceil(time)).agg([...]) с округлением.
+    """
+    bins = SecondBins()
+    bins.add(np.asarray(time, dtype=float), np.asarray(values, dtype=float))
+    return bins.frame(column, statistics)
@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from typing import Callable, Hashable
+import numpy as np
+
+
+class DecimationPyramid:
+    """
+    Пирамида min/max для быстрого отображения длинных рядов.
+    Уровень k хранит для каждого интервала из 2**k соседних точек индексы минимума и максимума,
+    каждый следующий уровень строится из предыдущего попарным сравнением, всего за O(n).
+    Для видимого диапазона выбирается уровень, у которого интервалов не больше ширины графика в пикселях,
+    и для каждого интервала выводятся его минимум и максимум в порядке следования.
+    Так огибающая ряда на экране совпадает с огибающей полного ряда.
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray):
+        """
+        :param x: np.ndarray - возрастающие значения по оси x (время).
+        :param y: np.ndarray - значения ряда, точки с NaN отбрасываются.
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        valid = ~(np.isnan(x) | np.isnan(y))
+        self.x = x[valid]
+        self.y = y[valid]
+        index = np.arange(self.x.size)
+        self.levels: list[tuple[np.ndarray, np.ndarray]] = [(index, index)]
+        while self.levels[-1][0].size > 1:
+            self.levels.append(self._next_level(*self.levels[-1]))
+
+    def _next_level(self, min_index: np.ndarray, max_index: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        if min_index.size % 2:
+            min_index = np.append(min_index, min_index[-1])
+            max_index = np.append(max_index, max_index[-1])
+        left_min, right_min = min_index[0::2], min_index[1::2]
+        left_max, right_max = max_index[0::2], max_index[1::2]
+        return (np.where(self.y[left_min] <= self.y[right_min], left_min, right_min),
+                np.where(self.y[left_max] >= self.y[right_max], left_max, right_max))
+
+    def __len__(self):
+        return self.x.size
+
+    def bounds(self) -> tuple[float, float, float, float]:
+        """
+        Границы полного ряда: (x_min, x_max, y_min, y_max), для пустого ряда - NaN.
+        """
+        if self.x.size == 0:
+            return np.nan, np.nan, np.nan, np.nan
+        min_index, max_index = self.levels[-1]
+        return self.x[0], self.x[-1], self.y[min_index[0]], self.y[max_index[0]]
+
+    def view(self, x_min: float = -np.inf, x_max: float = np.inf, width: int = 2000) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Прореженные точки ряда для диапазона [x_min, x_max].
+        По одной точке за границами диапазона добавляется, чтобы линия доходила до краев графика.
+        :param x_min: float - левая граница видимого диапазона.
+        :param x_max: float - правая граница видимого диапазона.
+        :param width: int - ширина графика в пикселях, точек выводится не больше 2 * width.
+        :return: tuple(np.ndarray, np.ndarray) - значения x и y.
+        """
+        start = max(int(np.searchsorted(self.x, x_min, side='left')) - 1, 0)
+        stop = min(int(np.searchsorted(self.x, x_max, side='right')) + 1, self.x.size)
+        level = 0
+        while (stop - start) >> level > max(width, 1):
+            level += 1
+        if level == 0:
+            return self.x[start:stop], self.y[start:stop]
+        min_index, max_index = self.levels[level]
+        buckets = slice(start >> level, ((stop - 1) >> level) + 1)
+        min_index, max_index = min_index[buckets], max_index[buckets]
+        index = np.empty(2 * min_index.size, dtype=np.int64)
+        index[0::2] = np.minimum(min_index, max_index)
+        index[1::2] = np.maximum(min_index, max_index)
+        return self.x[index], self.y[index]
+
+
+class PyramidCache:
+    """
+    Кэш пирамид последних просмотренных рядов (LRU), чтобы повторный показ эксперимента не строил пирамиду заново.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self.items: OrderedDict[Hashable, DecimationPyramid] = OrderedDict()
+
+    def get(self, key: Hashable, build: Callable[[], DecimationPyramid]) -> DecimationPyramid:
+        """
+        :param key: ключ ряда, например (unique_id, столбец).
+        :param build: функция построения пирамиды, вызывается при отсутствии ключа в кэше.
+        :return: DecimationPyramid
+        """
+        if key in self.items:
+            self.items.move_to_end(key)
+            return self.items[key]
+        pyramid = self.items[key] = build()
+        if len(self.items) > self.maxsize:
+            self.items.popitem(last=False)
+        return pyramid
+
+    def clear(self) -> None:
+        self.items.clear()
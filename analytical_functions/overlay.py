@@ -0,0 +1,66 @@
+from typing import Hashable, Optional
+import numpy as np
+from analytical_functions.binning import SecondBins
+
+
+def resample_to_grid(time: np.ndarray, values: np.ndarray, step: float = 1.0) -> np.ndarray:
+    """
+    Перенос ряда на сетку времени 0, step, 2*step, ...: значение узла k - среднее точек ряда
+    с временем в интервале (k-1)*step < t <= k*step, как при усреднении по секундам (binning.SecondBins).
+    Узлы без точек заполняются NaN, точки с NaN не учитываются.
+    :param time: np.ndarray - неотрицательное время точек.
+    :param values: np.ndarray - значения точек.
+    :param step: float - шаг сетки в секундах.
+    :return: np.ndarray - значения в узлах от 0 до последнего узла с данными.
+    """
+    bins = SecondBins(step)
+    bins.add(np.asarray(time, dtype=float), np.asarray(values, dtype=float))
+    return bins.means()
+
+
+class AlignedGrid:
+    """
+    Общая сетка времени для сравнения нескольких экспериментов.
+    Каждый ряд переносится на сетку один раз при добавлении и хранится в кэше по ключу,
+    поэтому добавление или удаление эксперимента не пересчитывает остальные.
+    Матрица рядов (эксперимент x узел сетки) собирается из кэша, короткие ряды дополняются NaN.
+    """
+
+    def __init__(self, step: float = 1.0):
+        """
+        :param step: float - шаг сетки в секундах.
+        """
+        self.step = step
+        self.rows: dict[Hashable, dict[str, np.ndarray]] = {}
+
+    def add(self, key: Hashable, column: str, time: np.ndarray, values: np.ndarray) -> None:
+        """
+        Перенос ряда column эксперимента key на сетку, если его еще нет в кэше.
+        """
+        columns = self.rows.setdefault(key, {})
+        if column not in columns:
+            columns[column] = resample_to_grid(time, values, self.step)
+
+    def remove(self, key: Hashable) -> None:
+        self.rows.pop(key, None)
+
+    def __contains__(self, key: Hashable):
+        return key in self.rows
+
+    def keys(self) -> list:
+        return list(self.rows)
+
+    def matrix(self, column: str, keys: Optional[list] = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Ряды column на общей сетке.
+        :param column: str - имя ряда, например 'Fy' или 'Temperature'.
+        :param keys: list - ключи экспериментов в нужном порядке, по умолчанию все в порядке добавления.
+        :return: tuple(np.ndarray, np.ndarray) - узлы сетки (L,) и матрица значений (N, L).
+        """
+        keys = self.keys() if keys is None else keys
+        rows = [self.rows[key].get(column, np.empty(0)) for key in keys]
+        length = max((row.size for row in rows), default=0)
+        matrix = np.full((len(rows), length), np.nan)
+        for number, row in enumerate(rows):
+            matrix[number, :row.size] = row
+        return np.arange(length) * self.step, matrix
@@ -0,0 +1,95 @@
+import numpy as np
+
+
+def _coefficients(count: int, sum_x: float, sum_y: float, sum_xy: float, sum_xx: float) -> tuple[float, float]:
+    """
+    Коэффициенты прямой по достаточным статистикам выборки.
+    :return: tuple (w0, w1), коэффициенты для прямой.
+    """
+    w1 = (count * sum_xy - sum_x * sum_y) / (count * sum_xx - sum_x * sum_x)
+    w0 = (sum_y - w1 * sum_x) / count
+    return w0, w1
+
+
+def least_squares(x: np.ndarray, y: np.ndarray) -> tuple[float, float]:
+    """
+    Нахождение коэффициентов прямой методом наименьших квадратов(МНК).
+    :param x: np.ndarray, значения времени.
+    :param y: np.ndarray, значения силы(температуры).
+    :return: tuple (w0, w1), коэффициенты для прямой.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    avg_x = x.mean()
+    avg_y = y.mean()
+    dx = x - avg_x
+    w1 = float(np.dot(dx, y - avg_y) / np.dot(dx, dx))
+    w0 = float(avg_y - avg_x * w1)
+    return w0, w1
+
+
+def trimmed_least_squares(x: np.ndarray, y: np.ndarray, percent: float = 0.22) -> tuple[float, float]:
+    """
+    МНК без наиболее худших данных.
+    На каждой итерации отбрасывается одна точка с наибольшей ошибкой относительно текущей прямой,
+    после чего прямая пересчитывается. Суммы Σx, Σy, Σxy, Σx² обновляются при удалении точки за O(1).
+
+    Ошибки не пересчитываются для всех точек на каждой итерации: точки отсортированы по ошибке относительно
+    опорной прямой, а ошибка относительно текущей прямой отличается от опорной не более чем на
+    drift = |Δw0| + |Δw1|·max|x|. Поэтому наибольшая ошибка может быть только у точек, чья опорная ошибка
+    не меньше максимальной опорной минус 2·drift. Когда таких точек становится много, опорная прямая обновляется.
+    Для устойчивости суммы считаются по данным, смещенным на их средние значения.
+
+    :param x: np.ndarray, значения времени.
+    :param y: np.ndarray, значения силы(температуры).
+    :param percent: Процент отбрасываемых данных.
+    :return: tuple (w0, w1), коэффициенты для прямой.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    kol_minus = int(np.ceil(x.size * percent))
+    x0 = x.mean()
+    y0 = y.mean()
+    xc = x - x0
+    yc = y - y0
+
+    count = x.size
+    sum_x = xc.sum()
+    sum_y = yc.sum()
+    sum_xy = np.dot(xc, yc)
+    sum_xx = np.dot(xc, xc)
+    w0, w1 = _coefficients(count, sum_x, sum_y, sum_xy, sum_xx)
+
+    x_max = np.abs(xc).max() if x.size else 0.0
+    removed = np.zeros(x.size, dtype=bool)
+    order = None
+    for _ in range(kol_minus):
+        if order is None:
+            w0_ref, w1_ref = w0, w1
+            alive = np.flatnonzero(~removed)
+            error_ref = np.abs(yc[alive] - w0 - w1 * xc[alive])
+            sort = np.argsort(-error_ref, kind='stable')
+            order = alive[sort]
+            error_ref = -error_ref[sort]
+            first = 0
+        while removed[order[first]]:
+            first += 1
+        drift = abs(w0 - w0_ref) + abs(w1 - w1_ref) * x_max
+        threshold = error_ref[first] + 2 * drift + 1e-9 * (1 - error_ref[first])
+        stop = int(np.searchsorted(error_ref, threshold, side='right'))
+        candidates = order[first:stop]
+        candidates = candidates[~removed[candidates]]
+        error = np.abs(yc[candidates] - w0 - w1 * xc[candidates])
+        i = candidates[np.argmax(error)]
+
+        removed[i] = True
+        count -= 1
+        sum_x -= xc[i]
+        sum_y -= yc[i]
+        sum_xy -= xc[i] * yc[i]
+        sum_xx -= xc[i] * xc[i]
+        w0, w1 = _coefficients(count, sum_x, sum_y, sum_xy, sum_xx)
+        if stop - first > max(64, order.size // 16):
+            order = None
+
+    return float(y0 + w0 - w1 * x0), float(w1)
@@ -0,0 +1,97 @@
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+from analytical_functions.binning import SecondBins
+
+
+class StrengthStream:
+    """
+    Потоковая обработка проходов с силой: отбор точек Fy > min_strength, восстановление времени обработки
+    и усреднение по секундам. Проходы и их части подаются по очереди, в памяти хранится только
+    текущая часть и секундные суммы. Результат совпадает с processing_time и groupby по секундам
+    для объединенной таблицы всех проходов, в том числе приращение времени на границе проходов.
+    """
+
+    def __init__(self, min_strength: float | int):
+        self.min_strength = min_strength
+        self.bins = SecondBins()
+        self.passes = 0
+        self.total_time = 0.0
+        # Исходное время последней отобранной точки предыдущих проходов
+        self.last_time: Optional[float] = None
+
+    def add_pass(self, chunks: Iterable[pd.DataFrame]) -> None:
+        """
+        :param chunks: Iterable[pd.DataFrame] - последовательные части одного прохода со столбцами Time и Fy,
+        ноль сил уже учтен.
+        """
+        for chunk in chunks:
+            fy = chunk['Fy'].to_numpy()
+            mask = fy > self.min_strength
+            start_time = chunk['Time'].to_numpy()[mask]
+            if start_time.size == 0:
+                continue
+            if (start_time < 0).any():
+                raise ValueError("Некорректное время")
+            new_time = np.diff(start_time, prepend=start_time[0] if self.last_time is None else self.last_time)
+            np.maximum(new_time, 0, out=new_time)
+            # Накопление продолжается с предыдущей части в том же порядке сложения, что и cumsum по всему массиву
+            new_time = np.cumsum(np.concatenate(([self.total_time], new_time)))[1:]
+            self.bins.add(new_time, fy[mask])
+            self.total_time = new_time[-1]
+            self.last_time = start_time[-1]
+        self.passes += 1
+
+    def frame(self, statistics: Iterable[str] = ('mean',)) -> pd.DataFrame:
+        """
+        :param statistics: Iterable[str] - статистики по секундам, см. SecondBins.frame.
+        """
+        return self.bins.frame('Fy', statistics)
+
+
+class TemperatureStream:
+    """
+    Потоковая обработка проходов с температурой: отбор точек Voltage > min_voltage, назначение
+    равномерного времени с шагом step и усреднение по секундам.
+    Шаг зависит от общего количества отобранных точек (см. adding_time_in_temperature),
+    поэтому его считают заранее по count_above.
+    """
+
+    def __init__(self, min_voltage: float | int, step: float = 0.28):
+        self.min_voltage = min_voltage
+        self.step = step
+        self.bins = SecondBins()
+        self.passes = 0
+        self.count = 0
+
+    def add_pass(self, chunks: Iterable[pd.DataFrame]) -> None:
+        """
+        :param chunks: Iterable[pd.DataFrame] - последовательные части одного прохода со столбцом Voltage.
+        """
+        for chunk in chunks:
+            voltage = chunk['Voltage'].to_numpy()
+            voltage = voltage[voltage > self.min_voltage]
+            new_time = np.arange(self.count, self.count + voltage.size, dtype=float) * self.step
+            self.bins.add(new_time, voltage)
+            self.count += voltage.size
+        self.passes += 1
+
+    def frame(self, statistics: Iterable[str] = ('mean',)) -> pd.DataFrame:
+        """
+        :param statistics: Iterable[str] - статистики по секундам, см. SecondBins.frame.
+        """
+        return self.bins.frame('Voltage', statistics)
+
+
+def count_above(chunks: Iterable[pd.DataFrame], column: str, threshold: float | int) -> int:
+    """
+    Количество точек прохода, у которых значение column больше threshold.
+    """
+    return sum(int(np.count_nonzero(chunk[column].to_numpy() > threshold)) for chunk in chunks)
+
+
+def temperature_step(count: int, processing_time_: Optional[float] = None) -> float:
+    """
+    Шаг времени для count точек температуры, как в adding_time_in_temperature.
+    """
+    return processing_time_ / count if processing_time_ and count else 0.28
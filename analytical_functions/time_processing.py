@@ -0,0 +1,46 @@
+from typing import Optional, Sequence
+import numpy as np
+
+
+def pass_bounds(list_time: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Вычисляет индексы начала каждого прохода в объединенном массиве.
+    :param list_time: Sequence[np.ndarray] - список массивов времени для каждого прохода.
+    :return: np.ndarray - индексы первых элементов проходов в объединенном массиве.
+    """
+    sizes = np.fromiter((len(elem) for elem in list_time), dtype=np.int64, count=len(list_time))
+    return np.concatenate(([0], np.cumsum(sizes)[:-1])) if sizes.size else sizes
+
+
+def processing_time(start_time: np.ndarray) -> np.ndarray:
+    """
+    Векторизованное восстановление времени обработки за O(n).
+    Приращения времени между соседними точками суммируются нарастающим итогом,
+    отрицательные приращения (начало нового прохода) считаются простоем и обнуляются.
+    Положительное приращение на границе проходов (следующий файл продолжает время предыдущего) сохраняется.
+
+    :param start_time: np.ndarray: Необработанное время после соединения данных в один файл.
+    :return: np.ndarray - Обработанное время, которое учитывает простои при фрезеровании
+    """
+    start_time = np.asarray(start_time)
+    if (start_time < 0).any():
+        raise ValueError("Некорректное время")
+    if start_time.size == 0:
+        return np.empty(0, dtype=float)
+    new_time = np.diff(start_time, prepend=start_time[0]).astype(float)
+    np.maximum(new_time, 0, out=new_time)
+    return np.cumsum(new_time)
+
+
+def adding_time_in_temperature(arr: np.ndarray, processing_time_: Optional[float] = None) -> np.ndarray:
+    """
+    Изнанчально в данных о температуре нет времени, так как при фрезеровании время не записывалось в файл.
+    Поэтому мы создаем столбец со временем, в зависимости от данных, которые записывались в файл сил.
+
+    :param processing_time_: Время обработки
+    :param arr: nd.ndarray[None],со временем из данных о температуре
+    :return: np.ndarray со временем для температуры.
+    """
+    # Шаг равен суммарному времени обработки, деленному на величину массива, либо 0.28 сек.
+    step = processing_time_ / arr.size if processing_time_ else 0.28
+    return np.arange(arr.size, dtype=float) * step
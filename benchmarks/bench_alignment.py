@@ -0,0 +1,52 @@
+"""
+Сравнение объединения силы и температуры на сетке секунд (align_frames) с прежним
+pd.merge(how='outer', on='Time').sort_values().reset_index() по времени с плавающей точкой.
+
+Запуск: python -m benchmarks.bench_alignment
+"""
+import time
+import numpy as np
+import pandas as pd
+from analytical_functions.alignment import align_frames
+
+
+def merge_legacy(strength: pd.DataFrame, temperature: pd.DataFrame) -> pd.DataFrame:
+    """
+    Прежняя реализация Couple.merge_file, оставлена для сравнения.
+    """
+    return pd.merge(strength, temperature, how='outer', on='Time').sort_values(by='Time').reset_index(drop=True)
+
+
+def synthetic_couple(seconds: int, seed: int = 0) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Сила с пропусками секунд и температура, время которой сдвинуто на доли секунды от целых значений,
+    как у таблиц, прочитанных из csv.
+    """
+    rng = np.random.default_rng(seed)
+    strength_time = np.flatnonzero(rng.random(seconds) < 0.97).astype(float)
+    temperature_time = np.arange(seconds) + rng.normal(0, 1e-9, seconds)
+    strength = pd.DataFrame({'Time': strength_time, 'Fy': rng.normal(100, 5, strength_time.size),
+                             'Model_strength': np.linspace(90, 110, strength_time.size)})
+    temperature = pd.DataFrame({'Time': temperature_time, 'Voltage': rng.normal(10, 1, seconds),
+                                'Temperature': rng.normal(300, 10, seconds),
+                                'Model_temp': np.linspace(250, 350, seconds)})
+    return strength, temperature
+
+
+def main(seconds_list=(3_600, 36_000, 360_000)) -> None:
+    print(f'{"секунд":>8} {"new, с":>8} {"legacy, с":>10} {"строк new":>10} {"строк legacy":>13} '
+          f'{"NaN new":>8} {"NaN legacy":>11}')
+    for seconds in seconds_list:
+        strength, temperature = synthetic_couple(seconds)
+        start = time.perf_counter()
+        new = align_frames([strength, temperature])
+        new_time = time.perf_counter() - start
+        start = time.perf_counter()
+        legacy = merge_legacy(strength, temperature)
+        legacy_time = time.perf_counter() - start
+        print(f'{seconds:>8} {new_time:8.3f} {legacy_time:10.3f} {len(new):>10} {len(legacy):>13} '
+              f'{int(new.isna().sum().sum()):>8} {int(legacy.isna().sum().sum()):>11}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Сравнение учета нуля сил одним массивом (baseline.correct_baseline) с прежней обработкой каждого прохода
+через .loc и .sort_values().median().
+
+Запуск: python -m benchmarks.bench_baseline
+"""
+import time
+import numpy as np
+import pandas as pd
+from analytical_functions.analysis_functions import determination_zero_strength_list
+
+
+def determination_zero_strength_list_legacy(list_data_frame: list[pd.DataFrame], min_strength: float) -> \
+        list[pd.DataFrame]:
+    """
+    Прежняя реализация, оставлена для сравнения.
+    """
+    new_list_dataframe = []
+    for data_frame_strength in list_data_frame:
+        first_index = data_frame_strength.loc[data_frame_strength['Fy'] > min_strength].index.values[0]
+        median_const = data_frame_strength['Fy'][:first_index].sort_values().median()
+        data_frame_strength['Fy'] = data_frame_strength['Fy'] - median_const
+        new_list_dataframe.append(data_frame_strength)
+    return new_list_dataframe
+
+
+def synthetic_passes(passes: int, size: int, seed: int = 0) -> list[pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    result = []
+    for number in range(passes):
+        fy = rng.normal(rng.normal(0, 2), 0.3, size)
+        fy[size // 4:] += 30
+        result.append(pd.DataFrame({'Time': np.arange(size) * 0.001, 'Fy': fy}))
+    return result
+
+
+def main(cases=((20, 100_000), (100, 100_000), (500, 20_000))) -> None:
+    print(f'{"проходов":>9} {"точек":>8} {"new, с":>8} {"legacy, с":>10} {"max |dFy|":>10}')
+    for passes, size in cases:
+        data = synthetic_passes(passes, size)
+        start = time.perf_counter()
+        new = determination_zero_strength_list(data, 12)
+        new_time = time.perf_counter() - start
+        legacy_data = [data_frame.copy() for data_frame in data]
+        start = time.perf_counter()
+        legacy = determination_zero_strength_list_legacy(legacy_data, 12)
+        legacy_time = time.perf_counter() - start
+        diff = max(np.max(np.abs(a['Fy'].to_numpy() - b['Fy'].to_numpy())) for a, b in zip(new, legacy))
+        print(f'{passes:>9} {size:>8} {new_time:8.3f} {legacy_time:10.3f} {diff:10.2e}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Сравнение статистик по секундам через SecondBins (np.bincount) с прежней схемой
+Series.apply(np.ceil) -> groupby('Time').mean() -> Series.apply(round) и с groupby().agg по четырем статистикам.
+
+Запуск: python -m benchmarks.bench_binning
+"""
+import time
+import numpy as np
+import pandas as pd
+from analytical_functions.binning import bin_statistics
+
+
+def mean_legacy(time_: np.ndarray, values: np.ndarray) -> pd.DataFrame:
+    """
+    Прежняя реализация, оставлена для сравнения.
+    """
+    data_frame = pd.DataFrame({'Time': time_, 'Fy': values})
+    data_frame['Time'] = data_frame['Time'].apply(np.ceil)
+    data_frame = data_frame.groupby(by='Time').mean().dropna().reset_index()
+    data_frame['Fy'] = data_frame['Fy'].apply(lambda x: round(x, 2))
+    return data_frame
+
+
+def agg_groupby(time_: np.ndarray, values: np.ndarray) -> pd.DataFrame:
+    data_frame = pd.DataFrame({'Time': np.ceil(time_), 'Fy': values})
+    return data_frame.groupby('Time')['Fy'].agg(['mean', 'max', 'std', 'count']).round(2).reset_index()
+
+
+def main(sizes=(100_000, 1_000_000, 5_000_000)) -> None:
+    print(f'{"n":>9} {"mean, с":>8} {"legacy, с":>10} {"4 стат., с":>11} {"groupby.agg, с":>15}')
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        time_ = np.cumsum(rng.uniform(0, 0.002, size))
+        values = rng.normal(20, 2, size)
+        start = time.perf_counter()
+        new = bin_statistics(time_, values, 'Fy')
+        new_time = time.perf_counter() - start
+        start = time.perf_counter()
+        legacy = mean_legacy(time_, values)
+        legacy_time = time.perf_counter() - start
+        assert np.array_equal(new['Fy'].to_numpy(), legacy['Fy'].to_numpy())
+        start = time.perf_counter()
+        bin_statistics(time_, values, 'Fy', ('mean', 'max', 'std', 'count'))
+        full_time = time.perf_counter() - start
+        start = time.perf_counter()
+        agg_groupby(time_, values)
+        agg_time = time.perf_counter() - start
+        print(f'{size:>9} {new_time:8.3f} {legacy_time:10.3f} {full_time:11.3f} {agg_time:15.3f}')
+
+
+if __name__ == '__main__':
+    main()
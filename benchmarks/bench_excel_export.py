@@ -0,0 +1,60 @@
+"""
+Запись книги эксель одного эксперимента: прежний способ (книга записывается трижды через pd.ExcelWriter -
+в Strength.save_file, Temperature.save_file и Couple.save_file) против одной потоковой записи write_workbook.
+
+Запуск: python -m benchmarks.bench_excel_export
+"""
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from data_class_communication import excel_export
+from data_class_communication.excel_export import write_workbook
+
+
+def synthetic_couple(seconds: int, seed: int = 0) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    time_ = np.arange(seconds, dtype=float)
+    strength = pd.DataFrame({'Time': time_, 'Fx': rng.normal(20, 2, seconds), 'Fy': rng.normal(40, 3, seconds),
+                             'Fz': rng.normal(10, 1, seconds), 'Model_strength': 40 + 0.001 * time_})
+    temperature = pd.DataFrame({'Time': time_[::2] + 0.5, 'Voltage': rng.normal(8, 0.5, seconds // 2),
+                                'Temperature': rng.normal(500, 20, seconds // 2),
+                                'Model_temp': 500 + 0.002 * time_[::2]})
+    couple_data = pd.merge(strength, temperature, how='outer', on='Time').sort_values(by='Time')
+    return strength, temperature, couple_data
+
+
+def write_legacy(path: str, strength: pd.DataFrame, temperature: pd.DataFrame, couple_data: pd.DataFrame) -> None:
+    with pd.ExcelWriter(path) as writer:
+        strength.to_excel(writer, sheet_name='Data_strength')
+    with pd.ExcelWriter(path) as writer:
+        strength.to_excel(writer, sheet_name='Data_strength')
+        temperature.to_excel(writer, sheet_name='Data_temperature')
+    with pd.ExcelWriter(path) as writer:
+        temperature.to_excel(writer, sheet_name='Data_temperature')
+        strength.to_excel(writer, sheet_name='Data_strength')
+        couple_data.to_excel(writer, sheet_name='Couple_data')
+
+
+def main(seconds: int = 20_000) -> None:
+    strength, temperature, couple_data = synthetic_couple(seconds)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'experiment.xlsx')
+        start = time.perf_counter()
+        write_legacy(path, strength, temperature, couple_data)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_workbook(path, {'Data_temperature': temperature, 'Data_strength': strength,
+                              'Couple_data': couple_data})
+        single = time.perf_counter() - start
+
+    engine = 'xlsxwriter' if excel_export.xlsxwriter is not None else 'openpyxl write_only'
+    print(f'Секунд эксперимента: {seconds}, строк объединенной таблицы: {len(couple_data)}')
+    print(f'Прежний способ (3 записи):      {legacy:8.2f} с')
+    print(f'write_workbook:                 {single:8.2f} с ({engine})')
+
+
+if __name__ == '__main__':
+    main()
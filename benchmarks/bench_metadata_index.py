@@ -0,0 +1,62 @@
+"""
+Время ответа фильтра списка экспериментов: перебор всех записей с проверкой полей против MetadataIndex.
+
+Запуск: python -m benchmarks.bench_metadata_index
+"""
+import time
+import numpy as np
+from data_class_communication.experiment_store import ExperimentRecord
+from data_class_communication.metadata_index import MetadataIndex
+
+
+def synthetic_records(count: int, seed: int = 0) -> list[ExperimentRecord]:
+    rng = np.random.default_rng(seed)
+    materials = [f'Материал {i}' for i in range(40)]
+    coatings = [f'Покрытие {i}' for i in range(30)]
+    return [ExperimentRecord(key=f'{number:06d}', material=str(rng.choice(materials)),
+                             coating=' + '.join(rng.choice(coatings, size=rng.integers(1, 3), replace=False)),
+                             stage=f'{rng.integers(1, 6)} этап', feed=float(rng.integers(20, 200)),
+                             spindle_speed=float(rng.integers(400, 2000)),
+                             start_day=f'2023.{rng.integers(1, 13):02d}.{rng.integers(1, 29):02d}-12:00:00',
+                             strength_mean=float(rng.uniform(10, 300)), temperature_mean=float(rng.uniform(100, 900)))
+            for number in range(count)]
+
+
+def scan(records: list[ExperimentRecord], material: str, coating: str, stage: str) -> list[ExperimentRecord]:
+    return [record for record in records
+            if record.material == material and coating in record.coating.split(' + ') and record.stage == stage]
+
+
+def main(count: int = 50_000, repeat: int = 200) -> None:
+    records = synthetic_records(count)
+    filters = dict(material='Материал 3', coating='Покрытие 7', stage='2 этап')
+
+    start = time.perf_counter()
+    index = MetadataIndex(records)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        expected = scan(records, **filters)
+    legacy = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        found = index.query(**filters)
+    indexed = (time.perf_counter() - start) / repeat
+    assert [record.key for record in found] == [record.key for record in expected]
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        index.query(material='Материал 3', feed=(50.0, 80.0), strength_mean=(None, 100.0))
+    ranged = (time.perf_counter() - start) / repeat
+
+    print(f'Записей: {count}, найдено: {len(found)}')
+    print(f'Построение индекса:       {build * 1000:8.1f} мс')
+    print(f'Перебор записей:          {legacy * 1000:8.3f} мс')
+    print(f'MetadataIndex:            {indexed * 1000:8.3f} мс')
+    print(f'MetadataIndex, диапазоны: {ranged * 1000:8.3f} мс')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+"""
+Замер всех этапов конвейера импорта на синтетических исходных файлах реального размера
+с сохранением результатов в json для сравнения между коммитами.
+
+Создается кампания из двух экспериментов: проходы динамометра в новом формате (шапка 2 строки, utf-8)
+и в старом (шапка 19 строк, windows-1251), проходы термопары (шапка 11 строк, табуляция).
+Этапы выполняются по очереди теми же функциями, что и в Strength, Temperature и Couple, каждый этап
+повторяется repeat раз, в отчет записывается лучшее время:
+create_file_list, parse (raw_strength_chunks, read_temperature_chunks), zero (zero_strength_chunks),
+binning (время обработки и усреднение StrengthStream и TemperatureStream), regression, merge,
+build - создание Strength, Temperature и Couple, save - только запись файлов, store и
+import - полная обработка эксперимента через process_task.
+
+Запуск: python -m benchmarks.bench_pipeline [--passes 20] [--samples 200000] [--repeat 3]
+        [--output bench.json] [--compare base.json] [--threshold 0.2] [--min-seconds 0.05]
+С --compare выводится отношение времени этапов к базовому файлу, при замедлении больше threshold
+код возврата равен 1.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Optional
+import numpy as np
+import pandas as pd
+from analytical_functions.alignment import align_frames
+from analytical_functions.analysis_functions import determining_coefficient_without_bad_data
+from analytical_functions.streaming import StrengthStream, TemperatureStream, count_above, temperature_step
+from data_class_communication.batch_import import find_import_tasks, process_task
+from data_class_communication.class_for_communication import Couple, Strength, Temperature
+from data_class_communication.experiment_store import ExperimentStore
+from data_class_communication.func_init import create_file_list, raw_strength_chunks, read_temperature_chunks, \
+    zero_strength_chunks
+
+# Версия 2: этапы parse и zero замеряют потоковые функции Strength, добавлен этап build
+RESULT_VERSION = 2
+MIN_STRENGTH = 12
+MIN_VOLTAGE = 6
+EXPERIMENTS = ('4 этап/VT18U/nACo3', '4 этап/HN50/AlTiN3')
+
+
+def write_dynamometer_pass(path: str, samples: int, seed: int, legacy: bool = False) -> None:
+    """
+    Проход динамометра: 4 столбца через ';' с десятичной запятой, покой в начале и в конце прохода.
+    :param legacy: bool - старый формат: шапка 19 строк на русском в windows-1251, иначе шапка 2 строки в utf-8.
+    """
+    rng = np.random.default_rng(seed)
+    fy = rng.normal(rng.normal(0, 1), 0.3, samples)
+    cut = slice(samples // 10, samples - samples // 10)
+    time_ = np.arange(samples) * 0.001
+    fy[cut] += 40 + 20 * time_[cut] / time_[-1]
+    data = pd.DataFrame({'Время' if legacy else 'Time': time_, 'Fx': fy / 2, 'Fy': fy, 'Fz': fy / 3})
+    with open(path, 'w', encoding='windows-1251' if legacy else 'utf-8') as file:
+        if legacy:
+            file.write(''.join(f'Параметр {i}: значение\n' for i in range(19)))
+        else:
+            file.write('Dynamometer\nRate: 1000 Hz\n')
+        data.to_csv(file, sep=';', decimal=',', index=False, float_format='%.4f')
+
+
+def write_thermocouple_pass(path: str, samples: int, seed: int) -> None:
+    """
+    Проход термопары: время и напряжение через табуляцию, шапка 11 строк в windows-1251.
+    """
+    rng = np.random.default_rng(seed)
+    voltage = rng.normal(2, 0.1, samples)
+    voltage[samples // 10: samples - samples // 10] += 12
+    with open(path, 'w', encoding='windows-1251') as file:
+        file.write(''.join(f'Заголовок {i}\n' for i in range(11)))
+        file.write('Время\tНапряжение\n')
+        pd.DataFrame({'Time': np.arange(samples) * 0.04, 'Voltage': voltage}).to_csv(
+            file, sep='\t', decimal=',', index=False, header=False, float_format='%.4f')
+
+
+def generate_campaign(root: str, passes: int, samples: int) -> None:
+    """
+    Исходники двух экспериментов по passes проходов: первый в новом формате динамометра, второй в старом.
+    На проход термопары приходится samples // 40 точек, как при частоте 25 Гц против 1000 Гц у динамометра.
+    """
+    for number, experiment in enumerate(EXPERIMENTS):
+        path_strength = os.path.join(root, experiment, 'Силы')
+        path_temperature = os.path.join(root, experiment, 'Температура')
+        os.makedirs(path_strength)
+        os.makedirs(path_temperature)
+        for i in range(passes):
+            write_dynamometer_pass(os.path.join(path_strength, f'pass_{i}.csv'), samples, 100 * number + i,
+                                   legacy=number == 1)
+            write_thermocouple_pass(os.path.join(path_temperature, f'pass_{i}.txt'), samples // 40,
+                                    100 * number + i)
+
+
+def pipeline_stages(task, main_path: str, store: ExperimentStore) -> list[tuple[str, Callable[[dict], int]]]:
+    """
+    Этапы обработки одного эксперимента теми же функциями, которые вызывают Strength и Temperature.
+    Каждый этап берет результаты предыдущих из общего словаря state, записывает туда свои
+    и возвращает количество обработанных строк.
+    """
+    def file_list(state: dict) -> int:
+        state['strength_files'] = create_file_list(task.path_strength)
+        state['temperature_files'] = create_file_list(task.path_temperature)
+        return len(state['strength_files']) + len(state['temperature_files'])
+
+    def parse(state: dict) -> int:
+        # Части проходов, как их читают read_strength_chunks и Temperature
+        state['strength_raw'] = [list(raw_strength_chunks(path)) for path in state['strength_files']]
+        state['temperature_raw'] = [list(read_temperature_chunks(path)) for path in state['temperature_files']]
+        return sum(len(chunk) for chunks in state['strength_raw'] + state['temperature_raw'] for chunk in chunks)
+
+    def zero(state: dict) -> int:
+        # Учет нуля записывает столбец Fy в части, поэтому каждый повтор работает с неглубокими копиями
+        state['strength_zero'] = [list(zero_strength_chunks([chunk.copy(deep=False) for chunk in chunks],
+                                                            MIN_STRENGTH, task.estimator))
+                                  for chunks in state['strength_raw']]
+        return sum(len(chunk) for chunks in state['strength_zero'] for chunk in chunks)
+
+    def binning(state: dict) -> int:
+        # Время обработки и усреднение по секундам, как в Strength и Temperature
+        strength_stream = StrengthStream(MIN_STRENGTH)
+        for chunks in state['strength_zero']:
+            strength_stream.add_pass(chunks)
+        state['strength'] = strength_stream.frame()
+        count = sum(count_above(chunks, 'Voltage', MIN_VOLTAGE) for chunks in state['temperature_raw'])
+        step = temperature_step(count, state['strength']['Time'].iloc[-1])
+        temperature_stream = TemperatureStream(MIN_VOLTAGE, step)
+        for chunks in state['temperature_raw']:
+            temperature_stream.add_pass(chunks)
+        temperature = temperature_stream.frame()
+        temperature['Temperature'] = round(temperature['Voltage'] * 24.08, 2)
+        state['temperature'] = temperature
+        return len(state['strength']) + len(state['temperature'])
+
+    def regression(state: dict) -> int:
+        state['strength_mnk'] = determining_coefficient_without_bad_data(state['strength'])
+        state['temperature_mnk'] = determining_coefficient_without_bad_data(
+            state['temperature'][['Time', 'Temperature']])
+        return len(state['strength']) + len(state['temperature'])
+
+    def merge(state: dict) -> int:
+        state['couple_data'] = align_frames([state['strength'], state['temperature']])
+        return len(state['couple_data'])
+
+    def build(state: dict) -> int:
+        # Полная обработка исходных файлов классами Strength, Temperature и Couple без кэша проходов
+        params = {name: getattr(task, name) for name in task.FIELDS}
+        strength = Strength(path_strength=task.path_strength, estimator=task.estimator, **params)
+        temperature = Temperature(path_temperature=task.path_temperature, couple_strength=strength, **params)
+        state['couple'] = Couple(strength, temperature)
+        return len(strength.data_frame) + len(temperature.data_frame)
+
+    def save(state: dict) -> int:
+        couple = state['couple']
+        couple.save_file(main_path, data_base=False, filename=str(couple), excel=True)
+        return len(couple.couple_data)
+
+    def store_stage(state: dict) -> int:
+        store.add_couple(state['couple'])
+        return len(state['couple'].couple_data)
+
+    def import_stage(state: dict) -> int:
+        couple = process_task(task, main_path, filename=str(state['couple']), excel=True)
+        return len(couple.strength.data_frame) + len(couple.temperature.data_frame)
+
+    return [('create_file_list', file_list), ('parse', parse), ('zero', zero), ('binning', binning),
+            ('regression', regression), ('merge', merge), ('build', build), ('save', save),
+            ('store', store_stage), ('import', import_stage)]
+
+
+def run(passes: int = 20, samples: int = 200_000, repeat: int = 3, root: Optional[str] = None) -> dict:
+    """
+    Генерация кампании и замер этапов для каждого эксперимента.
+    :return: dict - результаты: параметры запуска, окружение и этапы {имя: {seconds, runs, rows}},
+    время этапа суммируется по экспериментам.
+    """
+    with tempfile.TemporaryDirectory(dir=root) as directory:
+        campaign = os.path.join(directory, 'campaign')
+        main_path = os.path.join(directory, 'main')
+        os.makedirs(main_path)
+        start = time.perf_counter()
+        generate_campaign(campaign, passes, samples)
+        generate_time = time.perf_counter() - start
+        store = ExperimentStore(os.path.join(main_path, 'data_base'))
+        stages: dict[str, dict] = {}
+        for task in find_import_tasks(campaign):
+            state: dict = {}
+            for name, stage in pipeline_stages(task, main_path, store):
+                runs = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    rows = stage(state)
+                    runs.append(time.perf_counter() - start)
+                result = stages.setdefault(name, {'seconds': 0.0, 'runs': [0.0] * repeat, 'rows': 0})
+                result['seconds'] += min(runs)
+                result['runs'] = [total + elem for total, elem in zip(result['runs'], runs)]
+                result['rows'] += rows
+    return {'version': RESULT_VERSION,
+            'commit': git_commit(),
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'environment': {'python': platform.python_version(), 'numpy': np.__version__,
+                            'pandas': pd.__version__, 'platform': platform.platform(),
+                            'cpu_count': os.cpu_count()},
+            'params': {'passes': passes, 'samples': samples, 'repeat': repeat, 'experiments': len(EXPERIMENTS),
+                       'generate_seconds': generate_time},
+            'stages': stages}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.2, min_seconds: float = 0.05) -> list[str]:
+    """
+    Сравнение результатов с базовыми.
+    :param threshold: float - допустимое относительное замедление этапа.
+    :param min_seconds: float - этапы, которые в обоих замерах быстрее min_seconds, не проверяются:
+    их время сравнимо со случайным разбросом.
+    :return: list[str] - этапы, замедлившиеся больше чем на threshold.
+    """
+    if baseline.get('params', {}).get('samples') != current['params']['samples'] or \
+            baseline.get('params', {}).get('passes') != current['params']['passes']:
+        print('Внимание: базовый замер выполнен с другими параметрами', file=sys.stderr)
+    if baseline.get('version') != current.get('version'):
+        print('Внимание: базовый замер другой версии, состав этапов может отличаться', file=sys.stderr)
+    slower = []
+    print(f'{"этап":<18} {"база, с":>9} {"сейчас, с":>10} {"отношение":>10}')
+    for name, result in current['stages'].items():
+        base = baseline['stages'].get(name)
+        if base is None or base['seconds'] <= 0:
+            print(f'{name:<18} {"-":>9} {result["seconds"]:10.3f} {"-":>10}')
+            continue
+        ratio = result['seconds'] / base['seconds']
+        mark = ' замедление' if ratio > 1 + threshold and result['seconds'] >= min_seconds else ''
+        print(f'{name:<18} {base["seconds"]:9.3f} {result["seconds"]:10.3f} {ratio:10.2f}{mark}')
+        if mark:
+            slower.append(name)
+    return slower
+
+
+def print_report(result: dict) -> None:
+    params = result['params']
+    print(f'Коммит {result["commit"]}, проходов {params["passes"]}, точек в проходе {params["samples"]}, '
+          f'экспериментов {params["experiments"]}')
+    print(f'{"этап":<18} {"время, с":>9} {"строк":>12} {"строк/с":>12}')
+    for name, stage in result['stages'].items():
+        speed = stage['rows'] / stage['seconds'] if stage['seconds'] > 0 else float('inf')
+        print(f'{name:<18} {stage["seconds"]:9.3f} {stage["rows"]:>12} {speed:12.0f}')
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Замер этапов конвейера импорта')
+    parser.add_argument('--passes', type=int, default=20, help='проходов в эксперименте')
+    parser.add_argument('--samples', type=int, default=200_000, help='точек в проходе динамометра')
+    parser.add_argument('--repeat', type=int, default=3, help='повторов каждого этапа')
+    parser.add_argument('--output', help='файл json для результатов')
+    parser.add_argument('--compare', help='файл json с базовыми результатами')
+    parser.add_argument('--threshold', type=float, default=0.2, help='допустимое замедление этапа')
+    parser.add_argument('--min-seconds', type=float, default=0.05, help='не проверять этапы быстрее, с')
+    args = parser.parse_args(argv)
+
+    result = run(args.passes, args.samples, args.repeat)
+    print_report(result)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(result, file, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            slower = compare(json.load(file), result, args.threshold, args.min_seconds)
+        if slower:
+            print(f'Замедлились этапы: {", ".join(slower)}')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Задержка переключения графика между 100 экспериментами: прежний способ (новая фигура с twinx и полная
+отрисовка всех точек на каждый выбор) против постоянной области графика PlotSurface.
+Отрисовка выполняется на холсте Agg, без окна Tk.
+Эксперименты разной длительности и с разным уровнем сил и температур, как в реальной базе, поэтому пределы осей
+меняются при каждом переключении. Время PlotSurface включает построение пирамид прореживания, как при первом
+выборе эксперимента в приложении; повторный выбор (пирамиды в кэше Plot.PYRAMIDS) выводится отдельно.
+
+Запуск: python -m benchmarks.bench_plot_switch
+"""
+import time
+import matplotlib
+
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from analytical_functions.decimation import DecimationPyramid
+from data_class_communication.plot_surface import PlotSurface
+
+
+def synthetic_experiments(count: int, seconds: int, seed: int = 0) -> list[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Посекундные ряды силы и температуры: у каждого эксперимента своя длительность, начальный уровень
+    и скорость роста сил и температуры (износ), как у экспериментов разных материалов и режимов.
+    """
+    rng = np.random.default_rng(seed)
+    experiments = []
+    for _ in range(count):
+        size = int(seconds * rng.uniform(0.5, 1.5))
+        time_ = np.arange(size, dtype=float)
+        wear = time_ / size
+        strength = rng.uniform(20, 80) + rng.uniform(10, 100) * wear + rng.normal(0, 3, size)
+        temperature = rng.uniform(200, 400) + rng.uniform(50, 300) * wear + rng.normal(0, 10, size)
+        experiments.append((time_, strength, temperature))
+    return experiments
+
+
+def show_legacy(time_: np.ndarray, strength: np.ndarray, temperature: np.ndarray) -> None:
+    fig, ax1 = plt.subplots()
+    FigureCanvasAgg(fig)
+    ax1.plot(time_, strength, '-', color='tab:blue')
+    ax2 = ax1.twinx()
+    ax2.plot(time_, temperature, '-', color='tab:red')
+    fig.tight_layout()
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def main(count: int = 100, seconds: int = 200_000) -> None:
+    experiments = synthetic_experiments(count, seconds)
+
+    start = time.perf_counter()
+    for experiment in experiments:
+        show_legacy(*experiment)
+    legacy = (time.perf_counter() - start) / count
+
+    surface = PlotSurface(Figure())
+    FigureCanvasAgg(surface.figure)
+    pyramids = []
+    latencies = []
+    blitted = 0
+    for number, (time_, strength, temperature) in enumerate(experiments):
+        start = time.perf_counter()
+        pyramids.append((DecimationPyramid(time_, strength), DecimationPyramid(time_, temperature)))
+        blitted += surface.show(f'Эксперимент {number}', *pyramids[-1])
+        latencies.append(time.perf_counter() - start)
+
+    cached = []
+    for number, (strength, temperature) in enumerate(pyramids):
+        start = time.perf_counter()
+        surface.show(f'Эксперимент {number}', strength, temperature)
+        cached.append(time.perf_counter() - start)
+
+    print(f'Экспериментов: {count}, точек в ряду: ~{seconds}')
+    print(f'Прежний способ, среднее:      {legacy * 1000:8.1f} мс')
+    print(f'PlotSurface, среднее:         {np.mean(latencies) * 1000:8.1f} мс')
+    print(f'PlotSurface, медиана:         {np.median(latencies) * 1000:8.1f} мс')
+    print(f'PlotSurface, 95-й процентиль: {np.percentile(latencies, 95) * 1000:8.1f} мс')
+    print(f'Повторный выбор, среднее:     {np.mean(cached) * 1000:8.1f} мс')
+    print(f'Обновлений только линий (blitting): {blitted} из {count}')
+
+
+if __name__ == '__main__':
+    main()
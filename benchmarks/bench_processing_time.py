@@ -0,0 +1,64 @@
+"""
+Замер времени восстановления времени обработки на синтетических данных от 10^3 до 10^7 точек.
+Старая реализация с циклом O(n^2) замеряется только до 10^5 точек.
+
+Запуск: python -m benchmarks.bench_processing_time
+"""
+import time
+import numpy as np
+from analytical_functions.time_processing import processing_time
+
+
+def processing_time_legacy(start_time: np.ndarray) -> np.ndarray:
+    """
+    Прежняя реализация processing_time, оставлена для сравнения.
+    """
+    if any(elem < 0 for elem in start_time):
+        raise ValueError("Некорректное время")
+    start_time_shift: np.ndarray = np.insert(start_time, 0, start_time[0])
+    start_time_shift: np.ndarray = np.delete(start_time_shift, start_time_shift.size - 1)
+    new_time: np.ndarray = start_time - start_time_shift
+    for i in range(new_time.size):
+        if new_time[i] < 0:
+            new_time[i] = 0
+    processed_time = np.arange(new_time.size, dtype=float)
+    for i in range(new_time.size):
+        processed_time[i] = new_time[:i + 1].sum()
+    return processed_time
+
+
+def synthetic_passes(size: int, passes: int = 40, step: float = 0.002) -> list[np.ndarray]:
+    """
+    Создает список массивов времени для проходов, каждый проход начинается с нуля.
+    """
+    sizes = np.full(passes, size // passes)
+    sizes[:size % passes] += 1
+    return [np.arange(n) * step for n in sizes]
+
+
+def timeit(func, *args, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes=(10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7), legacy_limit: int = 10 ** 5) -> None:
+    print(f'{"n":>10} {"new, с":>12} {"legacy, с":>12}')
+    for size in sizes:
+        list_time = synthetic_passes(size)
+        start_time = np.concatenate(list_time)
+        new = timeit(processing_time, start_time)
+        if size <= legacy_limit:
+            legacy = timeit(processing_time_legacy, start_time, repeat=1)
+            np.testing.assert_allclose(processing_time(start_time), processing_time_legacy(start_time))
+            legacy = f'{legacy:12.4f}'
+        else:
+            legacy = f'{"-":>12}'
+        print(f'{size:>10} {new:12.6f} {legacy}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Сравнение trimmed_least_squares с прежней реализацией determining_coefficient_without_bad_data.
+
+Запуск: python -m benchmarks.bench_regression
+"""
+import time
+import numpy as np
+import pandas as pd
+from analytical_functions.regression import trimmed_least_squares
+
+
+def determining_coefficients_legacy(dataframe: pd.DataFrame) -> tuple[float, float]:
+    x = dataframe[dataframe.columns[0]].to_numpy()
+    y = dataframe[dataframe.columns[1]].to_numpy()
+    size = len(x)
+    avg_x = sum(x) / size
+    avg_y = sum(y) / size
+    avg_xy = sum(x[i] * y[i] for i in range(0, size)) / size
+    std_x = (sum((x[i] - avg_x) ** 2 for i in range(0, size)) / size) ** 0.5
+    std_y = (sum((y[i] - avg_y) ** 2 for i in range(0, size)) / size) ** 0.5
+    corr_xy = (avg_xy - avg_x * avg_y) / (std_x * std_y)
+    w1 = corr_xy * std_y / std_x
+    w0 = avg_y - avg_x * w1
+    return w0, w1
+
+
+def determining_coefficient_without_bad_data_legacy(data: pd.DataFrame, percent: float = 0.22) -> tuple[float, float]:
+    """
+    Прежняя реализация с пересортировкой DataFrame на каждой итерации, оставлена для сравнения.
+    """
+    kol_minus = int(np.ceil(len(data) * percent))
+    w1, w2 = determining_coefficients_legacy(data)
+    data = data.copy()
+    data['Result'] = w1 + data.iloc[:, 0].to_numpy() * w2
+    data['fail'] = (data.iloc[:, 1].to_numpy() - data.iloc[:, 2].to_numpy()) ** 2
+    for i in range(kol_minus):
+        data = data.sort_values(by='fail', ascending=False).iloc[1:].copy()
+        data = data.sort_values(by=data.columns[0], ascending=True)
+        w1, w2 = determining_coefficients_legacy(data)
+        data['Result'] = w1 + data.iloc[:, 0].to_numpy() * w2
+        data['fail'] = (data.iloc[:, 1].to_numpy() - data.iloc[:, 2].to_numpy()) ** 2
+    return w1, w2
+
+
+def synthetic_trace(size: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Посекундная сила с линейным трендом, шумом и редкими выбросами.
+    """
+    rng = np.random.default_rng(seed)
+    x = np.arange(size, dtype=float)
+    y = 10 + 0.05 * x + rng.normal(0, 2, size)
+    outliers = rng.random(size) < 0.05
+    y[outliers] += rng.normal(0, 30, outliers.sum())
+    return pd.DataFrame({'Time': x, 'Fy': y})
+
+
+def main(sizes=(500, 1000, 2000, 5000, 20000, 100000), legacy_limit: int = 2000) -> None:
+    print(f'{"n":>8} {"new, с":>10} {"legacy, с":>10} {"max |dw|":>10}')
+    for size in sizes:
+        data = synthetic_trace(size)
+        start = time.perf_counter()
+        new = trimmed_least_squares(data['Time'].to_numpy(), data['Fy'].to_numpy())
+        new_time = time.perf_counter() - start
+        if size <= legacy_limit:
+            start = time.perf_counter()
+            legacy = determining_coefficient_without_bad_data_legacy(data)
+            legacy_time = f'{time.perf_counter() - start:10.3f}'
+            diff = f'{np.max(np.abs(np.subtract(new, legacy))):10.2e}'
+        else:
+            legacy_time = diff = f'{"-":>10}'
+        print(f'{size:>8} {new_time:10.4f} {legacy_time} {diff}')
+
+
+if __name__ == '__main__':
+    main()
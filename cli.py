@@ -0,0 +1,236 @@
+"""
+Обработка экспериментов из командной строки без графического интерфейса, например на сервере или по расписанию.
+Все пути задаются явно, Config.txt и диалоги выбора папок не используются.
+
+    python cli.py import <папка с исходниками> --main-path <основная папка> --jobs 8
+    python cli.py reanalyze --main-path <основная папка> --material ХН50
+    python cli.py export --main-path <основная папка> --format xlsx
+    python cli.py query --main-path <основная папка> --coating AlTiN --feed 50..100 --json
+
+tkinter и matplotlib не импортируются. Модули обработки импортируются внутри команд,
+поэтому разбор аргументов и --help не загружают pandas.
+Код возврата: 0 - без ошибок, 1 - хотя бы один эксперимент не обработан, 2 - неверные аргументы.
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Optional
+
+# Поля фильтров: по равенству и по диапазону (см. MetadataIndex)
+CATEGORY_FILTERS = ('material', 'coating', 'stage')
+RANGE_FILTERS = ('feed', 'spindle_speed', 'start_day', 'strength_mean', 'temperature_mean')
+RANGE_SEPARATOR = '..'
+# Способы оценки нуля сил, см. baseline.BASELINE_ESTIMATORS
+ESTIMATORS = ('median', 'trimmed_mean', 'linear')
+# Поля вывода query по умолчанию
+QUERY_FIELDS = ('key', 'material', 'coating', 'stage', 'tool', 'feed', 'spindle_speed', 'passes',
+                'strength_mean', 'temperature_mean')
+
+
+def parse_range(text: str, name: str) -> tuple:
+    """
+    Диапазон фильтра в виде 'нижняя..верхняя' включительно, любая граница может быть пропущена: '50..', '..100'.
+    Даты (start_day) сравниваются как строки, остальные поля - как числа.
+    :return: tuple - (нижняя, верхняя), None - без границы.
+    """
+    if RANGE_SEPARATOR not in text:
+        raise argparse.ArgumentTypeError(f'{name}: диапазон задается как нижняя{RANGE_SEPARATOR}верхняя')
+    bounds = tuple(part.strip() or None for part in text.split(RANGE_SEPARATOR, 1))
+    if name == 'start_day':
+        return bounds
+    try:
+        return tuple(None if bound is None else float(bound) for bound in bounds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'{name}: границы диапазона должны быть числами') from None
+
+
+def add_filter_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group('фильтры экспериментов')
+    for name in CATEGORY_FILTERS:
+        group.add_argument(f'--{name.replace("_", "-")}', dest=name)
+    for name in RANGE_FILTERS:
+        group.add_argument(f'--{name.replace("_", "-")}', dest=name, metavar=f'LOW{RANGE_SEPARATOR}HIGH',
+                           type=lambda text, name=name: parse_range(text, name))
+    group.add_argument('--key', action='append', dest='keys', metavar='KEY',
+                       help='ключ эксперимента, можно указать несколько раз')
+
+
+def add_processing_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='количество процессов обработки, по умолчанию по числу ядер')
+    parser.add_argument('--no-excel', action='store_false', dest='excel', help='не записывать книги эксель')
+    parser.add_argument('--profile', action='store_true',
+                        help='вывести время, память и количество строк по этапам обработки')
+    # Список способов не импортируется из baseline, чтобы разбор аргументов не загружал numpy
+    parser.add_argument('--estimator', choices=ESTIMATORS, default=None,
+                        help='способ оценки нуля сил, по умолчанию median (для reanalyze - сохраненный при импорте)')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='cli.py', description='Обработка экспериментов без графического интерфейса')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    parser_import = commands.add_parser('import', help='импорт всех экспериментов из папки с исходниками')
+    parser_import.add_argument('source', help='папка, в которой ищутся пары папок Силы и Температура')
+    parser_import.add_argument('--main-path', required=True, help='основная папка с экспериментами и хранилищем')
+    add_processing_arguments(parser_import)
+
+    parser_reanalyze = commands.add_parser('reanalyze', help='повторная обработка экспериментов хранилища '
+                                                             'из исходных файлов')
+    parser_reanalyze.add_argument('--main-path', required=True)
+    add_processing_arguments(parser_reanalyze)
+    add_filter_arguments(parser_reanalyze)
+
+    parser_export = commands.add_parser('export', help='выгрузка файлов экспериментов из хранилища')
+    parser_export.add_argument('--main-path', required=True)
+    parser_export.add_argument('--format', action='append', dest='formats', metavar='FORMAT',
+                               help='формат выгрузки, можно указать несколько раз, по умолчанию files и xlsx')
+    add_filter_arguments(parser_export)
+
+    parser_query = commands.add_parser('query', help='список экспериментов хранилища')
+    parser_query.add_argument('--main-path', required=True)
+    parser_query.add_argument('--fields', help=f'поля через запятую, по умолчанию {",".join(QUERY_FIELDS)}')
+    parser_query.add_argument('--json', action='store_true', help='по одному объекту json на строку')
+    add_filter_arguments(parser_query)
+    return parser
+
+
+def open_store(parser: argparse.ArgumentParser, main_path: str):
+    """
+    Хранилище существующей основной папки. Новое хранилище создает только import.
+    """
+    if not os.path.isfile(os.path.join(main_path, 'data_base', 'catalog.sqlite3')):
+        parser.error(f'{main_path}: нет хранилища экспериментов (data_base/catalog.sqlite3)')
+    from data_class_communication.experiment_store import ExperimentStore
+
+    return ExperimentStore(os.path.join(main_path, 'data_base'))
+
+
+def select_records(store, args: argparse.Namespace) -> list:
+    """
+    Записи каталога, подходящие под фильтры команды.
+    """
+    from data_class_communication.metadata_index import MetadataIndex
+
+    filters = {name: getattr(args, name) for name in CATEGORY_FILTERS + RANGE_FILTERS}
+    records = MetadataIndex(store.records()).query(**filters)
+    if args.keys:
+        records = [record for record in records if record.key in args.keys]
+    return records
+
+
+def run_tasks(tasks: list, args: argparse.Namespace, force: bool = False) -> int:
+    """
+    Обработка экспериментов через run_import с выводом результата каждого эксперимента по мере завершения.
+    :return: int - код возврата.
+    """
+    from data_class_communication.batch_import import run_import
+    from data_class_communication.profiling import StageProfiler
+
+    def progress(done: int, total: int, result) -> None:
+        if not result.ok:
+            print(f'[{done}/{total}] error {result.task}: {result.error}', file=sys.stderr, flush=True)
+        else:
+            print(f'[{done}/{total}] {"skipped" if result.skipped else "ok"} {result.key}', flush=True)
+
+    profiler = StageProfiler() if args.profile else None
+    results = run_import(tasks, args.main_path, jobs=args.jobs, progress=progress, excel=args.excel,
+                         profiler=profiler, force=force)
+    failed = sum(not result.ok for result in results)
+    print(f'added {sum(result.ok and not result.skipped for result in results)}, '
+          f'skipped {sum(result.skipped for result in results)}, errors {failed}', flush=True)
+    if profiler is not None:
+        print(profiler.format_report(), file=sys.stderr)
+    return 1 if failed else 0
+
+
+def command_import(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    from data_class_communication.batch_import import find_import_tasks
+
+    if not os.path.isdir(args.source):
+        parser.error(f'{args.source}: папка не найдена')
+    os.makedirs(args.main_path, exist_ok=True)
+    tasks = find_import_tasks(args.source)
+    if args.estimator:
+        for task in tasks:
+            task.estimator = args.estimator
+    return run_tasks(tasks, args)
+
+
+def command_reanalyze(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    from data_class_communication.batch_import import ImportTask
+
+    records = select_records(open_store(parser, args.main_path), args)
+    # Эксперименты, добавленные без исходных папок (например, перенесенные из shelve), обработать заново нельзя
+    missing = [record.key for record in records if not record.source_path]
+    for key in missing:
+        print(f'error {key}: нет пути к исходным файлам', file=sys.stderr)
+    tasks = [ImportTask.from_record(record) for record in records if record.source_path]
+    if args.estimator:
+        for task in tasks:
+            task.estimator = args.estimator
+    code = run_tasks(tasks, args, force=True)
+    return 1 if missing else code
+
+
+def command_export(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    from data_class_communication.export_queue import ExportQueue, DEFAULT_FORMATS, DONE
+
+    store = open_store(parser, args.main_path)
+    keys = [record.key for record in select_records(store, args)]
+    formats = args.formats or list(DEFAULT_FORMATS)
+    # Одна попытка: ошибка выводится сразу, а не откладывается до повтора в приложении
+    queue = ExportQueue(store, args.main_path, max_attempts=1)
+    try:
+        queue.enqueue_many(keys, formats)
+    except KeyError as error:
+        parser.error(error.args[0])
+    queue.run_pending()
+    failed = 0
+    for key in keys:
+        for job in queue.status(key):
+            if job['format'] not in formats:
+                continue
+            if job['status'] == DONE:
+                print(f'ok {key} {job["format"]}')
+            else:
+                failed += 1
+                print(f'error {key} {job["format"]}: {job["error"]}', file=sys.stderr)
+    return 1 if failed else 0
+
+
+def command_query(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    from data_class_communication.experiment_store import CATALOG_FIELDS
+
+    fields = args.fields.split(',') if args.fields else list(QUERY_FIELDS)
+    unknown = set(fields) - set(CATALOG_FIELDS)
+    if unknown:
+        parser.error(f'нет полей каталога: {", ".join(sorted(unknown))}')
+    records = select_records(open_store(parser, args.main_path), args)
+    if args.json:
+        for record in records:
+            print(json.dumps({name: getattr(record, name) for name in fields}, ensure_ascii=False))
+    else:
+        print('\t'.join(fields))
+        for record in records:
+            print('\t'.join('' if getattr(record, name) is None else str(getattr(record, name)) for name in fields))
+    return 0
+
+
+COMMANDS = {
+    'import': command_import,
+    'reanalyze': command_reanalyze,
+    'export': command_export,
+    'query': command_query,
+}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    return COMMANDS[args.command](parser, args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,272 @@
+import hashlib
+import os
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Optional
+from analytical_functions.baseline import DEFAULT_ESTIMATOR
+from analytical_functions.analysis_functions import extract_param_path, list_all_path_strength_temperature
+from data_class_communication.class_for_communication import Strength, Temperature, Couple
+from data_class_communication.experiment_store import ExperimentStore, ExperimentRecord
+from data_class_communication.export_queue import ExportQueue, DEFAULT_FORMATS
+from data_class_communication.func_init import create_file_list, create_unique_dir
+from data_class_communication.manifest import update_catalog
+from data_class_communication.pass_cache import PassCache
+from data_class_communication.profiling import StageProfiler, profiling
+
+
+def default_cutting_params(material: str) -> tuple[float, float]:
+    """
+    Режимы резания по умолчанию для материала.
+    :param material: str - материал заготовки.
+    :return: tuple(float, float) - подача и частота вращения шпинделя.
+    """
+    if 'ХН' in material:
+        return 53.0, 800.0
+    return 200.0, 2000.0
+
+
+class ImportTask:
+    """
+    Параметры импорта одного эксперимента: папки с проходами сил и температуры и метаданные эксперимента.
+    Метаданные изначально берутся из пути (extract_param_path) и могут быть исправлены пользователем
+    до запуска импорта. estimator - способ оценки нуля сил (baseline.BASELINE_ESTIMATORS).
+    """
+    FIELDS = ('material', 'coating', 'tool', 'stage', 'feed', 'spindle_speed')
+
+    def __init__(self,
+                 path_strength: str,
+                 path_temperature: str,
+                 material: str,
+                 coating: str,
+                 tool: str,
+                 stage: str,
+                 feed: float | int,
+                 spindle_speed: float | int,
+                 estimator: str = DEFAULT_ESTIMATOR):
+        self.path_strength = path_strength
+        self.path_temperature = path_temperature
+        self.material = material
+        self.coating = coating
+        self.tool = tool
+        self.stage = stage
+        self.feed = feed
+        self.spindle_speed = spindle_speed
+        self.estimator = estimator
+
+    @classmethod
+    def from_paths(cls, path_strength: str, path_temperature: str):
+        """
+        Создание задачи с метаданными, извлеченными из пути к папке сил.
+        """
+        material, coating, tool, stage = extract_param_path(path_strength)
+        feed, spindle_speed = default_cutting_params(material)
+        return cls(path_strength, path_temperature, material, coating, tool, stage, feed, spindle_speed)
+
+    @classmethod
+    def from_record(cls, record: ExperimentRecord):
+        """
+        Задача повторной обработки эксперимента из хранилища: исходные папки и метаданные берутся из каталога,
+        поэтому исправленные при импорте метаданные и способ оценки нуля сохраняются.
+        Папка температуры лежит рядом с папкой сил.
+        """
+        path_temperature = os.path.join(os.path.dirname(record.source_path), 'Температура').replace('\\', '/')
+        return cls(record.source_path, path_temperature, *(getattr(record, name) for name in cls.FIELDS),
+                   estimator=record.baseline_estimator or DEFAULT_ESTIMATOR)
+
+    def __str__(self):
+        return f"{self.path_strength}"
+
+
+class ImportResult:
+    """
+    Результат импорта одного эксперимента: couple при успехе, либо текст ошибки.
+    skipped - эксперимент уже импортирован из тех же файлов с теми же метаданными, key - его ключ в хранилище.
+    """
+
+    def __init__(self,
+                 task: ImportTask,
+                 couple: Optional[Couple] = None,
+                 error: Optional[str] = None,
+                 skipped: bool = False,
+                 key: Optional[str] = None,
+                 profile: Optional[list[dict]] = None):
+        self.task = task
+        # Записи отчета профилирования этапов (StageProfiler.report), если импорт запущен с профилированием
+        self.profile = profile
+        self.couple = couple
+        self.error = error
+        self.skipped = skipped
+        self.key = key if key else (str(couple) if couple else None)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def find_import_tasks(directory: str) -> list[ImportTask]:
+    """
+    Поиск всех экспериментов (пар папок Силы и Температура) в папке с исходными данными.
+    :param directory: str - папка с исходниками экспериментов.
+    :return: list[ImportTask]
+    """
+    return [ImportTask.from_paths(strength, temperature)
+            for strength, temperature in list_all_path_strength_temperature(directory)]
+
+
+def source_hash(task: ImportTask, pass_cache: PassCache) -> str:
+    """
+    Хэш эксперимента: метаданные задачи, способ оценки нуля и хэши содержимого всех файлов проходов
+    сил и температуры.
+    """
+    digest = hashlib.sha1()
+    for name in ImportTask.FIELDS:
+        digest.update(f'{name}={getattr(task, name)};'.encode())
+    digest.update(f'estimator={task.estimator};'.encode())
+    for path in create_file_list(task.path_strength) + create_file_list(task.path_temperature):
+        digest.update(pass_cache.file_hash(path).encode())
+    return digest.hexdigest()
+
+
+def process_task(task: ImportTask, main_path: str, pass_cache: PassCache = None, filename: str = None,
+                 excel: bool = True, save: bool = True, digest: str = None) -> Couple:
+    """
+    Обработка одного эксперимента: чтение проходов, поиск нуля, регрессия и сохранение файлов в main_path.
+    Эксперимент не добавляется в хранилище, это делает run_import в основном процессе.
+    :param pass_cache: PassCache - кэш обработанных проходов.
+    :param filename: str - папка ранее импортированного эксперимента, файлы в ней перезаписываются.
+    :param excel: bool - записывать ли книгу эксель, см. Couple.save_file.
+    :param save: bool - записывать ли файлы эксперимента. При False только создается папка эксперимента,
+    а файлы записывает очередь выгрузки ExportQueue после добавления эксперимента в хранилище.
+    :param digest: str - хэш исходных файлов (см. source_hash), записывается в манифест.
+    """
+    params = {name: getattr(task, name) for name in ImportTask.FIELDS}
+    strength = Strength(path_strength=task.path_strength, pass_cache=pass_cache, estimator=task.estimator, **params)
+    temperature = Temperature(path_temperature=task.path_temperature, couple_strength=strength,
+                              pass_cache=pass_cache, **params)
+    couple = Couple(strength=strength, temperature=temperature)
+    couple.source_path = task.path_strength
+    couple.source_hash = digest
+    if save:
+        couple.save_file(main_path, data_base=False, filename=filename, excel=excel)
+    else:
+        strength_dir = os.path.join(main_path, filename) if filename else create_unique_dir(main_path,
+                                                                                            strength.filename_base)
+        os.makedirs(strength_dir, exist_ok=True)
+        strength.filename = os.path.basename(strength_dir)
+    return couple
+
+
+def _run_task(task: ImportTask, main_path: str, excel: bool = True, save: bool = True,
+              profile: bool = False, force: bool = False) -> ImportResult:
+    """
+    Импорт одного эксперимента с проверкой предыдущего импорта.
+    Если эксперимент из той же папки уже есть в хранилище и его исходные файлы и метаданные не изменились,
+    он пропускается. Если изменились - обрабатывается заново с сохранением в ту же папку.
+    :param profile: bool - замерить этапы обработки, отчет записывается в ImportResult.profile.
+    :param force: bool - обработать заново, даже если исходные файлы и метаданные не изменились.
+    """
+    if profile:
+        with profiling() as profiler:
+            result = _run_task(task, main_path, excel, save, force=force)
+        result.profile = profiler.report()
+        return result
+    try:
+        pass_cache = PassCache(f'{main_path}/data_base/pass_cache')
+        digest = source_hash(task, pass_cache)
+        previous = ExperimentStore(f'{main_path}/data_base').records(source_path=task.path_strength)
+        filename = previous[0].key if previous else None
+        if previous and previous[0].source_hash == digest and not force:
+            return ImportResult(task, skipped=True, key=filename)
+        couple = process_task(task, main_path, pass_cache, filename, excel, save, digest)
+        return ImportResult(task, couple=couple)
+    except Exception as error:
+        return ImportResult(task, error=f'{type(error).__name__}: {error}')
+
+
+def run_import(tasks: list[ImportTask],
+               main_path: str,
+               jobs: Optional[int] = None,
+               progress: Optional[Callable[[int, int, ImportResult], None]] = None,
+               cancel_event: Optional[threading.Event] = None,
+               excel: bool = True,
+               exports: Optional[ExportQueue] = None,
+               profiler: Optional[StageProfiler] = None,
+               force: bool = False) -> list[ImportResult]:
+    """
+    Пакетный импорт экспериментов в пуле процессов.
+    Чтение и обработка файлов выполняются параллельно, готовые эксперименты добавляются в хранилище
+    <main_path>/data_base из основного процесса: все эксперименты, завершившиеся к моменту проверки,
+    добавляются одной транзакцией. При аварийном завершении теряется только незафиксированная группа,
+    она будет импортирована при следующем запуске.
+    Неизмененные эксперименты пропускаются, а обработанные проходы берутся из кэша <main_path>/data_base/pass_cache.
+    :param tasks: list[ImportTask] - эксперименты для импорта.
+    :param main_path: str - основная папка для файлов и базы данных.
+    :param jobs: int - количество процессов, по умолчанию равно количеству ядер. При jobs=1 пул не создается.
+    :param progress: функция progress(done, total, result), вызывается для каждого эксперимента
+    после его фиксации в хранилище.
+    :param cancel_event: threading.Event - после его установки новые эксперименты не запускаются,
+    уже начатые дорабатываются и сохраняются.
+    :param excel: bool - записывать ли книги эксель. При False книги можно создать позже (Couple.export_excel).
+    :param exports: ExportQueue - очередь выгрузки. Если задана, процессы импорта не записывают файлы экспериментов:
+    эксперимент сразу добавляется в хранилище, а файлы записываются очередью в фоне.
+    :param profiler: StageProfiler - если задан, этапы обработки каждого эксперимента замеряются в процессах
+    импорта и добавляются в profiler вместе с фиксацией в хранилище (import.commit).
+    :param force: bool - повторная обработка экспериментов, уже импортированных из тех же файлов,
+    например после изменения алгоритма анализа. Эксперимент перезаписывается в ту же папку.
+    :return: list[ImportResult] - результаты в порядке завершения, ошибки не прерывают импорт.
+    """
+    store = ExperimentStore(f'{main_path}/data_base')
+    results: list[ImportResult] = []
+
+    save = exports is None
+
+    def finish(finished: list[ImportResult]) -> None:
+        added = [result for result in finished if result.ok and not result.skipped]
+        with profiler.stage('import.commit') if profiler else nullcontext() as record:
+            with store.batch():
+                for result in added:
+                    store.add_couple(result.couple)
+            if added:
+                update_catalog(main_path, {result.key: result.couple.manifest() for result in added})
+            if record is not None:
+                record.rows = len(added)
+        if profiler is not None:
+            for result in finished:
+                profiler.extend(result.profile or [])
+        if exports is not None and added:
+            exports.enqueue_many([result.key for result in added], DEFAULT_FORMATS if excel else ('files',))
+        for result in finished:
+            results.append(result)
+            if progress:
+                progress(len(results), len(tasks), result)
+
+    def cancelled() -> bool:
+        return cancel_event is not None and cancel_event.is_set()
+
+    if jobs == 1:
+        for task in tasks:
+            if cancelled():
+                break
+            finish([_run_task(task, main_path, excel, save, profiler is not None, force)])
+        return results
+
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        futures = {executor.submit(_run_task, task, main_path, excel, save, profiler is not None, force): task
+                   for task in tasks}
+        not_done = set(futures)
+        while not_done:
+            done, not_done = wait(not_done, return_when=FIRST_COMPLETED)
+            finished = []
+            for future in done:
+                if future.cancelled():
+                    continue
+                try:
+                    finished.append(future.result())
+                except Exception as error:
+                    finished.append(ImportResult(futures[future], error=f'{type(error).__name__}: {error}'))
+            finish(finished)
+            if cancelled():
+                for future in not_done:
+                    future.cancel()
+    return results
@@ -1,17 +1,31 @@
+import json
 import os
 import pandas as pd
-from analytical_functions.analysis_functions import determining_coefficient_without_bad_data, predict, data_with_out_nan
-import openpyxl
+from analytical_functions.analysis_functions import determining_coefficient_without_bad_data, predict
 import time
 import uuid
+from functools import cached_property, partial
+from analytical_functions.streaming import StrengthStream, TemperatureStream, count_above, temperature_step
 from data_class_communication.func_init import create_file_list, create_data_frame_strength, \
-    create_data_strength_from_list, extract_basename, create_data_frame_temperature_from_list, \
-    create_data_frame_temperature
+    extract_basename, create_data_frame_temperature, list_experiment_dirs, create_unique_dir, \
+    read_strength_chunks, read_temperature_chunks, processed_frame_loader
+from data_class_communication.series_file import SERIES_SUFFIX, write_series
+from analytical_functions.decimation import DecimationPyramid, PyramidCache
+from analytical_functions.overlay import AlignedGrid
+from analytical_functions.alignment import align_frames
+from analytical_functions.baseline import DEFAULT_ESTIMATOR
+from data_class_communication.experiment_store import ExperimentStore
+from data_class_communication.pass_cache import PassCache
+from data_class_communication.excel_export import write_workbook
+from data_class_communication.profiling import stage as profile_stage, profiled_chunks
+from data_class_communication.manifest import write_manifest, read_experiment_metadata, read_catalog, \
+    rebuild_catalog, update_catalog, typed
 import numpy as np
-import pickle
-import shelve
-import matplotlib.pyplot as plt
-import seaborn as sns
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from data_class_communication.plot_surface import PlotSurface
 
 
 class Strength:
@@ -30,11 +44,14 @@ class Strength:
     Также передаются параметры для анализа:
     min_strength: float  | int - для минимального значения с которого мы считаем начало и конец обработки.
     precent: float - прцент непригодных данных при построении модели.
+    estimator: str - способ оценки нуля сил каждого прохода (baseline.BASELINE_ESTIMATORS).
 
     strength.from_dir(path_strength: str):
     Также реализовано создание экземпляра из созданных заранее файлов.
 
     """
+    # Объекты, сохраненные в shelve до выбора способа оценки нуля, не содержат этого атрибута
+    estimator: str = DEFAULT_ESTIMATOR
 
     def __init__(self,
                  path_strength: str,
@@ -46,9 +63,13 @@ class Strength:
                  stage: str,
                  min_strength: float | int = 12,
                  from_files: bool = False,
-                 percent: float | int = 0.22):
+                 percent: float | int = 0.22,
+                 pass_cache: PassCache = None,
+                 estimator: str = DEFAULT_ESTIMATOR):
         """
-
+        :param pass_cache: PassCache - кэш обработанных проходов, неизмененные файлы не читаются повторно.
+        :param estimator: str - способ оценки нуля сил, ноль учитывается при потоковом чтении каждого прохода
+        (read_strength_chunks).
         :rtype: object
         """
         self.material = material
@@ -57,92 +78,143 @@ class Strength:
         self.feed = feed
         self.spindle_speed = spindle_speed
         self.stage = stage
+        self.estimator = estimator
+        self._data_frame_loader = None
         if not from_files:
-            list_file = create_file_list(path_strength)
-            list_data = [create_data_frame_strength(path_s, min_strength) for path_s in list_file]
-            self.data_frame = create_data_strength_from_list(list_data, min_strength)
+            experiment = f'{tool};{material};{coating};{feed};{spindle_speed};{stage}'
+            with profile_stage('strength.file_list', experiment) as record:
+                list_file = create_file_list(path_strength)
+                record.rows = len(list_file)
+            # Проходы обрабатываются по очереди, в памяти одновременно находится не больше одного прохода.
+            # strength.passes включает чтение файлов (strength.parse или strength.cache), поиск нуля,
+            # время обработки и усреднение
+            with profile_stage('strength.passes', experiment) as record:
+                stream = StrengthStream(min_strength)
+                for path_s in list_file:
+                    if pass_cache:
+                        # Загрузка прохода из кэша, при промахе включает чтение и обработку файла
+                        with profile_stage('strength.cache', experiment) as cache_record:
+                            frame = pass_cache.load(path_s, f'strength-{min_strength}-{estimator}',
+                                                    create_data_frame_strength, min_strength, estimator)
+                            cache_record.rows = len(frame)
+                        stream.add_pass([frame])
+                    else:
+                        stream.add_pass(profiled_chunks(read_strength_chunks(path_s, min_strength,
+                                                                             estimator=estimator),
+                                                        'strength.parse', experiment))
+                self.data_frame = stream.frame()
+                record.rows = len(self.data_frame)
             self.start_day = time.strftime('%Y.%m.%d-%H:%M:%S', time.localtime(os.path.getmtime(list_file[0])))
             self.last_day = time.strftime('%Y.%m.%d-%H:%M:%S', time.localtime(os.path.getmtime(list_file[-1])))
             self.unique_id = str(uuid.uuid4())
             self.filename_base = f'{tool};{material};{coating};{feed};{spindle_speed};{stage}'
             self.filename = self.filename_base
-            self.passes = len(list_data)
-            self.coefficient_mnk = determining_coefficient_without_bad_data(self.data_frame, percent)
+            self.passes = stream.passes
+            with profile_stage('strength.regression', experiment) as record:
+                self.coefficient_mnk = determining_coefficient_without_bad_data(self.data_frame, percent)
+                record.rows = len(self.data_frame)
             self.data_frame['Model_strength'] = predict(*self.coefficient_mnk, self.data_frame['Time'])
             self.equation_mnk = f"{self.coefficient_mnk[0]:.2f} + {self.coefficient_mnk[1]:.2f}\u00b7T = Fy"
             self.strength_mean = self.data_frame['Fy'].mean()
             self.processing_time = self.data_frame['Time'].iloc[-1]
 
-    def save_file(self, path_dir: str) -> None:
+    @cached_property
+    def data_frame(self) -> pd.DataFrame:
+        """
+        Таблица с данными о силе.
+        У объектов, созданных в ленивом режиме (lazy=True), читается при первом обращении и затем хранится в объекте.
+        """
+        return self._data_frame_loader()
+
+    def save_file(self, path_dir: str, filename: str = None, excel: bool = True) -> None:
         """
         Сохранение данных в файлы эксель и csv,
-        а также текстовый файл с информацией о данном  испытании и записывается в базу данных shelve_db.
+        а также манифест с информацией о данном  испытании (<имя папки>_manifest.json, см. manifest).
         :param path_dir: str - путь к директории для сохранения файлов
+        :param filename: str - имя существующей папки эксперимента, файлы в ней перезаписываются.
+        По умолчанию создается новая папка.
+        :param excel: bool - записывать ли файл эксель. Couple.save_file передает False и записывает
+        общую книгу сам.
         :return: None
 
         """
-        strength_dir = os.path.join(path_dir, self.filename_base)
-        counter = 1
-        while os.path.exists(strength_dir):
-            strength_dir = os.path.join(path_dir, f'{self.filename_base}_{counter}')
-            counter += 1
-
+        if filename:
+            strength_dir = os.path.join(path_dir, filename)
+            os.makedirs(strength_dir, exist_ok=True)
+        else:
+            strength_dir = create_unique_dir(path_dir, self.filename_base)
         self.filename = os.path.basename(strength_dir)
-        os.makedirs(strength_dir)
-
-        # Сохранение информации в текстовый файл
-        with open(f'{strength_dir}/{self.filename}_info.txt', 'w') as info_file:
-            info_file.write(f'Material: {self.material}\n')
-            info_file.write(f'Coating: {self.coating}\n')
-            info_file.write(f'Tool: {self.tool}\n')
-            info_file.write(f'Feed: {self.feed}\n')
-            info_file.write(f'Spindle Speed: {self.spindle_speed}\n')
-            info_file.write(f'Stage: {self.stage}\n')
-            info_file.write(f'Strength mean: {self.strength_mean}\n')
-            info_file.write(f'Equation: {self.equation_mnk}\n')
-            info_file.write(f'w0: {self.coefficient_mnk[0]}\n')
-            info_file.write(f'w1: {self.coefficient_mnk[1]}\n')
-            info_file.write(f'Unique ID: {self.unique_id}\n')
-            info_file.write(f'Passes: {self.passes}\n')
-            info_file.write(f'Processing time: {self.processing_time}\n')
-            info_file.write(f'Start: {self.start_day}\n')
-            info_file.write(f'End: {self.last_day}\n')
+
+        write_manifest(strength_dir, self.manifest())
 
         self.data_frame.to_csv(f'{strength_dir}/{self.filename}_силы.csv', sep=';', decimal=',')
-        with pd.ExcelWriter(f'{strength_dir}/{self.filename}.xlsx') as writer:
-            self.data_frame.to_excel(writer, sheet_name='Data_strength')
+        write_series(f'{strength_dir}/{self.filename}_силы{SERIES_SUFFIX}', self.data_frame)
+        if excel:
+            write_workbook(f'{strength_dir}/{self.filename}.xlsx', {'Data_strength': self.data_frame})
+
+    def manifest(self) -> dict:
+        """
+        Поля манифеста эксперимента, относящиеся к силам.
+        """
+        return typed({'tool': self.tool,
+                      'material': self.material,
+                      'coating': self.coating,
+                      'stage': self.stage,
+                      'feed': self.feed,
+                      'spindle_speed': self.spindle_speed,
+                      'start_day': self.start_day,
+                      'last_day': self.last_day,
+                      'passes': self.passes,
+                      'processing_time': self.processing_time,
+                      'unique_id': self.unique_id,
+                      'strength_mean': self.strength_mean,
+                      'w0': self.coefficient_mnk[0],
+                      'w1': self.coefficient_mnk[1],
+                      'equation': self.equation_mnk,
+                      'baseline_estimator': self.estimator})
 
     @classmethod
-    def from_dir(cls, path_dir: str):
+    def from_dir(cls, path_dir: str, lazy: bool = False):
         """
         Создание объекта Strength из попки с проходами.
+        :param lazy: bool - если True, таблица с данными читается только при первом обращении к data_frame.
         """
-        dir_name_with_suffix = extract_basename(os.path.basename(path_dir))
-        basename = extract_basename(path_dir)
-        tool, material, coating, feed, spindle_speed, stage = basename.split(';')
-        data_frame = pd.read_csv(f'{path_dir}/{dir_name_with_suffix}_силы.csv', sep=';', decimal=',', index_col=0)
+        return cls.from_metadata(path_dir, read_experiment_metadata(path_dir), lazy)
 
-        with open(f'{path_dir}/{dir_name_with_suffix}_info.txt', 'r') as info_file:
-            text = info_file.readlines()
-            info_dict = {elem.split(':')[0]: elem.split(':')[1].strip() for elem in text}
+    @classmethod
+    def from_metadata(cls, path_dir: str, metadata: dict, lazy: bool = False):
+        """
+        Создание объекта Strength по уже прочитанным метаданным папки эксперимента (манифест или сводный каталог).
+        Параметры, которых нет в метаданных прежних версий, берутся из имени папки.
+        """
+        dir_name_with_suffix = os.path.basename(path_dir)
+        basename = extract_basename(dir_name_with_suffix)
+        tool, material, coating, feed, spindle_speed, stage = basename.split(';')
+        load_data_frame = processed_frame_loader(f'{path_dir}/{dir_name_with_suffix}_силы.csv')
 
         strength = cls(path_strength="",
-                       material=material,
-                       coating=coating, tool=tool,
-                       feed=float(feed),
-                       spindle_speed=float(spindle_speed),
-                       stage=stage,
-                       from_files=True)
-
-        strength.data_frame = data_frame
-        strength.start_day = info_dict['Start']
-        strength.last_day = info_dict['End']
-        strength.unique_id = info_dict['Unique ID']
-        strength.passes = int(info_dict['Passes'])
-        strength.strength_mean = float(info_dict['Strength mean'])
-        strength.coefficient_mnk = float(info_dict['w0']), float(info_dict['w1'])
-        strength.equation_mnk = info_dict['Equation']
-        strength.processing_time = float(info_dict['Processing time'])
+                       material=metadata.get('material') or material,
+                       coating=metadata.get('coating') or coating,
+                       tool=metadata.get('tool') or tool,
+                       feed=metadata.get('feed') or float(feed),
+                       spindle_speed=metadata.get('spindle_speed') or float(spindle_speed),
+                       stage=metadata.get('stage') or stage,
+                       from_files=True,
+                       # Папки прежних версий не хранят способ оценки нуля
+                       estimator=metadata.get('baseline_estimator'))
+
+        if lazy:
+            strength._data_frame_loader = load_data_frame
+        else:
+            strength.data_frame = load_data_frame()
+        strength.start_day = metadata['start_day']
+        strength.last_day = metadata['last_day']
+        strength.unique_id = metadata['unique_id']
+        strength.passes = metadata['passes']
+        strength.strength_mean = metadata['strength_mean']
+        strength.coefficient_mnk = metadata['w0'], metadata['w1']
+        strength.equation_mnk = metadata['equation']
+        strength.processing_time = metadata['processing_time']
         strength.filename = os.path.basename(path_dir)
         return strength
 
@@ -181,26 +253,50 @@ class Temperature:
                  min_voltage: float | int = 6,
                  from_files: bool = False,
                  percent: float | int = 0.22,
-                 couple_strength: Strength = None):
+                 couple_strength: Strength = None,
+                 pass_cache: PassCache = None):
         self.material = material
         self.coating = coating
         self.tool = tool
         self.feed = feed
         self.spindle_speed = spindle_speed
         self.stage = stage
+        self._data_frame_loader = None
         if not from_files:
-            list_file = create_file_list(path_temperature)
-            list_data = [create_data_frame_temperature(path_t) for path_t in list_file]
-            self.data_frame = create_data_frame_temperature_from_list(list_data, min_voltage,
-                                                                      couple_strength.processing_time)
+            experiment = f'{tool};{material};{coating};{feed};{spindle_speed};{stage}'
+            with profile_stage('temperature.file_list', experiment) as record:
+                list_file = create_file_list(path_temperature)
+                record.rows = len(list_file)
+
+            def read_pass(path_t: str):
+                if pass_cache:
+                    with profile_stage('temperature.cache', experiment) as cache_record:
+                        frame = pass_cache.load(path_t, 'temperature', create_data_frame_temperature)
+                        cache_record.rows = len(frame)
+                    return [frame]
+                return profiled_chunks(read_temperature_chunks(path_t), 'temperature.parse', experiment)
+
+            # Шаг времени зависит от общего количества точек, поэтому проходы читаются дважды:
+            # сначала для подсчета точек, затем для усреднения по секундам
+            with profile_stage('temperature.count', experiment) as record:
+                count = sum(count_above(read_pass(path_t), 'Voltage', min_voltage) for path_t in list_file)
+                record.rows = count
+            with profile_stage('temperature.passes', experiment) as record:
+                stream = TemperatureStream(min_voltage, temperature_step(count, couple_strength.processing_time))
+                for path_t in list_file:
+                    stream.add_pass(read_pass(path_t))
+                self.data_frame = stream.frame()
+                record.rows = len(self.data_frame)
             self.couple_strength_data = couple_strength.data_frame
             self.unique_id = str(uuid.uuid4())
             self.filename_base = f'{tool};{material};{coating};{feed};{spindle_speed};{stage}'
             self.filename = self.filename_base
-            self.passes = len(list_data)
+            self.passes = stream.passes
             self.data_frame['Temperature'] = round(self.data_frame['Voltage'] * 24.08, 2)
-            self.coefficient_mnk = determining_coefficient_without_bad_data(self.data_frame[["Time", "Temperature"]],
-                                                                            percent=percent)
+            with profile_stage('temperature.regression', experiment) as record:
+                self.coefficient_mnk = determining_coefficient_without_bad_data(
+                    self.data_frame[["Time", "Temperature"]], percent=percent)
+                record.rows = len(self.data_frame)
             self.data_frame['Model_temp'] = predict(*self.coefficient_mnk, self.data_frame['Time'])
             self.temperature_mean = self.data_frame['Temperature'].mean()
             self.equation_mnk = f"{self.coefficient_mnk[0]:.2f}  +  {self.coefficient_mnk[1]:.2f}\u00b7t = T"
@@ -210,139 +306,334 @@ class Temperature:
             else:
                 self.processing_time = self.data_frame['Time'].iloc[-1]
 
-    def save_file(self, path_dir: str, couple_strength: Strength = None) -> None:
+    @cached_property
+    def data_frame(self) -> pd.DataFrame:
+        """
+        Таблица с данными о температуре.
+        У объектов, созданных в ленивом режиме (lazy=True), читается при первом обращении и затем хранится в объекте.
+        """
+        return self._data_frame_loader()
+
+    def save_file(self, path_dir: str, couple_strength: Strength = None, excel: bool = True) -> None:
         """
-        Сохранение информации в текстовый файл, excel файл
+        Сохранение информации в манифест, excel файл
+        :param excel: bool - записывать ли файл эксель, см. Strength.save_file.
         """
         if couple_strength:
             filename = couple_strength.filename
-            with open(f'{path_dir}/{filename}/{filename}_info.txt', 'a') as info_file:
-                info_file.write(f'Temperature_mean: {self.temperature_mean}\n')
-                info_file.write(f'w0_t: {self.coefficient_mnk[0]}\n')
-                info_file.write(f'w1_t: {self.coefficient_mnk[1]}\n')
-                info_file.write(f'Equation_temperature: {self.equation_mnk}\n')
-                info_file.write(f'Unique_temperature ID: {self.unique_id}\n')
+            write_manifest(f'{path_dir}/{filename}', self.manifest(), update=True)
 
             self.data_frame.to_csv(f'{path_dir}/{filename}/{filename}_temperature.csv', sep=';', decimal=',')
-            with pd.ExcelWriter(f'{path_dir}/{filename}/{filename}.xlsx') as writer:
-                self.couple_strength_data.to_excel(writer, sheet_name='Data_strength')
-                self.data_frame.to_excel(writer, sheet_name='Data_temperature')
+            write_series(f'{path_dir}/{filename}/{filename}_temperature{SERIES_SUFFIX}', self.data_frame)
+            if excel:
+                write_workbook(f'{path_dir}/{filename}/{filename}.xlsx',
+                               {'Data_strength': self.couple_strength_data, 'Data_temperature': self.data_frame})
 
         else:
-            temperature_dir = os.path.join(path_dir, self.filename_base)
-            counter = 1
-            while os.path.exists(temperature_dir):
-                temperature_dir = os.path.join(path_dir, f'{self.filename_base}_{counter}')
-                counter += 1
-
+            temperature_dir = create_unique_dir(path_dir, self.filename_base)
             self.filename = os.path.basename(temperature_dir)
-            os.makedirs(temperature_dir)
-
-            # Сохранение информации в текстовый файл
-            with open(f'{temperature_dir}/{self.filename}_info.txt', 'w') as info_file:
-                info_file.write(f'Material: {self.material}\n')
-                info_file.write(f'Coating: {self.coating}\n')
-                info_file.write(f'Tool: {self.tool}\n')
-                info_file.write(f'Feed: {self.feed}\n')
-                info_file.write(f'Spindle Speed: {self.spindle_speed}\n')
-                info_file.write(f'Stage: {self.stage}\n')
-                info_file.write(f'Temperature mean: {self.temperature_mean}\n')
-                info_file.write(f'Equation_temperature: {self.equation_mnk}\n')
-                info_file.write(f'w0_t: {self.coefficient_mnk[0]}\n')
-                info_file.write(f'w1_t: {self.coefficient_mnk[1]}\n')
-                info_file.write(f'Unique_temperature ID: {self.unique_id}\n')
-                info_file.write(f'Passes: {self.passes}\n')
-                info_file.write(f'Processing time: {self.processing_time}\n')
+
+            write_manifest(temperature_dir, {'tool': self.tool,
+                                             'material': self.material,
+                                             'coating': self.coating,
+                                             'stage': self.stage,
+                                             'feed': self.feed,
+                                             'spindle_speed': self.spindle_speed,
+                                             'passes': self.passes,
+                                             'processing_time': self.processing_time,
+                                             **self.manifest()})
 
             self.data_frame.to_csv(f'{temperature_dir}/{self.filename}_temperature.csv', sep=';', decimal=',')
-            with pd.ExcelWriter(f'{temperature_dir}/{self.filename}.xlsx') as writer:
-                self.data_frame.to_excel(writer, sheet_name='Data_temperature')
+            write_series(f'{temperature_dir}/{self.filename}_temperature{SERIES_SUFFIX}', self.data_frame)
+            if excel:
+                write_workbook(f'{temperature_dir}/{self.filename}.xlsx', {'Data_temperature': self.data_frame})
+
+    def manifest(self) -> dict:
+        """
+        Поля манифеста эксперимента, относящиеся к температуре.
+        """
+        return typed({'temperature_unique_id': self.unique_id,
+                      'temperature_passes': self.passes,
+                      'temperature_mean': self.temperature_mean,
+                      'w0_t': self.coefficient_mnk[0],
+                      'w1_t': self.coefficient_mnk[1],
+                      'equation_temperature': self.equation_mnk})
 
     @classmethod
-    def from_dir(cls, path_dir: str):
+    def from_dir(cls, path_dir: str, lazy: bool = False):
         """
         Создание объекта Temperature из директории с данными
+        :param lazy: bool - если True, таблица с данными читается только при первом обращении к data_frame.
         """
-        dir_name_with_suffix = extract_basename(os.path.basename(path_dir))
-        basename = extract_basename(path_dir)
-        tool, material, coating, feed, spindle_speed, stage = basename.split(';')
-        data_frame = pd.read_csv(f'{path_dir}/{dir_name_with_suffix}_temperature.csv', sep=';', decimal=',',
-                                 index_col=0)
+        return cls.from_metadata(path_dir, read_experiment_metadata(path_dir), lazy)
 
-        with open(f'{path_dir}/{dir_name_with_suffix}_info.txt', 'r') as info_file:
-            text = info_file.readlines()
-            info_dict = {elem.split(':')[0]: elem.split(':')[1].strip() for elem in text}
+    @classmethod
+    def from_metadata(cls, path_dir: str, metadata: dict, lazy: bool = False):
+        """
+        Создание объекта Temperature по уже прочитанным метаданным папки эксперимента, см. Strength.from_metadata.
+        """
+        dir_name_with_suffix = os.path.basename(path_dir)
+        basename = extract_basename(dir_name_with_suffix)
+        tool, material, coating, feed, spindle_speed, stage = basename.split(';')
+        load_data_frame = processed_frame_loader(f'{path_dir}/{dir_name_with_suffix}_temperature.csv')
 
         temperature = cls(path_temperature="",
-                          material=material,
-                          coating=coating,
-                          tool=tool,
-                          feed=float(feed),
-                          spindle_speed=float(spindle_speed),
-                          stage=stage,
+                          material=metadata.get('material') or material,
+                          coating=metadata.get('coating') or coating,
+                          tool=metadata.get('tool') or tool,
+                          feed=metadata.get('feed') or float(feed),
+                          spindle_speed=metadata.get('spindle_speed') or float(spindle_speed),
+                          stage=metadata.get('stage') or stage,
                           from_files=True)
 
-        temperature.data_frame = data_frame
-        temperature.unique_id = info_dict['Unique_temperature ID']
-        temperature.passes = int(info_dict['Passes'])
-        temperature.temperature_mean = float(info_dict['Temperature_mean'])
-        temperature.coefficient_mnk = float(info_dict['w0_t']), float(info_dict['w1_t'])
-        temperature.equation_mnk = info_dict['Equation_temperature']
-        temperature.processing_time = float(info_dict['Processing time'])
+        if lazy:
+            temperature._data_frame_loader = load_data_frame
+        else:
+            temperature.data_frame = load_data_frame()
+        temperature.unique_id = metadata['temperature_unique_id']
+        # В _info.txt прежних версий количество проходов температуры не записывалось
+        temperature.passes = metadata.get('temperature_passes') or metadata['passes']
+        temperature.temperature_mean = metadata['temperature_mean']
+        temperature.coefficient_mnk = metadata['w0_t'], metadata['w1_t']
+        temperature.equation_mnk = metadata['equation_temperature']
+        temperature.processing_time = metadata['processing_time']
         return temperature
 
 
 class Couple:
-    def __init__(self, strength: Strength, temperature: Temperature) -> None:
+    # Папка с исходными проходами сил и хэш исходных файлов, заполняются при пакетном импорте
+    source_path: str = None
+    source_hash: str = None
+    # Подписи графика, измененные пользователем: атрибут Plot -> значение, хранятся в каталоге
+    plot_labels: dict = None
+
+    def __init__(self, strength: Strength, temperature: Temperature, lazy: bool = False) -> None:
         """
         Класс для хранения информации о силе и температуре износстойкого испытания фрезы.
         При инициализации создается объединенная таблица с данными силы и температуры.
         def __init__(self, strength: Strength, temperature: Temperature) -> None
         :param strength: Strength
         :param temperature: Temperature
+        :param lazy: bool - если True, объединенная таблица couple_data и plot создаются при первом обращении.
          также при иницализацит создается атрибут plot - который является экземпляром класса Plot, и служит для
          отображения графиков.
 
          Метода save_file(self, path_dir: str)  -> None:
          вызывает последовательно методы save_file у атрибутов strength и temperature затем создает новый excel файл.
-         Затем сохраняет объект в базу данных shrlve_db.
+         Затем добавляет эксперимент в хранилище ExperimentStore (<path_dir>/data_base).
 
 
 
 
         """
-        self.couple_data: pd.DataFrame = pd.DataFrame()
         self.strength = strength
         self.temperature = temperature
-        self.merge_file()
-        self.plot = Plot(self)
-
-    def merge_file(self):
-        self.couple_data = pd.merge(self.strength.data_frame,
-                                    self.temperature.data_frame,
-                                    how='outer',
-                                    on='Time').sort_values(by='Time', ascending=True).reset_index(drop=True)
+        if not lazy:
+            self.merge_file()
+            self.plot = Plot(self)
+
+    @cached_property
+    def couple_data(self) -> pd.DataFrame:
+        return self.merge_file()
+
+    @cached_property
+    def plot(self) -> 'Plot':
+        return Plot(self)
+
+    def merge_file(self, method: str = 'nearest', how: str = 'outer') -> pd.DataFrame:
+        """
+        Объединенная таблица силы и температуры на общей сетке целых секунд (см. alignment.align_frames).
+        :param method: str - способ переноса рядов на сетку: 'nearest', 'interp' или 'asof'.
+        :param how: str - 'outer' - все время испытания, 'inner' - только время, где есть оба ряда.
+        :return: pd.DataFrame - столбцы Time, столбцы силы и столбцы температуры.
+        """
+        with profile_stage('couple.merge', str(self)) as record:
+            self.couple_data = align_frames([self.strength.data_frame, self.temperature.data_frame], method, how=how)
+            record.rows = len(self.couple_data)
         return self.couple_data
 
-    def save_file(self, path_dir: str) -> None:
+    def save_file(self, path_dir: str, data_base: bool = True, filename: str = None,
+                  store: ExperimentStore = None, excel: bool = True) -> None:
+        """
+        Сохранение информации в манифест, csv и excel файл
+        :param data_base: bool - добавлять ли эксперимент в хранилище <path_dir>/data_base. Пакетный импорт
+        передает False и добавляет эксперименты в хранилище сам из основного процесса.
+        :param filename: str - имя существующей папки эксперимента для повторного импорта, см. Strength.save_file.
+        :param store: ExperimentStore - открытое хранилище, например внутри store.batch() при сохранении
+        нескольких экспериментов одной транзакцией. По умолчанию открывается <path_dir>/data_base.
+        :param excel: bool - записывать ли книгу эксель. Пакетный импорт может пропустить ее
+        и записать позже методом export_excel.
+        """
+        with profile_stage('save.files', str(self)) as record:
+            self.strength.save_file(path_dir, filename, excel=False)
+            self.temperature.save_file(path_dir, self.strength, excel=False)
+            manifest = write_manifest(f'{path_dir}/{self.strength.filename}', self.manifest())
+            record.rows = len(self.strength.data_frame) + len(self.temperature.data_frame)
+        if excel:
+            with profile_stage('save.excel', str(self)) as record:
+                self.export_excel(path_dir)
+                record.rows = len(self.couple_data)
+
+        if data_base:
+            with profile_stage('save.store', str(self)):
+                (store if store is not None else ExperimentStore(f'{path_dir}/data_base')).add_couple(self)
+                update_catalog(path_dir, {str(self): manifest})
+
+    def export_excel(self, path_dir: str) -> str:
+        """
+        Запись книги эксель эксперимента <path_dir>/<filename>/<filename>.xlsx с листами температуры, силы
+        и объединенной таблицы за один проход (см. write_workbook).
+        Можно вызвать для эксперимента из хранилища (Couple.from_store), чтобы создать книгу после импорта без excel.
+        :return: str - путь к книге.
+        """
+        filename = self.strength.filename
+        path = f'{path_dir}/{filename}/{filename}.xlsx'
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_workbook(path, {'Data_temperature': self.temperature.data_frame,
+                              'Data_strength': self.strength.data_frame,
+                              'Couple_data': self.couple_data})
+        return path
+
+    def manifest(self) -> dict:
         """
-        Сохранение информации в текстовый файл, excel файл
+        Поля манифеста эксперимента (см. manifest.MANIFEST_FIELDS).
         """
-        self.strength.save_file(path_dir)
-        self.temperature.save_file(path_dir, self.strength)
+        return typed({**self.strength.manifest(),
+                      **self.temperature.manifest(),
+                      'source_path': self.source_path,
+                      'source_hash': self.source_hash,
+                      'plot_labels': self.plot_labels})
 
-        with pd.ExcelWriter(f'{path_dir}/{self.temperature.filename}/{self.temperature.filename}.xlsx') as writer:
-            self.temperature.data_frame.to_excel(writer, sheet_name='Data_temperature')
-            self.strength.data_frame.to_excel(writer, sheet_name='Data_strength')
-            self.couple_data.to_excel(writer, sheet_name='Couple_data')
+    def catalog_row(self) -> dict:
+        """
+        Метаданные эксперимента для каталога ExperimentStore.
+        :return: dict - значения полей каталога.
+        """
+        strength = self.strength
+        temperature = self.temperature
+        return {'tool': strength.tool,
+                'material': strength.material,
+                'coating': strength.coating,
+                'stage': strength.stage,
+                'feed': strength.feed,
+                'spindle_speed': strength.spindle_speed,
+                'start_day': strength.start_day,
+                'last_day': strength.last_day,
+                'passes': strength.passes,
+                'processing_time': strength.processing_time,
+                'unique_id': strength.unique_id,
+                'strength_mean': strength.strength_mean,
+                'w0': strength.coefficient_mnk[0],
+                'w1': strength.coefficient_mnk[1],
+                'equation': strength.equation_mnk,
+                'baseline_estimator': strength.estimator,
+                'temperature_unique_id': temperature.unique_id,
+                'temperature_passes': temperature.passes,
+                'temperature_mean': temperature.temperature_mean,
+                'w0_t': temperature.coefficient_mnk[0],
+                'w1_t': temperature.coefficient_mnk[1],
+                'equation_temperature': temperature.equation_mnk,
+                'source_path': self.source_path,
+                'source_hash': self.source_hash,
+                'plot_labels': json.dumps(self.plot_labels, ensure_ascii=False) if self.plot_labels else None}
+
+    def series(self) -> dict[str, pd.DataFrame]:
+        """
+        Временные ряды эксперимента для ExperimentStore. Объединенная таблица не сохраняется,
+        так как она заново строится из рядов силы и температуры.
+        """
+        return {'strength': self.strength.data_frame, 'temperature': self.temperature.data_frame}
 
-        data_base = shelve.open(f'{path_dir}/data_base/shelve_db')
-        data_base[self.strength.filename] = self
-        data_base.close()
+    @classmethod
+    def from_dir(cls, path_dir: str, lazy: bool = False):
+        """
+        Создание объекта Couple из папки эксперимента.
+        :param lazy: bool - если True, читаются только метаданные, таблицы загружаются при первом обращении.
+        """
+        return cls.from_metadata(path_dir, read_experiment_metadata(path_dir), lazy)
 
     @classmethod
-    def from_dir(cls, path_dir: str):
-        return cls(Strength.from_dir(path_dir), Temperature.from_dir(path_dir))
+    def from_metadata(cls, path_dir: str, metadata: dict, lazy: bool = False):
+        """
+        Создание объекта Couple по метаданным папки эксперимента (манифест или запись сводного каталога).
+        """
+        couple = cls(Strength.from_metadata(path_dir, metadata, lazy),
+                     Temperature.from_metadata(path_dir, metadata, lazy), lazy)
+        couple.source_path = metadata.get('source_path')
+        couple.source_hash = metadata.get('source_hash')
+        couple.plot_labels = metadata.get('plot_labels')
+        return couple
+
+    @classmethod
+    def from_main_path(cls, main_path: str, lazy: bool = True) -> list['Couple']:
+        """
+        Создание объектов Couple для всех папок экспериментов в основной папке.
+        Метаданные всех экспериментов читаются одним чтением сводного каталога <main_path>/experiments.json,
+        если каталога нет - он строится по манифестам папок (rebuild_catalog).
+        :param main_path: str - основная папка с экспериментами.
+        :param lazy: bool - ленивый режим, см. from_dir.
+        :return: list[Couple]
+        """
+        catalog = read_catalog(main_path)
+        if catalog is None:
+            catalog = rebuild_catalog(main_path)
+        return [cls.from_metadata(os.path.join(main_path, key), metadata, lazy)
+                for key, metadata in sorted(catalog.items())]
+
+    @classmethod
+    def from_store(cls, store: ExperimentStore, key: str, lazy: bool = False):
+        """
+        Создание объекта Couple из хранилища экспериментов.
+        :param lazy: bool - если True, временные ряды читаются из хранилища при первом обращении к ним.
+        """
+        record = store.record(key)
+        strength = Strength(path_strength="",
+                            material=record.material,
+                            coating=record.coating,
+                            tool=record.tool,
+                            feed=record.feed,
+                            spindle_speed=record.spindle_speed,
+                            stage=record.stage,
+                            from_files=True,
+                            estimator=record.baseline_estimator)
+        strength._data_frame_loader = partial(store.load_frame, key, 'strength')
+        strength.start_day = record.start_day
+        strength.last_day = record.last_day
+        strength.unique_id = record.unique_id
+        strength.passes = record.passes
+        strength.strength_mean = record.strength_mean
+        strength.coefficient_mnk = record.w0, record.w1
+        strength.equation_mnk = record.equation
+        strength.processing_time = record.processing_time
+        strength.filename = key
+
+        temperature = Temperature(path_temperature="",
+                                  material=record.material,
+                                  coating=record.coating,
+                                  tool=record.tool,
+                                  feed=record.feed,
+                                  spindle_speed=record.spindle_speed,
+                                  stage=record.stage,
+                                  from_files=True)
+        temperature._data_frame_loader = partial(store.load_frame, key, 'temperature')
+        temperature.unique_id = record.temperature_unique_id
+        temperature.passes = record.temperature_passes
+        temperature.temperature_mean = record.temperature_mean
+        temperature.coefficient_mnk = record.w0_t, record.w1_t
+        temperature.equation_mnk = record.equation_temperature
+        temperature.processing_time = record.processing_time
+        temperature.filename = key
+        if not lazy:
+            strength.data_frame = strength._data_frame_loader()
+            temperature.data_frame = temperature._data_frame_loader()
+        couple = cls(strength, temperature, lazy)
+        couple.source_path = record.source_path
+        couple.source_hash = record.source_hash
+        if record.plot_labels:
+            couple.plot_labels = json.loads(record.plot_labels)
+            if 'plot' in couple.__dict__:
+                couple.plot.apply_labels(couple.plot_labels)
+        return couple
 
     def __str__(self):
         return f"{self.strength.filename}"
@@ -352,34 +643,136 @@ class Plot:
     """
     Класс для отображения графиков.
     Используется классом Couple.
+    Линии строятся по прореженным рядам (DecimationPyramid) на области графика PlotSurface, которую можно
+    использовать повторно для разных экспериментов. Пирамиды хранятся в PYRAMIDS по unique_id ряда.
     """
+    PYRAMIDS = PyramidCache()
+    # Подписи графика, которые можно изменить через Couple.plot_labels
+    LABELS = ('title', 'name_x', 'name_y_1', 'name_y_2')
 
     def __init__(self, couple: Couple = None, strength: Strength = None):
+        # Графики строятся по рядам силы и температуры напрямую, без объединенной таблицы с пропусками.
+        # Ряды читаются только при построении пирамиды, если ее еще нет в кэше
         if couple:
-            self.data_frame = couple.couple_data
+            strength = couple.strength
+            self.temperature = couple.temperature
         else:
-            self.data_frame = strength.data_frame
+            self.temperature = None
+        self.strength = strength
 
-        self.title = f'{couple.strength.material}, {couple.strength.coating}'
+        self.title = f'{strength.material}, {strength.coating}'
         self.name_x = 't, сек'
         self.name_y_1 = 'Силы, Н'
         self.name_y_2 = 'T, \u2103'
+        if couple and couple.plot_labels:
+            self.apply_labels(couple.plot_labels)
+
+    def apply_labels(self, labels: dict[str, str]) -> None:
+        """
+        Замена подписей графика, например {'title': ..., 'name_y_1': ...}.
+        """
+        for name, value in labels.items():
+            setattr(self, name, value)
+
+    @staticmethod
+    def pyramid(data, column: str) -> DecimationPyramid:
+        """
+        Пирамида прореживания столбца column ряда data (Strength или Temperature) из кэша PYRAMIDS.
+        """
+        return Plot.PYRAMIDS.get((data.unique_id, column),
+                                 lambda: DecimationPyramid(data.data_frame['Time'].to_numpy(),
+                                                           data.data_frame[column].to_numpy()))
 
     def show_plots(self):
-        data_s = data_with_out_nan(self.data_frame[['Time', 'Fy']])
+        """
+        Построение графика на новой фигуре pyplot.
+        :return: tuple(fig, ax1, ax2) - фигура, оси силы и температуры.
+        """
+        # matplotlib импортируется только при построении графиков, обработка и импорт экспериментов без него
+        import matplotlib.pyplot as plt
+        from data_class_communication.plot_surface import PlotSurface
 
-        fig, ax1 = plt.subplots()
+        # Ссылка на область графика сохраняется: matplotlib хранит обработчики событий осей по слабым ссылкам
+        self.surface = PlotSurface(plt.figure(), self.name_x, self.name_y_1, self.name_y_2)
+        self.draw(self.surface)
+        return self.surface.figure, self.surface.ax1, self.surface.ax2
 
-        fig.suptitle(self.title)
-        ax1.set_xlabel(self.name_x)
-        ax1.set_ylabel(self.name_y_1, color='tab:blue')
-        ax1.plot(data_s['Time'], data_s['Fy'], '-', color='tab:blue')
-        ax1.tick_params(axis='y', labelcolor='tab:blue')
+    def draw(self, surface: 'PlotSurface') -> bool:
+        """
+        Показ эксперимента на существующей области графика, см. PlotSurface.show.
+        """
+        temperature = self.pyramid(self.temperature, 'Temperature') if self.temperature is not None else None
+        surface.set_labels(self.name_x, self.name_y_1, self.name_y_2)
+        return surface.show(self.title, self.pyramid(self.strength, 'Fy'), temperature)
+
+
+class ComparisonPlot:
+    """
+    Сравнение нескольких экспериментов на одном графике: ряды силы и температуры переносятся
+    на общую сетку времени (AlignedGrid) и выводятся вместе с прямыми регрессии из coefficient_mnk.
+    Ряды каждого эксперимента переносятся на сетку один раз, добавление и удаление экспериментов
+    не пересчитывает остальные.
+    """
 
-        ax2 = ax1.twinx()
-        ax2.set_ylabel(self.name_y_2, color='tab:red')
-        ax2.plot(self.data_frame['Time'], self.data_frame['Temperature'], '-', color='tab:red')
-        ax2.tick_params(axis='y', labelcolor='tab:red')
+    def __init__(self, step: float = 1.0):
+        """
+        :param step: float - шаг общей сетки времени в секундах.
+        """
+        self.grid = AlignedGrid(step)
+        self.couples: dict[str, Couple] = {}
+        self.name_x = 't, сек'
+        self.name_y_1 = 'Силы, Н'
+        self.name_y_2 = 'T, \u2103'
 
+    def add(self, couple: Couple, key: str = None) -> None:
+        """
+        Добавление эксперимента, ряды переносятся на сетку только при первом добавлении ключа.
+        :param couple: Couple - эксперимент.
+        :param key: str - ключ эксперимента (например, ключ каталога), по умолчанию str(couple).
+        """
+        key = str(couple) if key is None else key
+        if key in self.couples:
+            return
+        self.couples[key] = couple
+        strength = couple.strength.data_frame
+        temperature = couple.temperature.data_frame
+        self.grid.add(key, 'Fy', strength['Time'].to_numpy(), strength['Fy'].to_numpy())
+        self.grid.add(key, 'Temperature', temperature['Time'].to_numpy(), temperature['Temperature'].to_numpy())
+
+    def remove(self, key: str) -> None:
+        self.couples.pop(key, None)
+        self.grid.remove(key)
+
+    @staticmethod
+    def label(couple: Couple) -> str:
+        return f'{couple.strength.material}, {couple.strength.coating}, {couple.strength.stage}'
+
+    def show_plots(self, figure: 'Figure' = None):
+        """
+        Построение графиков сравнения: сила сверху, температура снизу, для каждого эксперимента
+        ряд сплошной линией и прямая регрессии пунктиром того же цвета.
+        :param figure: Figure - фигура для построения, по умолчанию создается новая фигура pyplot.
+        :return: tuple(fig, ax1, ax2)
+        """
+        if figure is None:
+            import matplotlib.pyplot as plt
+            figure = plt.figure()
+        fig = figure
+        fig.clear()
+        ax1, ax2 = fig.subplots(2, 1, sharex=True)
+        keys = list(self.couples)
+        for ax, column, name_y in ((ax1, 'Fy', self.name_y_1), (ax2, 'Temperature', self.name_y_2)):
+            grid_time, matrix = self.grid.matrix(column, keys)
+            for number, key in enumerate(keys):
+                couple = self.couples[key]
+                data = couple.strength if column == 'Fy' else couple.temperature
+                color = f'C{number % 10}'
+                ax.plot(grid_time, matrix[number], '-', color=color, linewidth=0.8, label=self.label(couple))
+                w0, w1 = data.coefficient_mnk
+                ax.plot([0, data.processing_time], [w0, w0 + w1 * data.processing_time], '--', color=color)
+            ax.set_ylabel(name_y)
+        ax2.set_xlabel(self.name_x)
+        if keys:
+            ax1.legend(fontsize='small')
         fig.tight_layout()
         return fig, ax1, ax2
@@ -0,0 +1,62 @@
+import os
+import uuid
+import pandas as pd
+
+try:
+    # xlsxwriter быстрее openpyxl, но не входит в зависимости проекта
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+# Наибольшее количество строк листа Excel
+EXCEL_MAX_ROWS = 1_048_576
+# Строк таблицы в одном блоке при потоковой записи
+CHUNK_ROWS = 50_000
+
+
+def _rows(data_frame: pd.DataFrame):
+    """
+    Строки листа в формате DataFrame.to_excel: заголовок с пустой ячейкой над индексом, затем индекс и значения.
+    Пропуски (NaN) записываются пустыми ячейками. Таблица переводится в списки блоками по CHUNK_ROWS строк.
+    """
+    yield [None] + [str(column) for column in data_frame.columns]
+    for start in range(0, len(data_frame), CHUNK_ROWS):
+        chunk = data_frame.iloc[start:start + CHUNK_ROWS]
+        values = chunk.to_numpy(dtype=object, copy=True)
+        values[chunk.isna().to_numpy()] = None
+        for index, row in zip(chunk.index.tolist(), values.tolist()):
+            yield [index] + row
+
+
+def write_workbook(path: str, sheets: dict[str, pd.DataFrame]) -> None:
+    """
+    Запись книги Excel за один проход в потоковом режиме: строки листов пишутся сразу в файл
+    без построения дерева ячеек в памяти. Используется xlsxwriter (constant_memory), если он установлен,
+    иначе openpyxl (write_only). Книга сначала записывается во временный файл, который затем заменяет path.
+    :param path: str - путь к файлу .xlsx.
+    :param sheets: dict[str, pd.DataFrame] - листы книги в порядке записи: имя листа -> таблица.
+    """
+    for name, data_frame in sheets.items():
+        if len(data_frame) + 1 > EXCEL_MAX_ROWS:
+            raise ValueError(f'Лист {name}: {len(data_frame)} строк больше допустимого в Excel ({EXCEL_MAX_ROWS - 1})')
+    tmp_path = f'{path}.{uuid.uuid4()}.tmp'
+    try:
+        if xlsxwriter is not None:
+            with xlsxwriter.Workbook(tmp_path, {'constant_memory': True}) as workbook:
+                for name, data_frame in sheets.items():
+                    sheet = workbook.add_worksheet(name)
+                    for number, row in enumerate(_rows(data_frame)):
+                        sheet.write_row(number, 0, row)
+        else:
+            # openpyxl импортируется только при записи книги, чтобы не замедлять запуск без выгрузки в эксель
+            from openpyxl import Workbook
+            workbook = Workbook(write_only=True)
+            for name, data_frame in sheets.items():
+                sheet = workbook.create_sheet(name)
+                for row in _rows(data_frame):
+                    sheet.append(row)
+            workbook.save(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
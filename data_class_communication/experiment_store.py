@@ -0,0 +1,359 @@
+import dbm
+import json
+import os
+import shelve
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Iterator, Optional
+import numpy as np
+import pandas as pd
+from data_class_communication.series_file import SERIES_SUFFIX, write_series, open_series
+
+CATALOG_FIELDS = {
+    'key': 'TEXT PRIMARY KEY',
+    'tool': 'TEXT',
+    'material': 'TEXT',
+    'coating': 'TEXT',
+    'stage': 'TEXT',
+    'feed': 'REAL',
+    'spindle_speed': 'REAL',
+    'start_day': 'TEXT',
+    'last_day': 'TEXT',
+    'passes': 'INTEGER',
+    'processing_time': 'REAL',
+    'unique_id': 'TEXT',
+    'strength_mean': 'REAL',
+    'w0': 'REAL',
+    'w1': 'REAL',
+    'equation': 'TEXT',
+    'temperature_unique_id': 'TEXT',
+    'temperature_passes': 'INTEGER',
+    'temperature_mean': 'REAL',
+    'w0_t': 'REAL',
+    'w1_t': 'REAL',
+    'equation_temperature': 'TEXT',
+    'source_path': 'TEXT',
+    'source_hash': 'TEXT',
+    'plot_labels': 'TEXT',
+    'series_dir': 'TEXT',
+    'baseline_estimator': 'TEXT',
+}
+INDEXED_FIELDS = ('material', 'coating', 'stage', 'source_path')
+# Папки рядов без записи каталога моложе этого возраста (в секундах) cleanup не удаляет:
+# их может записывать еще не зафиксированная транзакция другого процесса, например cli.py import
+CLEANUP_AGE = 24 * 60 * 60
+# Отметка о завершенном переносе базы shelve (таблица store_meta)
+SHELVE_MIGRATED = 'shelve_migrated'
+
+
+@contextmanager
+def connect_sqlite(path: str, timeout: float = 30) -> Iterator[sqlite3.Connection]:
+    """
+    Соединение с базой sqlite: изменения фиксируются при успешном выходе из блока, иначе откатываются.
+    :param timeout: float - время ожидания блокировки базы другим соединением в секундах.
+    """
+    conn = sqlite3.connect(path, timeout=timeout)
+    conn.row_factory = sqlite3.Row
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+class ExperimentRecord:
+    """
+    Строка каталога: метаданные эксперимента без временных рядов.
+    Поля совпадают с ключами CATALOG_FIELDS, str(record) возвращает ключ эксперимента.
+    """
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+    def __str__(self):
+        return f"{self.key}"
+
+
+class StoreTransaction:
+    """
+    Открытая транзакция ExperimentStore.batch: соединение с каталогом, папки рядов, записанные в транзакции
+    (удаляются при откате), и папки рядов замененных и удаленных экспериментов (удаляются после фиксации).
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.written: list[str] = []
+        self.obsolete: list[str] = []
+
+
+class ExperimentStore:
+    """
+    Хранилище экспериментов.
+    Метаданные лежат в небольшом каталоге sqlite (catalog.sqlite3) с индексами по материалу, покрытию и этапу,
+    временные ряды - в папке series/<series_dir>/ по одному файлу ряда <таблица>.series на таблицу (см. series_file).
+    Временные ряды открываются только по запросу load_frame (большие ряды отображаются на файл, см. open_series),
+    поэтому получение списка экспериментов не требует загрузки данных.
+    Ряды каждой версии эксперимента пишутся в новую папку, на которую указывает поле series_dir каталога,
+    поэтому изменения применяются атомарно фиксацией транзакции каталога (см. batch): до фиксации
+    каталог указывает на прежние ряды, а прерванная запись оставляет только папки без записей каталога.
+    Транзакция batch относится к потоку, который ее открыл: один объект хранилища можно использовать
+    из нескольких потоков (например, окно приложения и поток выгрузки ExportQueue).
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: str - путь к папке базы данных (обычно <main_path>/data_base).
+        """
+        self.path = path
+        self.catalog_path = os.path.join(path, 'catalog.sqlite3')
+        self.series_path = os.path.join(path, 'series')
+        self.created = not os.path.exists(self.catalog_path)
+        self._local = threading.local()
+        os.makedirs(self.series_path, exist_ok=True)
+        with self._connect() as conn:
+            fields = ', '.join(f'{name} {kind}' for name, kind in CATALOG_FIELDS.items())
+            conn.execute(f'CREATE TABLE IF NOT EXISTS experiments ({fields})')
+            # Каталоги, созданные предыдущими версиями, дополняются новыми полями
+            existing = {row['name'] for row in conn.execute('PRAGMA table_info(experiments)')}
+            for name, kind in CATALOG_FIELDS.items():
+                if name not in existing:
+                    conn.execute(f'ALTER TABLE experiments ADD COLUMN {name} {kind}')
+            for name in INDEXED_FIELDS:
+                conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{name} ON experiments ({name})')
+            conn.execute('CREATE TABLE IF NOT EXISTS store_meta (name TEXT PRIMARY KEY, value TEXT)')
+
+    @property
+    def transaction(self) -> Optional[StoreTransaction]:
+        """
+        Открытая транзакция batch текущего потока.
+        """
+        return getattr(self._local, 'transaction', None)
+
+    @transaction.setter
+    def transaction(self, transaction: Optional[StoreTransaction]) -> None:
+        self._local.transaction = transaction
+
+    def _connect(self) -> ContextManager[sqlite3.Connection]:
+        # Внутри batch чтение идет через соединение транзакции и видит еще не зафиксированные изменения
+        if self.transaction is not None:
+            return nullcontext(self.transaction.conn)
+        return connect_sqlite(self.catalog_path)
+
+    @contextmanager
+    def batch(self) -> Iterator['ExperimentStore']:
+        """
+        Транзакция: все add, update и remove внутри блока фиксируются в каталоге одной транзакцией
+        при успешном выходе и полностью откатываются при исключении. Вложенные batch входят во внешнюю транзакцию.
+
+            with store.batch():
+                for couple in couples:
+                    store.add_couple(couple)
+        """
+        if self.transaction is not None:
+            yield self
+            return
+        try:
+            with connect_sqlite(self.catalog_path) as conn:
+                self.transaction = StoreTransaction(conn)
+                yield self
+        except BaseException:
+            for path in self.transaction.written:
+                shutil.rmtree(path, ignore_errors=True)
+            raise
+        else:
+            for path in self.transaction.obsolete:
+                shutil.rmtree(path, ignore_errors=True)
+        finally:
+            self.transaction = None
+
+    def _series_dir(self, key: str, table: str = '') -> str:
+        with self._connect() as conn:
+            row = conn.execute('SELECT series_dir FROM experiments WHERE key = ?', (key,)).fetchone()
+        # Хранилища прежних версий держат ряды в папке series/<ключ>/
+        return os.path.join(self.series_path, row['series_dir'] if row and row['series_dir'] else key, table)
+
+    def add(self, key: str, metadata: dict, frames: dict[str, pd.DataFrame]) -> None:
+        """
+        Добавление или замена эксперимента.
+        Временные ряды записываются в новую папку, прежние ряды удаляются только после фиксации каталога,
+        поэтому прерванная запись не портит уже сохраненные данные.
+        :param key: str - ключ эксперимента (имя папки с файлами эксперимента).
+        :param metadata: dict - значения полей каталога.
+        :param frames: dict[str, pd.DataFrame] - таблицы с временными рядами.
+        """
+        with self.batch():
+            series_dir = f'{key}.{uuid.uuid4().hex[:8]}'
+            tmp_dir = os.path.join(self.series_path, f'.tmp-{uuid.uuid4()}')
+            self.transaction.written.append(tmp_dir)
+            for table, data_frame in frames.items():
+                write_frame(os.path.join(tmp_dir, table), data_frame)
+            os.replace(tmp_dir, os.path.join(self.series_path, series_dir))
+            self.transaction.written.append(os.path.join(self.series_path, series_dir))
+            if key in self:
+                self.transaction.obsolete.append(self._series_dir(key))
+
+            row = {name: metadata.get(name) for name in CATALOG_FIELDS}
+            row['key'] = key
+            row['series_dir'] = series_dir
+            self.transaction.conn.execute(f'INSERT OR REPLACE INTO experiments ({", ".join(row)}) '
+                                          f'VALUES ({", ".join("?" * len(row))})', tuple(row.values()))
+
+    def update(self, key: str, **fields) -> None:
+        """
+        Изменение полей каталога эксперимента без перезаписи временных рядов.
+        Для изменения многих экспериментов одной транзакцией вызовы объединяются в batch.
+        :param key: str - ключ эксперимента.
+        :param fields: новые значения полей каталога, например material='ХН50'.
+        """
+        unknown = (set(fields) - set(CATALOG_FIELDS)) | (set(fields) & {'key', 'series_dir'})
+        if unknown:
+            raise KeyError(f'Нельзя изменить поля каталога: {", ".join(sorted(unknown))}')
+        if not fields:
+            return
+        with self.batch():
+            cursor = self.transaction.conn.execute(
+                f'UPDATE experiments SET {", ".join(f"{name} = ?" for name in fields)} WHERE key = ?',
+                (*fields.values(), key))
+            if cursor.rowcount == 0:
+                raise KeyError(key)
+
+    def add_couple(self, couple) -> None:
+        """
+        Добавление экземпляра Couple: метаданные берутся из couple.catalog_row(), ряды - из couple.series().
+        """
+        self.add(str(couple), couple.catalog_row(), couple.series())
+
+    def records(self, **filters) -> list[ExperimentRecord]:
+        """
+        Список экспериментов из каталога без загрузки временных рядов.
+        :param filters: равенство полей каталога, например material='ХН50'. Пустые значения игнорируются.
+        :return: list[ExperimentRecord]
+        """
+        filters = {name: value for name, value in filters.items() if value}
+        unknown = set(filters) - set(CATALOG_FIELDS)
+        if unknown:
+            raise KeyError(f'Нет полей каталога: {", ".join(sorted(unknown))}')
+        where = ' AND '.join(f'{name} = ?' for name in filters)
+        query = f'SELECT * FROM experiments{" WHERE " + where if where else ""} ORDER BY key'
+        with self._connect() as conn:
+            rows = conn.execute(query, tuple(filters.values())).fetchall()
+        return [ExperimentRecord(**dict(row)) for row in rows]
+
+    def record(self, key: str) -> ExperimentRecord:
+        with self._connect() as conn:
+            row = conn.execute('SELECT * FROM experiments WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return ExperimentRecord(**dict(row))
+
+    def load_frame(self, key: str, table: str) -> pd.DataFrame:
+        """
+        Чтение одной таблицы временных рядов эксперимента.
+        :param key: str - ключ эксперимента.
+        :param table: str - имя таблицы, например 'strength' или 'temperature'.
+        :return: pd.DataFrame
+        """
+        return read_frame(self._series_dir(key, table))
+
+    def remove(self, key: str) -> None:
+        with self.batch():
+            self.transaction.obsolete.append(self._series_dir(key))
+            self.transaction.conn.execute('DELETE FROM experiments WHERE key = ?', (key,))
+
+    def cleanup(self, min_age: float = CLEANUP_AGE) -> int:
+        """
+        Удаление папок рядов, на которые не указывает ни одна запись каталога: остатков прерванной записи.
+        Вызывается при запуске приложения. Папки, измененные позже чем min_age секунд назад, не удаляются,
+        так как их может записывать транзакция другого процесса, которая еще не зафиксирована.
+        :param min_age: float - минимальный возраст удаляемой папки в секундах.
+        :return: int - количество удаленных папок.
+        """
+        with self._connect() as conn:
+            used = {row['series_dir'] or row['key'] for row in conn.execute('SELECT key, series_dir FROM experiments')}
+        now = time.time()
+        unused = [name for name in os.listdir(self.series_path)
+                  if name not in used and now - os.path.getmtime(os.path.join(self.series_path, name)) >= min_age]
+        for name in unused:
+            shutil.rmtree(os.path.join(self.series_path, name), ignore_errors=True)
+        return len(unused)
+
+    def get_meta(self, name: str) -> Optional[str]:
+        """
+        Служебное значение хранилища, например отметка о выполненном переносе данных.
+        :return: str | None - None, если значение не записано.
+        """
+        with self._connect() as conn:
+            row = conn.execute('SELECT value FROM store_meta WHERE name = ?', (name,)).fetchone()
+        return row['value'] if row else None
+
+    def set_meta(self, name: str, value: str) -> None:
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO store_meta (name, value) VALUES (?, ?)', (name, value))
+
+    def keys(self) -> list[str]:
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute('SELECT key FROM experiments ORDER BY key')]
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM experiments').fetchone()[0]
+
+    def __contains__(self, key: str):
+        with self._connect() as conn:
+            return conn.execute('SELECT 1 FROM experiments WHERE key = ?', (key,)).fetchone() is not None
+
+
+def write_frame(path: str, data_frame: pd.DataFrame) -> None:
+    """
+    Запись DataFrame в файл ряда <path>.series.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_series(f'{path}{SERIES_SUFFIX}', data_frame)
+
+
+def read_frame(path: str) -> pd.DataFrame:
+    """
+    Чтение DataFrame, записанного write_frame.
+    Хранилища прежних версий содержат вместо файла ряда папку <path>/ с файлами <столбец>.npy и columns.json.
+    """
+    if os.path.exists(f'{path}{SERIES_SUFFIX}'):
+        return open_series(f'{path}{SERIES_SUFFIX}')
+    with open(os.path.join(path, 'columns.json'), 'r', encoding='utf-8') as file:
+        columns = json.load(file)
+    return pd.DataFrame({name: np.load(os.path.join(path, f'{name}.npy')) for name in columns})
+
+
+def migrate_shelve(shelve_path: str, store: ExperimentStore) -> int:
+    """
+    Однократный перенос экспериментов из базы shelve с pickle-объектами Couple в ExperimentStore.
+    Перенос выполняется, пока в хранилище нет отметки SHELVE_MIGRATED: отметка пишется в той же транзакции,
+    поэтому перенос, прерванный ошибкой, повторяется при следующем запуске.
+    Эксперименты, которые уже есть в хранилище, не заменяются (хранилища, перенесенные до появления отметки).
+    :param shelve_path: str - путь к базе shelve без расширения (например <main_path>/data_base/shelve_db).
+    :param store: ExperimentStore - хранилище, в которое переносятся эксперименты.
+    :return: int - количество перенесенных экспериментов.
+    """
+    if not dbm.whichdb(shelve_path) or store.get_meta(SHELVE_MIGRATED):
+        return 0
+    count = 0
+    with shelve.open(shelve_path, flag='r') as db, store.batch():
+        existing = set(store.keys())
+        for key in db.keys():
+            if key in existing:
+                continue
+            couple = db[key]
+            store.add(key, couple.catalog_row(), couple.series())
+            count += 1
+        store.set_meta(SHELVE_MIGRATED, '1')
+    return count
+
+
+if __name__ == '__main__':
+    # python -m data_class_communication.experiment_store <main_path>
+    data_base = os.path.join(sys.argv[1], 'data_base')
+    print(migrate_shelve(os.path.join(data_base, 'shelve_db'), ExperimentStore(data_base)))
@@ -0,0 +1,241 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Iterable, Optional
+from data_class_communication.class_for_communication import Couple
+from data_class_communication.experiment_store import ExperimentStore, connect_sqlite
+
+
+def export_files(couple: Couple, main_path: str) -> None:
+    """
+    Файлы папки эксперимента: манифест, таблицы csv и файлы рядов .series (см. Couple.save_file).
+    """
+    couple.save_file(main_path, data_base=False, filename=str(couple), excel=False)
+
+
+def export_xlsx(couple: Couple, main_path: str) -> None:
+    couple.export_excel(main_path)
+
+
+# Форматы выгрузки: имя -> функция exporter(couple, main_path)
+EXPORTERS: dict[str, Callable[[Couple, str], None]] = {
+    'files': export_files,
+    'xlsx': export_xlsx,
+}
+DEFAULT_FORMATS = ('files', 'xlsx')
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+# Выполняемое задание раз в HEARTBEAT секунд отмечается процессом, который его забрал.
+# Задание без отметки дольше STALE_AFTER секунд считается брошенным (процесс завершился) и выполняется заново
+HEARTBEAT = 10.0
+STALE_AFTER = 60.0
+
+
+def register_exporter(name: str, exporter: Callable[[Couple, str], None]) -> None:
+    """
+    Регистрация нового формата выгрузки. Выгрузку всех экспериментов в новом формате
+    можно запустить через ExportQueue.enqueue_all([name]) без повторной обработки исходных файлов.
+    :param name: str - имя формата.
+    :param exporter: функция exporter(couple, main_path), записывающая файлы эксперимента.
+    """
+    EXPORTERS[name] = exporter
+
+
+class ExportQueue:
+    """
+    Очередь выгрузки файлов экспериментов (манифест, csv, xlsx) в фоновом потоке.
+    Эксперимент сначала фиксируется в хранилище, а файлы записываются позже по данным хранилища,
+    поэтому обработка следующего эксперимента не ждет записи файлов и повторная выгрузка ничего не пересчитывает.
+    Задания (ключ эксперимента, формат) хранятся в базе sqlite <store.path>/exports.sqlite3 со статусом:
+    pending - ожидает, running - выполняется, done - выполнено, failed - не выполнено после max_attempts попыток.
+    Неудачное задание повторяется через retry_delay * 2**(попытка - 1) секунд.
+    Выполняемое задание хранит владельца (компьютер, процесс и очередь) и время последней отметки владельца,
+    поэтому очередь в другом процессе не забирает чужие выполняемые задания. Задания, прерванные закрытием
+    или падением процесса, выполняются заново, когда их отметка старше stale_after.
+    """
+
+    def __init__(self,
+                 store: ExperimentStore,
+                 main_path: str,
+                 max_attempts: int = 3,
+                 retry_delay: float = 5.0,
+                 stale_after: float = STALE_AFTER):
+        """
+        :param store: ExperimentStore - хранилище, из которого читаются эксперименты.
+        :param main_path: str - основная папка, в которой лежат папки экспериментов.
+        :param max_attempts: int - количество попыток выполнения задания.
+        :param retry_delay: float - задержка перед первым повтором в секундах.
+        :param stale_after: float - время без отметки владельца, после которого выполняемое задание
+        считается брошенным, в секундах.
+        """
+        self.store = store
+        self.main_path = main_path
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.stale_after = stale_after
+        self.heartbeat = min(HEARTBEAT, stale_after / 3)
+        self.owner = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self.path = os.path.join(store.path, 'exports.sqlite3')
+        self.wake = threading.Event()
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        with connect_sqlite(self.path) as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS exports (key TEXT, format TEXT, status TEXT, '
+                         'attempts INTEGER, error TEXT, next_try REAL, updated REAL, owner TEXT, '
+                         'PRIMARY KEY (key, format))')
+            # Базы прежних версий дополняются владельцем задания
+            if 'owner' not in {row['name'] for row in conn.execute('PRAGMA table_info(exports)')}:
+                conn.execute('ALTER TABLE exports ADD COLUMN owner TEXT')
+            self._release_stale(conn)
+
+    def enqueue(self, key: str, formats: Iterable[str] = DEFAULT_FORMATS) -> None:
+        """
+        Добавление заданий выгрузки эксперимента. Уже выполненные задания того же формата выполняются заново.
+        """
+        self.enqueue_many([key], formats)
+
+    def enqueue_many(self, keys: Iterable[str], formats: Iterable[str] = DEFAULT_FORMATS) -> int:
+        """
+        Добавление заданий для нескольких экспериментов одной транзакцией.
+        :return: int - количество заданий.
+        """
+        formats = list(formats)
+        unknown = set(formats) - set(EXPORTERS)
+        if unknown:
+            raise KeyError(f'Нет форматов выгрузки: {", ".join(sorted(unknown))}')
+        now = time.time()
+        rows = [(key, name, PENDING, 0, None, now, now, None) for key in keys for name in formats]
+        with connect_sqlite(self.path) as conn:
+            conn.executemany('INSERT OR REPLACE INTO exports VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        self.wake.set()
+        return len(rows)
+
+    def enqueue_all(self, formats: Iterable[str] = DEFAULT_FORMATS) -> int:
+        """
+        Повторная выгрузка всех экспериментов хранилища, например в новом формате.
+        """
+        return self.enqueue_many(self.store.keys(), formats)
+
+    def status(self, key: Optional[str] = None) -> list[dict]:
+        """
+        Задания выгрузки: словари с полями key, format, status, attempts, error.
+        :param key: str - ключ эксперимента, по умолчанию все задания.
+        """
+        query = 'SELECT key, format, status, attempts, error FROM exports'
+        with connect_sqlite(self.path) as conn:
+            rows = conn.execute(query + (' WHERE key = ?' if key else '') + ' ORDER BY key, format',
+                                (key,) if key else ()).fetchall()
+        return [dict(row) for row in rows]
+
+    def counts(self, timeout: float = 30) -> Optional[dict[str, int]]:
+        """
+        Количество заданий по статусам.
+        :param timeout: float - ожидание блокировки базы в секундах. Окно приложения читает счетчики
+        с коротким ожиданием, чтобы не зависать, пока другой процесс записывает задания.
+        :return: dict - статус -> количество, None - база занята дольше timeout.
+        """
+        try:
+            with connect_sqlite(self.path, timeout) as conn:
+                return {row[0]: row[1]
+                        for row in conn.execute('SELECT status, COUNT(*) FROM exports GROUP BY status')}
+        except sqlite3.OperationalError:
+            return None
+
+    def _release_stale(self, conn: sqlite3.Connection) -> None:
+        # Выполняемые задания без владельца остались от версий без отметок и тоже считаются брошенными
+        conn.execute('UPDATE exports SET status = ?, owner = NULL WHERE status = ? AND (owner IS NULL OR updated < ?)',
+                     (PENDING, RUNNING, time.time() - self.stale_after))
+
+    def _beat(self, key: str, name: str, done: threading.Event) -> None:
+        # Отметка владельца выполняемого задания, пока задание не завершено
+        while not done.wait(self.heartbeat):
+            try:
+                with connect_sqlite(self.path, self.heartbeat) as conn:
+                    conn.execute('UPDATE exports SET updated = ? WHERE key = ? AND format = ? AND owner = ?',
+                                 (time.time(), key, name, self.owner))
+            except sqlite3.OperationalError:
+                pass
+
+    def _claim(self) -> Optional[tuple[str, str, int]]:
+        # Очередь может разбирать несколько процессов (приложение и cli.py export): задание забирается
+        # условным UPDATE, и если другой процесс успел забрать его между SELECT и UPDATE, берется следующее
+        with connect_sqlite(self.path) as conn:
+            self._release_stale(conn)
+        while True:
+            with connect_sqlite(self.path) as conn:
+                row = conn.execute('SELECT key, format, attempts FROM exports WHERE status = ? AND next_try <= ? '
+                                   'ORDER BY next_try LIMIT 1', (PENDING, time.time())).fetchone()
+                if row is None:
+                    return None
+                claimed = conn.execute('UPDATE exports SET status = ?, updated = ?, owner = ? '
+                                       'WHERE key = ? AND format = ? AND status = ?',
+                                       (RUNNING, time.time(), self.owner, row['key'], row['format'],
+                                        PENDING)).rowcount
+            if claimed:
+                return row['key'], row['format'], row['attempts']
+
+    def run_next(self) -> bool:
+        """
+        Выполнение одного готового к запуску задания.
+        :return: bool - False, если готовых заданий нет.
+        """
+        job = self._claim()
+        if job is None:
+            return False
+        key, name, attempts = job
+        attempts += 1
+        done = threading.Event()
+        threading.Thread(target=self._beat, args=(key, name, done), name='export-heartbeat', daemon=True).start()
+        try:
+            EXPORTERS[name](Couple.from_store(self.store, key, lazy=True), self.main_path)
+        except Exception as error:
+            status = FAILED if attempts >= self.max_attempts else PENDING
+            next_try = time.time() + self.retry_delay * 2 ** (attempts - 1)
+            values = (status, attempts, f'{type(error).__name__}: {error}', next_try)
+        else:
+            values = (DONE, attempts, None, time.time())
+        finally:
+            done.set()
+        with connect_sqlite(self.path) as conn:
+            conn.execute('UPDATE exports SET status = ?, attempts = ?, error = ?, next_try = ?, updated = ?, '
+                         'owner = NULL WHERE key = ? AND format = ?', (*values, time.time(), key, name))
+        return True
+
+    def run_pending(self) -> None:
+        """
+        Выполнение всех готовых заданий в текущем потоке.
+        """
+        while not self.stopped.is_set() and self.run_next():
+            pass
+
+    def start(self) -> None:
+        """
+        Запуск фонового потока выгрузки.
+        """
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._loop, name='export-queue', daemon=True)
+        self.thread.start()
+
+    def _loop(self) -> None:
+        while not self.stopped.is_set():
+            self.run_pending()
+            # Новые задания будят поток сразу, отложенные повторы проверяются раз в секунду
+            self.wake.wait(1.0)
+            self.wake.clear()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Остановка фонового потока после текущего задания. Невыполненные задания остаются в базе.
+        """
+        self.stopped.set()
+        self.wake.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
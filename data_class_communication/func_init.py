@@ -1,11 +1,19 @@
 import pandas as pd
 import os
-from analytical_functions.analysis_functions import add_names_fields, determination_zero_strength, processing_time \
-    , adding_time_in_temperature
+from analytical_functions.analysis_functions import add_names_fields
+from analytical_functions.baseline import BASELINE_ESTIMATORS, DEFAULT_ESTIMATOR, subtract_baseline
+from data_class_communication.raw_formats import detect_format
+from data_class_communication.series_file import SERIES_SUFFIX, open_series
+from data_class_communication.manifest import is_experiment_dir
+from analytical_functions.streaming import StrengthStream, TemperatureStream, count_above, temperature_step
 import re
-from typing import Optional
+from functools import partial
+from typing import Callable, Iterable, Iterator, Optional
 import numpy as np
 
+# Количество строк исходного файла, читаемых за один раз при потоковой обработке
+CHUNK_SIZE = 200_000
+
 
 def create_file_list(path: str) -> list[str]:
     """
@@ -22,24 +30,89 @@ def create_file_list(path: str) -> list[str]:
         raise FileNotFoundError
 
 
-def create_data_frame_strength(path: str, min_strength: float | int) -> pd.DataFrame:
+def raw_strength_chunks(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Потоковое чтение файла с данными о силе частями по chunk_size строк без учета нуля сил.
+    Формат файла (шапка, кодировка, разделители) определяется по его началу, см. raw_formats.
+    :return: Iterator[pd.DataFrame] - части прохода со столбцами Time и Fy
+    """
+    path = path.replace('\\', '/')
+    for chunk in detect_format(path, 'strength').read_csv(path, chunksize=chunk_size):
+        yield add_names_fields(chunk)[['Time', 'Fy']]
+
+
+def zero_strength_chunks(chunks: Iterable[pd.DataFrame], min_strength: float | int,
+                         estimator: str = DEFAULT_ESTIMATOR) -> Iterator[pd.DataFrame]:
+    """
+    Учет нуля сил в последовательных частях одного прохода.
+    Ноль определяется по силам до первого превышения min_strength, поэтому в памяти
+    накапливается только начало прохода до начала обработки, остальные части отдаются сразу.
+    :param chunks: Iterable[pd.DataFrame] - части прохода со столбцами Time и Fy (см. raw_strength_chunks)
+    :param min_strength: float - минимальная сила
+    :param estimator: str - способ оценки нуля сил, см. baseline.BASELINE_ESTIMATORS
+    :return: Iterator[pd.DataFrame] - части прохода с учтенным нулем сил
+    """
+    if estimator not in BASELINE_ESTIMATORS:
+        raise KeyError(f'Нет способа оценки нуля: {estimator}')
+    estimate = BASELINE_ESTIMATORS[estimator]
+    idle: list[pd.DataFrame] = []
+    start = 0
+    for chunk in chunks:
+        if idle is None:
+            chunk['Fy'] = subtract_baseline(chunk['Fy'].to_numpy(), coefficients, start)
+            start += len(chunk)
+            yield chunk
+            continue
+        idle.append(chunk)
+        above = np.flatnonzero(chunk['Fy'].to_numpy() > min_strength)
+        if above.size == 0:
+            continue
+        idle_fy = np.concatenate([elem['Fy'].to_numpy() for elem in idle[:-1]] + [chunk['Fy'].to_numpy()[:above[0]]])
+        # Проход начинается с обработки: точек покоя нет, ноль не определен
+        coefficients = estimate(idle_fy) if idle_fy.size else (np.nan, np.nan)
+        for elem in idle:
+            elem['Fy'] = subtract_baseline(elem['Fy'].to_numpy(), coefficients, start)
+            start += len(elem)
+            yield elem
+        idle = None
+    if idle is not None:
+        raise IndexError(f'В одном из файлов нет сил > {min_strength}')
+
+
+def read_strength_chunks(path: str, min_strength: float | int, chunk_size: int = CHUNK_SIZE,
+                         estimator: str = DEFAULT_ESTIMATOR) -> Iterator[pd.DataFrame]:
+    """
+    Потоковое чтение файла с данными о силе частями по chunk_size строк с учетом нуля сил
+    (raw_strength_chunks и zero_strength_chunks).
+    :param path: str - путь к файлу с данными о силе
+    :param min_strength: float - минимальная сила
+    :param chunk_size: int - количество строк в одной части
+    :param estimator: str - способ оценки нуля сил, см. baseline.BASELINE_ESTIMATORS
+    :return: Iterator[pd.DataFrame] - части прохода со столбцами Time и Fy
+    """
+    return zero_strength_chunks(raw_strength_chunks(path, chunk_size), min_strength, estimator)
+
+
+def create_data_frame_strength(path: str, min_strength: float | int,
+                               estimator: str = DEFAULT_ESTIMATOR) -> pd.DataFrame:
     """
     Создает датафрейм из файла с данными о силе.
     :param path: str - путь к файлу с данными о силе
     :param min_strength: float - минимальная сила
+    :param estimator: str - способ оценки нуля сил, см. baseline.BASELINE_ESTIMATORS
     :return: pd.DataFrame - датафрейм с данными о силе
     """
+    return pd.concat(read_strength_chunks(path, min_strength, estimator=estimator), ignore_index=True)
 
-    try:
-        data_frame = pd.read_csv(path.replace('\\', '/'), sep=';', header=2, decimal=',', dtype='float')
-        data_frame = add_names_fields(data_frame)
-        data_frame = determination_zero_strength(data_frame, min_strength)
-        return data_frame.drop(['Fx', 'Fz'], axis=1)
-    except:
-        data_frame = pd.read_csv(path, sep=';', header=19, decimal=',', dtype='float', encoding="windows-1251")
-        data_frame = add_names_fields(data_frame)
-        data_frame = determination_zero_strength(data_frame, min_strength)
-        return data_frame.drop(['Fx', 'Fz'], axis=1)
+
+def read_temperature_chunks(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Потоковое чтение файла с данными о температуре частями по chunk_size строк.
+    :param path: str - путь к файлу с данными о температуре
+    :param chunk_size: int - количество строк в одной части
+    :return: Iterator[pd.DataFrame] - части прохода со столбцами Time и Voltage
+    """
+    yield from detect_format(path, 'temperature').read_csv(path, chunksize=chunk_size)
 
 
 def create_data_frame_temperature(path: str) -> pd.DataFrame:
@@ -48,55 +121,87 @@ def create_data_frame_temperature(path: str) -> pd.DataFrame:
     :param path: str - путь к файлу с данными о температуре
     :return: pd.DataFrame - датафрейм с данными о температуре
     """
-    data_frame = pd.read_csv(path,
-                             encoding='windows-1251',
-                             on_bad_lines='skip',
-                             sep='\t',
-                             header=11,
-                             names=['Time', 'Voltage'],
-                             decimal=',',
-                             dtype='float')
-
-    return data_frame
+    return pd.concat(read_temperature_chunks(path), ignore_index=True)
 
 
-def create_data_strength_from_list(list_data_frame: list[pd.DataFrame], min_strength: float | int) -> pd.DataFrame:
+def create_data_strength_from_list(list_data_frame: list[pd.DataFrame], min_strength: float | int,
+                                   statistics: Iterable[str] = ('mean',)) -> pd.DataFrame:
     """
     Создает объединенный датафрейм из списка датафреймов с данными о силе.
     В фуенкции проиисходит обработка датафрема.
     :param list_data_frame: list[pd.DataFrame] - список датафреймов с данными о силе
     :param min_strength: float - минимальная сила
+    :param statistics: Iterable[str] - статистики по секундам (mean, max, std, count), см. binning.SecondBins.frame
     :return: pd.DataFrame - датафрейм с данными о силе
     """
-
-    data_frame = pd.concat(list_data_frame, ignore_index=True)
-    data_frame = data_frame.loc[data_frame['Fy'] > min_strength]
-    time_field = data_frame['Time'].to_numpy()
-    data_frame['Time'] = processing_time(time_field)
-    data_frame['Time'] = data_frame['Time'].apply(np.ceil)
-    df = data_frame.groupby(by='Time').mean().dropna().reset_index()
-    df['Fy'] = df['Fy'].apply(lambda x: round(x, 2))
-    return df
+    stream = StrengthStream(min_strength)
+    for data_frame in list_data_frame:
+        stream.add_pass([data_frame])
+    return stream.frame(statistics)
 
 
 def create_data_frame_temperature_from_list(list_data_frame: list[pd.DataFrame],
                                             min_voltage: float | int,
-                                            processing_time_: Optional[float] = None) -> pd.DataFrame:
+                                            processing_time_: Optional[float] = None,
+                                            statistics: Iterable[str] = ('mean',)) -> pd.DataFrame:
     """
     Создает объединенный датафрейм из списка датафреймов с данными о температуре.
     :param list_data_frame: list[pd.DataFrame]  - список датафреймов с данными о температуре
     :param min_voltage: float  - минимальная напряжение
     :param processing_time_: Время обработки.
+    :param statistics: Iterable[str] - статистики по секундам (mean, max, std, count), см. binning.SecondBins.frame
     :return: pd.DataFrame  - датафрейм с данными о температуре
     """
-    data_frame = pd.concat(list_data_frame, ignore_index=True)
-    data_frame = data_frame.loc[data_frame['Voltage'] > min_voltage]
-    time_field = data_frame['Time'].to_numpy()
-    data_frame['Time'] = adding_time_in_temperature(time_field, processing_time_)
-    data_frame['Time'] = data_frame['Time'].apply(np.ceil)
-    df = data_frame.groupby(by='Time').mean().dropna().reset_index()
-    df['Voltage'] = df['Voltage'].apply(lambda x: round(x, 2))
-    return df
+    count = sum(count_above([data_frame], 'Voltage', min_voltage) for data_frame in list_data_frame)
+    stream = TemperatureStream(min_voltage, temperature_step(count, processing_time_))
+    for data_frame in list_data_frame:
+        stream.add_pass([data_frame])
+    return stream.frame(statistics)
+
+
+def processed_frame_loader(path_csv: str) -> Callable[[], pd.DataFrame]:
+    """
+    Функция чтения обработанной таблицы из папки эксперимента.
+    Если рядом с csv есть файл ряда (.series), таблица открывается из него без разбора текста,
+    иначе (папки, сохраненные прежними версиями) читается csv.
+    :param path_csv: str - путь к файлу csv с таблицей.
+    :return: функция без аргументов, возвращающая pd.DataFrame.
+    """
+    path_series = os.path.splitext(path_csv)[0] + SERIES_SUFFIX
+    if os.path.exists(path_series):
+        return partial(open_series, path_series)
+    return partial(pd.read_csv, path_csv, sep=';', decimal=',', index_col=0)
+
+
+def list_experiment_dirs(main_path: str) -> list[str]:
+    """
+    Список папок экспериментов в основной папке, т.е. папок в которых есть манифест <имя папки>_manifest.json
+    или файл <имя папки>_info.txt прежних версий.
+    :param main_path: str - основная папка с экспериментами.
+    :return: list[str] - отсортированный список путей к папкам экспериментов.
+    """
+    with os.scandir(main_path) as entries:
+        list_dir = [entry.path for entry in entries if entry.is_dir() and is_experiment_dir(entry.path)]
+    return sorted(list_dir)
+
+
+def create_unique_dir(path_dir: str, basename: str) -> str:
+    """
+    Создает папку <basename> в path_dir, а если она уже есть - <basename>_1, <basename>_2 и т.д.
+    Папка создается атомарно, поэтому параллельные процессы не получат одну и ту же папку.
+    :param path_dir: str - родительская папка.
+    :param basename: str - базовое имя папки.
+    :return: str - путь к созданной папке.
+    """
+    new_dir = os.path.join(path_dir, basename)
+    counter = 1
+    while True:
+        try:
+            os.makedirs(new_dir)
+            return new_dir
+        except FileExistsError:
+            new_dir = os.path.join(path_dir, f'{basename}_{counter}')
+            counter += 1
 
 
 def extract_basename(filename: str) -> str:
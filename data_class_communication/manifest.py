@@ -0,0 +1,222 @@
+import json
+import os
+import threading
+import uuid
+from typing import Optional
+
+# Версия схемы манифеста, увеличивается при несовместимых изменениях полей
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = '_manifest.json'
+INFO_SUFFIX = '_info.txt'
+# Сводный каталог всех экспериментов основной папки
+CATALOG_NAME = 'experiments.json'
+
+# Поля манифеста и их типы, имена совпадают с полями каталога ExperimentStore
+MANIFEST_FIELDS = {
+    'tool': str,
+    'material': str,
+    'coating': str,
+    'stage': str,
+    'feed': float,
+    'spindle_speed': float,
+    'start_day': str,
+    'last_day': str,
+    'passes': int,
+    'processing_time': float,
+    'unique_id': str,
+    'strength_mean': float,
+    'w0': float,
+    'w1': float,
+    'equation': str,
+    'temperature_unique_id': str,
+    'temperature_passes': int,
+    'temperature_mean': float,
+    'w0_t': float,
+    'w1_t': float,
+    'equation_temperature': str,
+    'source_path': str,
+    'source_hash': str,
+    'plot_labels': dict,
+    'baseline_estimator': str,
+}
+
+# Строки прежнего файла _info.txt -> поля манифеста
+INFO_FIELDS = {
+    'Material': 'material',
+    'Coating': 'coating',
+    'Tool': 'tool',
+    'Feed': 'feed',
+    'Spindle Speed': 'spindle_speed',
+    'Stage': 'stage',
+    'Strength mean': 'strength_mean',
+    'Equation': 'equation',
+    'w0': 'w0',
+    'w1': 'w1',
+    'Unique ID': 'unique_id',
+    'Passes': 'passes',
+    'Processing time': 'processing_time',
+    'Start': 'start_day',
+    'End': 'last_day',
+    'Temperature_mean': 'temperature_mean',
+    'Temperature mean': 'temperature_mean',
+    'w0_t': 'w0_t',
+    'w1_t': 'w1_t',
+    'Equation_temperature': 'equation_temperature',
+    'Unique_temperature ID': 'temperature_unique_id',
+}
+
+_catalog_lock = threading.Lock()
+
+
+def typed(fields: dict) -> dict:
+    """
+    Приведение значений к типам MANIFEST_FIELDS (например, numpy.float64 -> float), None сохраняется.
+    Поля, которых нет в схеме, отбрасываются.
+    """
+    return {name: kind(fields[name]) if fields[name] is not None else None
+            for name, kind in MANIFEST_FIELDS.items() if name in fields}
+
+
+def _write_json(path: str, data: dict) -> None:
+    tmp_path = f'{path}.{uuid.uuid4()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: str) -> dict:
+    with open(path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    if data.get('schema_version', 0) > MANIFEST_VERSION:
+        raise ValueError(f'{path}: версия схемы {data["schema_version"]} новее поддерживаемой {MANIFEST_VERSION}')
+    return data
+
+
+def manifest_path(path_dir: str) -> str:
+    return os.path.join(path_dir, f'{os.path.basename(path_dir)}{MANIFEST_SUFFIX}')
+
+
+def write_manifest(path_dir: str, fields: dict, update: bool = False) -> dict:
+    """
+    Запись манифеста эксперимента <папка>/<имя папки>_manifest.json (json, UTF-8).
+    Файл сначала записывается во временный файл, который затем заменяет манифест.
+    :param path_dir: str - папка эксперимента.
+    :param fields: dict - поля MANIFEST_FIELDS.
+    :param update: bool - дополнить существующий манифест, а не заменить его.
+    :return: dict - записанные поля.
+    """
+    path = manifest_path(path_dir)
+    manifest = read_manifest(path_dir) if update and os.path.exists(path) else {}
+    manifest.update(typed(fields))
+    _write_json(path, {'schema_version': MANIFEST_VERSION, **manifest})
+    return manifest
+
+
+def read_manifest(path_dir: str) -> dict:
+    """
+    Чтение манифеста эксперимента.
+    :return: dict - поля манифеста без schema_version.
+    """
+    data = _read_json(manifest_path(path_dir))
+    data.pop('schema_version', None)
+    return typed(data)
+
+
+def read_info_txt(path: str) -> dict:
+    """
+    Чтение файла _info.txt прежних версий (строки 'Ключ: значение').
+    Значение берется целиком после первого ':', поэтому время 'Start: 2024.03.20-14:42:00' не обрезается.
+    Файлы записывались в кодировке системы, поэтому при ошибке UTF-8 файл читается в cp1251.
+    :return: dict - поля манифеста.
+    """
+    with open(path, 'rb') as file:
+        raw = file.read()
+    try:
+        text = raw.decode('utf-8')
+    except UnicodeDecodeError:
+        text = raw.decode('cp1251')
+    fields = {}
+    for line in text.splitlines():
+        name, separator, value = line.partition(':')
+        if separator and name.strip() in INFO_FIELDS:
+            fields[INFO_FIELDS[name.strip()]] = value.strip()
+    return typed(fields)
+
+
+def read_experiment_metadata(path_dir: str) -> dict:
+    """
+    Метаданные папки эксперимента: из манифеста, а для папок прежних версий - из _info.txt.
+    """
+    if os.path.exists(manifest_path(path_dir)):
+        return read_manifest(path_dir)
+    return read_info_txt(os.path.join(path_dir, f'{os.path.basename(path_dir)}{INFO_SUFFIX}'))
+
+
+def is_experiment_dir(path_dir: str) -> bool:
+    name = os.path.basename(path_dir)
+    return (os.path.exists(os.path.join(path_dir, f'{name}{MANIFEST_SUFFIX}'))
+            or os.path.exists(os.path.join(path_dir, f'{name}{INFO_SUFFIX}')))
+
+
+def _experiment_dirs(main_path: str) -> list[str]:
+    """
+    Имена папок экспериментов основной папки (с манифестом или _info.txt).
+    """
+    with os.scandir(main_path) as entries:
+        return sorted(entry.name for entry in entries if entry.is_dir() and is_experiment_dir(entry.path))
+
+
+def _scan_experiments(main_path: str, names: list[str]) -> dict[str, dict]:
+    return {name: read_experiment_metadata(os.path.join(main_path, name)) for name in names}
+
+
+def update_catalog(main_path: str, manifests: dict[str, dict]) -> None:
+    """
+    Добавление или замена экспериментов в сводном каталоге <main_path>/experiments.json.
+    Если каталога еще нет, он сначала строится по всем папкам экспериментов (см. rebuild_catalog),
+    иначе каталог содержал бы только новые эксперименты и скрывал папки, сохраненные раньше.
+    :param manifests: dict - имя папки эксперимента -> поля манифеста.
+    """
+    with _catalog_lock:
+        path = os.path.join(main_path, CATALOG_NAME)
+        if os.path.exists(path):
+            experiments = _read_json(path)['experiments']
+        else:
+            experiments = _scan_experiments(main_path, [name for name in _experiment_dirs(main_path)
+                                                        if name not in manifests])
+        experiments.update({key: typed(fields) for key, fields in manifests.items()})
+        _write_json(path, {'schema_version': MANIFEST_VERSION, 'experiments': experiments})
+
+
+def rebuild_catalog(main_path: str) -> dict[str, dict]:
+    """
+    Построение сводного каталога по манифестам (или _info.txt) всех папок экспериментов основной папки.
+    :return: dict - имя папки эксперимента -> поля манифеста.
+    """
+    experiments = _scan_experiments(main_path, _experiment_dirs(main_path))
+    with _catalog_lock:
+        _write_json(os.path.join(main_path, CATALOG_NAME),
+                    {'schema_version': MANIFEST_VERSION, 'experiments': experiments})
+    return experiments
+
+
+def read_catalog(main_path: str) -> Optional[dict[str, dict]]:
+    """
+    Метаданные всех экспериментов основной папки одним чтением сводного каталога.
+    Эксперименты, папки которых удалены, не возвращаются. Папки экспериментов, которых нет в каталоге
+    (например, скопированные вручную), читаются по манифесту или _info.txt и добавляются в каталог.
+    :return: dict - имя папки эксперимента -> поля манифеста, None - каталога еще нет.
+    """
+    path = os.path.join(main_path, CATALOG_NAME)
+    if not os.path.exists(path):
+        return None
+    experiments = _read_json(path)['experiments']
+    existing = set(os.listdir(main_path))
+    catalog = {key: typed(fields) for key, fields in experiments.items() if key in existing}
+    missing = [name for name in sorted(existing - set(catalog))
+               if is_experiment_dir(os.path.join(main_path, name))]
+    if missing:
+        added = _scan_experiments(main_path, missing)
+        update_catalog(main_path, added)
+        catalog.update(added)
+    return catalog
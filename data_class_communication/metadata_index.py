@@ -0,0 +1,149 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterable, Optional
+from data_class_communication.experiment_store import ExperimentRecord
+
+# Поля с выбором по равенству: значение -> множество ключей экспериментов
+CATEGORY_FIELDS = ('material', 'coating', 'stage')
+# Поля с выбором по диапазону: отсортированный список пар (значение, ключ)
+RANGE_FIELDS = ('feed', 'spindle_speed', 'start_day', 'strength_mean', 'temperature_mean')
+COATING_SEPARATOR = '+'
+
+
+def coating_components(coating: Optional[str]) -> set[str]:
+    """
+    Составляющие покрытия: 'AlTiN + TiN' -> {'AlTiN', 'TiN'}.
+    """
+    return {part.strip() for part in (coating or '').split(COATING_SEPARATOR) if part.strip()}
+
+
+class MetadataIndex:
+    """
+    Индекс метаданных экспериментов в памяти для фильтров списка экспериментов.
+    Для материала, покрытия и этапа хранится инвертированный индекс значение -> ключи, покрытие
+    раскладывается на составляющие по '+', поэтому фильтр 'AlTiN' находит и 'AlTiN+TiN'.
+    Для подачи, частоты вращения, даты начала и средних силы и температуры хранятся отсортированные
+    списки значений, диапазон выбирается бинарным поиском.
+    Запрос возвращает записи каталога, временные ряды загружаются только для выбранных экспериментов.
+    """
+
+    def __init__(self, records: Iterable[ExperimentRecord] = ()):
+        self.records: dict[str, ExperimentRecord] = {}
+        self.categories: dict[str, dict[str, set[str]]] = {name: {} for name in CATEGORY_FIELDS}
+        self.ranges: dict[str, list[tuple]] = {name: [] for name in RANGE_FIELDS}
+        for record in records:
+            self.records[record.key] = record
+            self._add_categories(record)
+        # Начальное заполнение одной сортировкой вместо вставки по одной записи
+        for name, values in self.ranges.items():
+            values.extend((value, key) for key, record in self.records.items()
+                          if (value := getattr(record, name, None)) is not None)
+            values.sort()
+
+    @staticmethod
+    def _category_values(name: str, record: ExperimentRecord) -> set[str]:
+        value = getattr(record, name, None)
+        if name == 'coating':
+            return coating_components(value)
+        return {value} if value else set()
+
+    def add(self, record: ExperimentRecord) -> None:
+        """
+        Добавление записи, запись с тем же ключом заменяется.
+        """
+        self.remove(record.key)
+        self.records[record.key] = record
+        self._add_categories(record)
+        for name, values in self.ranges.items():
+            value = getattr(record, name, None)
+            if value is not None:
+                insort(values, (value, record.key))
+
+    def _add_categories(self, record: ExperimentRecord) -> None:
+        for name, index in self.categories.items():
+            for value in self._category_values(name, record):
+                index.setdefault(value, set()).add(record.key)
+
+    def remove(self, key: str) -> None:
+        record = self.records.pop(key, None)
+        if record is None:
+            return
+        for name, index in self.categories.items():
+            for value in self._category_values(name, record):
+                index[value].discard(key)
+                if not index[value]:
+                    del index[value]
+        for name, values in self.ranges.items():
+            value = getattr(record, name, None)
+            if value is not None:
+                values.pop(bisect_left(values, (value, key)))
+
+    def values(self, name: str) -> list:
+        """
+        Отсортированные значения поля для выпадающих списков фильтра.
+        :param name: str - поле из CATEGORY_FIELDS (для покрытия - составляющие) или RANGE_FIELDS.
+        """
+        if name in self.categories:
+            return sorted(self.categories[name])
+        return sorted({value for value, key in self.ranges[name]})
+
+    def _range_slice(self, name: str, bounds: tuple) -> slice:
+        low, high = bounds
+        values = self.ranges[name]
+        start = 0 if low is None else bisect_left(values, (low,))
+        # Ключ - строка, поэтому (high, chr(0x10FFFF)) больше любой пары со значением high
+        stop = len(values) if high is None else bisect_right(values, (high, chr(0x10FFFF)))
+        return slice(start, max(start, stop))
+
+    def _in_range(self, key: str, name: str, bounds: tuple) -> bool:
+        value = getattr(self.records[key], name, None)
+        low, high = bounds
+        return value is not None and (low is None or value >= low) and (high is None or value <= high)
+
+    def keys(self, **filters) -> list[str]:
+        """
+        Ключи экспериментов, подходящих под все фильтры.
+        :param filters: для полей CATEGORY_FIELDS - значение (для покрытия - одна или несколько составляющих
+            через '+'), для полей RANGE_FIELDS - пара (нижняя, верхняя) включительно, None - без границы.
+            Пустые значения фильтров игнорируются.
+        :return: list[str] - ключи в алфавитном порядке.
+        """
+        filters = {name: value for name, value in filters.items() if value}
+        unknown = set(filters) - set(CATEGORY_FIELDS) - set(RANGE_FIELDS)
+        if unknown:
+            raise KeyError(f'Нет полей индекса: {", ".join(sorted(unknown))}')
+        # Кандидаты: множества ключей по равенству и срезы отсортированных списков по диапазону.
+        # Пересечение начинается с самого узкого кандидата, широкие диапазоны проверяются по записям.
+        candidates = []
+        for name, value in filters.items():
+            if name in self.categories:
+                values = coating_components(value) if name == 'coating' else {value}
+                candidates.extend((len(keys), name, keys)
+                                  for keys in (self.categories[name].get(item, set()) for item in values))
+            else:
+                part = self._range_slice(name, value)
+                candidates.append((part.stop - part.start, name, part))
+        candidates.sort(key=lambda candidate: candidate[0])
+        selected: Optional[set[str]] = None
+        for size, name, keys in candidates:
+            if selected is not None and (not selected or len(selected) < size):
+                if name in self.ranges:
+                    selected = {key for key in selected if self._in_range(key, name, filters[name])}
+                else:
+                    selected &= keys
+            else:
+                if isinstance(keys, slice):
+                    keys = {key for value, key in self.ranges[name][keys]}
+                selected = set(keys) if selected is None else selected & keys
+        return sorted(self.records if selected is None else selected)
+
+    def query(self, **filters) -> list[ExperimentRecord]:
+        """
+        Записи каталога, подходящие под фильтры (см. keys).
+        """
+        return [self.records[key] for key in self.keys(**filters)]
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, key: str):
+        return key in self.records
@@ -0,0 +1,84 @@
+import hashlib
+import os
+import sqlite3
+import uuid
+from typing import Callable, ContextManager
+import numpy as np
+import pandas as pd
+from data_class_communication.experiment_store import connect_sqlite
+
+# Увеличивается при изменении обработки проходов, чтобы не использовать устаревшие записи кэша
+CACHE_VERSION = 1
+
+
+def file_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Хэш содержимого файла (sha1).
+    """
+    digest = hashlib.sha1()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PassCache:
+    """
+    Постоянный кэш обработанных файлов проходов.
+    Для каждого исходного файла в index.sqlite3 хранятся путь, размер, время изменения и хэш содержимого,
+    а обработанные таблицы (после чтения и поиска нуля) - в файлах <хэш>-<вид обработки>.npz.
+    Хэш пересчитывается только при изменении размера или времени изменения файла, поэтому
+    для неизменных файлов повторный импорт не читает исходники.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: str - папка кэша (обычно <main_path>/data_base/pass_cache).
+        """
+        self.path = path
+        self.index_path = os.path.join(path, 'index.sqlite3')
+        os.makedirs(path, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS files '
+                         '(path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, hash TEXT)')
+
+    def _connect(self) -> ContextManager[sqlite3.Connection]:
+        return connect_sqlite(self.index_path)
+
+    def file_hash(self, path: str) -> str:
+        """
+        Хэш содержимого файла, по возможности из индекса.
+        :param path: str - путь к исходному файлу.
+        :return: str - хэш содержимого.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        with self._connect() as conn:
+            row = conn.execute('SELECT size, mtime_ns, hash FROM files WHERE path = ?', (path,)).fetchone()
+        if row and row['size'] == stat.st_size and row['mtime_ns'] == stat.st_mtime_ns:
+            return row['hash']
+        digest = file_hash(path)
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)',
+                         (path, stat.st_size, stat.st_mtime_ns, digest))
+        return digest
+
+    def load(self, path: str, kind: str, loader: Callable[..., pd.DataFrame], *args) -> pd.DataFrame:
+        """
+        Обработанная таблица прохода из кэша, либо результат loader(path, *args), который сохраняется в кэш.
+        :param path: str - путь к исходному файлу прохода.
+        :param kind: str - вид обработки вместе с ее параметрами, например 'strength-12'.
+        :param loader: функция чтения и обработки файла.
+        :return: pd.DataFrame
+        """
+        entry = os.path.join(self.path, f'{self.file_hash(path)}-{kind}-v{CACHE_VERSION}.npz')
+        if os.path.exists(entry):
+            with np.load(entry) as data:
+                return pd.DataFrame({name: data[name] for name in data.files})
+
+        data_frame = loader(path, *args)
+        tmp_entry = f'{entry}.{uuid.uuid4()}.tmp'
+        with open(tmp_entry, 'wb') as file:
+            np.savez(file, **{str(column): data_frame[column].to_numpy() for column in data_frame.columns})
+        os.replace(tmp_entry, entry)
+        return data_frame
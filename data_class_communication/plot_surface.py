@@ -0,0 +1,125 @@
+from typing import Optional
+import numpy as np
+from matplotlib.figure import Figure
+from analytical_functions.decimation import DecimationPyramid
+
+
+class PlotSurface:
+    """
+    Постоянная область графика: одна фигура с осями силы и температуры (twinx) и двумя линиями.
+    При показе другого эксперимента заменяются только данные линий, заголовок и пределы осей,
+    фигура, оси и холст создаются один раз.
+    Если пределы осей и размер фигуры не изменились, фон (оси, подписи, сетка) берется из сохраненного
+    изображения и перерисовываются только линии и заголовок (blitting), иначе фигура перерисовывается полностью.
+    Линии строятся по прореженным рядам (DecimationPyramid) и пересчитываются при изменении видимого диапазона.
+    """
+
+    def __init__(self,
+                 figure: Optional[Figure] = None,
+                 name_x: str = 't, сек',
+                 name_y_1: str = 'Силы, Н',
+                 name_y_2: str = 'T, ℃'):
+        self.figure = figure if figure is not None else Figure()
+        self.figure.set_layout_engine('tight')
+        self.ax1 = self.figure.add_subplot()
+        self.ax2 = self.ax1.twinx()
+        self.ax1.set_xlabel(name_x)
+        self.ax1.set_ylabel(name_y_1, color='tab:blue')
+        self.ax1.tick_params(axis='y', labelcolor='tab:blue')
+        self.ax2.set_ylabel(name_y_2, color='tab:red')
+        self.ax2.tick_params(axis='y', labelcolor='tab:red')
+        self.line_strength, = self.ax1.plot([], [], '-', color='tab:blue')
+        self.line_temperature, = self.ax2.plot([], [], '-', color='tab:red')
+        self.title = self.figure.suptitle('')
+        self.pyramids: dict = {self.line_strength: None, self.line_temperature: None}
+        self.background = None
+        self.background_state = None
+        self.ax1.callbacks.connect('xlim_changed', self.update_view)
+
+    @property
+    def canvas(self):
+        return self.figure.canvas
+
+    @property
+    def dynamic_artists(self) -> list:
+        return [self.line_strength, self.line_temperature, self.title]
+
+    def set_labels(self, name_x: str, name_y_1: str, name_y_2: str) -> None:
+        """
+        Подписи осей. При изменении подписей сохраненный фон сбрасывается и следующий показ перерисует фигуру.
+        """
+        if (self.ax1.get_xlabel(), self.ax1.get_ylabel(), self.ax2.get_ylabel()) == (name_x, name_y_1, name_y_2):
+            return
+        self.ax1.set_xlabel(name_x)
+        self.ax1.set_ylabel(name_y_1, color='tab:blue')
+        self.ax2.set_ylabel(name_y_2, color='tab:red')
+        self.background = None
+
+    def show(self,
+             title: str,
+             strength: DecimationPyramid,
+             temperature: Optional[DecimationPyramid] = None) -> bool:
+        """
+        Показ эксперимента.
+        :param title: str - заголовок графика.
+        :param strength: DecimationPyramid - ряд силы.
+        :param temperature: DecimationPyramid - ряд температуры, None - линия температуры скрывается.
+        :return: bool - True, если обновлены только линии (blitting), False при полной перерисовке.
+        """
+        self.title.set_text(title)
+        for line, pyramid, ax in ((self.line_strength, strength, self.ax1),
+                                  (self.line_temperature, temperature, self.ax2)):
+            self.pyramids[line] = pyramid
+            line.set_data(*(pyramid.view(width=self._width()) if pyramid is not None else ([], [])))
+            # Масштабирование и сдвиг панелью инструментов отключают автомасштаб осей,
+            # новый эксперимент показывается в своих пределах, а не в пределах предыдущего
+            ax.set_autoscale_on(True)
+            ax.relim()
+            # Прореженные точки могут не содержать крайних значений x, пределы берутся по полному ряду
+            if pyramid is not None and len(pyramid):
+                x_min, x_max, y_min, y_max = pyramid.bounds()
+                ax.update_datalim([(x_min, y_min), (x_max, y_max)])
+            ax.autoscale_view()
+        self.update_view(self.ax1)
+
+        if self.background is not None and self.background_state == self._state():
+            self.canvas.restore_region(self.background)
+            for artist in self.dynamic_artists:
+                self.figure.draw_artist(artist)
+            self.canvas.blit(self.figure.bbox)
+            return True
+        self.redraw()
+        return False
+
+    def redraw(self) -> None:
+        """
+        Полная перерисовка фигуры с сохранением фона без линий и заголовка для следующих показов.
+        """
+        if not self.canvas.supports_blit:
+            self.canvas.draw()
+            return
+        for artist in self.dynamic_artists:
+            artist.set_visible(False)
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.background_state = self._state()
+        for artist in self.dynamic_artists:
+            artist.set_visible(True)
+            self.figure.draw_artist(artist)
+        self.canvas.blit(self.figure.bbox)
+
+    def update_view(self, ax=None) -> None:
+        """
+        Пересчет прореженных точек линий для видимого диапазона оси x.
+        """
+        x_min, x_max = self.ax1.get_xlim()
+        for line, pyramid in self.pyramids.items():
+            if pyramid is not None:
+                line.set_data(*pyramid.view(x_min, x_max, self._width()))
+
+    def _width(self) -> int:
+        return max(int(self.ax1.bbox.width), 1)
+
+    def _state(self) -> tuple:
+        return (tuple(np.round(self.ax1.viewLim.bounds, 12)), tuple(np.round(self.ax2.viewLim.bounds, 12)),
+                tuple(self.figure.bbox.bounds))
@@ -0,0 +1,256 @@
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator, Optional
+
+# Поля записи этапа в порядке вывода отчета
+REPORT_FIELDS = ('experiment', 'stage', 'calls', 'wall', 'cpu', 'peak_memory', 'rows')
+
+
+class StageRecord:
+    """
+    Замер одного вызова этапа. После выполнения этапа в rows можно записать количество обработанных строк,
+    calls = 0 учитывает время и память без увеличения числа вызовов.
+    """
+    __slots__ = ('experiment', 'stage', 'calls', 'rows', 'wall', 'cpu', 'peak_memory', 'start_memory')
+
+    def __init__(self, experiment: str, stage: str):
+        self.experiment = experiment
+        self.stage = stage
+        self.calls = 1
+        self.rows = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak_memory = 0
+        self.start_memory = 0
+
+
+class _DisabledStage:
+    """
+    Замер при выключенном профилировании: ничего не измеряет, присваивание rows игнорируется.
+    Один общий объект, поэтому выключенный замер не создает объектов.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    @property
+    def rows(self) -> int:
+        return 0
+
+    @rows.setter
+    def rows(self, value: int) -> None:
+        pass
+
+
+_DISABLED = _DisabledStage()
+
+
+class StageProfiler:
+    """
+    Профилирование этапов обработки экспериментов: время выполнения, процессорное время, пиковая память
+    (tracemalloc, прирост относительно начала этапа) и количество строк для каждого этапа и эксперимента.
+    Повторные вызовы этапа одного эксперимента суммируются.
+    Включается только на время блока with profiling(profiler) и только в потоке, выполняющем этот блок:
+    в остальных потоках (очередь выгрузки, цикл Tk) stage() возвращает пустой замер, и накладные расходы
+    сводятся к одной проверке. Вложенность этапов отслеживается отдельно в каждом потоке.
+    Счетчик пиковой памяти tracemalloc общий для процесса, поэтому при одновременном профилировании
+    нескольких потоков пиковая память этапа включает выделения других потоков.
+    """
+
+    def __init__(self, track_memory: bool = True):
+        """
+        :param track_memory: bool - измерять пиковую память. tracemalloc замедляет выделение памяти,
+        поэтому без него замер времени точнее.
+        """
+        self.track_memory = track_memory
+        self.records: dict[tuple[str, str], dict] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def _stack(self) -> list[StageRecord]:
+        # Стек вложенных этапов текущего потока
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def stage(self, name: str, experiment: str = '') -> Iterator[StageRecord]:
+        record = StageRecord(experiment, name)
+        stack = self._stack
+        if self.track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # Пик внешнего этапа сохраняется до сброса счетчика для вложенного
+            for outer in stack:
+                outer.peak_memory = max(outer.peak_memory, peak - outer.start_memory)
+            record.start_memory = current
+            tracemalloc.reset_peak()
+        stack.append(record)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield record
+        finally:
+            record.wall = time.perf_counter() - wall
+            record.cpu = time.thread_time() - cpu
+            stack.pop()
+            if self.track_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                record.peak_memory = max(record.peak_memory, peak - record.start_memory)
+                for outer in stack:
+                    outer.peak_memory = max(outer.peak_memory, peak - outer.start_memory)
+            self.add(record.experiment, record.stage, record.wall, record.cpu, record.peak_memory, record.rows,
+                     record.calls)
+
+    def add(self, experiment: str, stage: str, wall: float, cpu: float, peak_memory: int = 0, rows: int = 0,
+            calls: int = 1) -> None:
+        """
+        Добавление замера, например полученного из другого процесса.
+        """
+        with self._lock:
+            entry = self.records.setdefault((experiment, stage), {'experiment': experiment, 'stage': stage,
+                                                                  'calls': 0, 'wall': 0.0, 'cpu': 0.0,
+                                                                  'peak_memory': 0, 'rows': 0})
+            entry['calls'] += calls
+            entry['wall'] += wall
+            entry['cpu'] += cpu
+            entry['peak_memory'] = max(entry['peak_memory'], peak_memory)
+            entry['rows'] += rows
+
+    def extend(self, records: Iterable[dict]) -> None:
+        """
+        Добавление записей отчета (см. report), например из процесса пакетного импорта.
+        """
+        for record in records:
+            self.add(record['experiment'], record['stage'], record['wall'], record['cpu'], record['peak_memory'],
+                     record['rows'], record['calls'])
+
+    def report(self) -> list[dict]:
+        """
+        Записи по этапам и экспериментам в порядке первого выполнения: словари с полями REPORT_FIELDS,
+        wall и cpu в секундах, peak_memory в байтах.
+        """
+        with self._lock:
+            return [dict(record) for record in self.records.values()]
+
+    def summary(self) -> list[dict]:
+        """
+        Записи, просуммированные по этапам всех экспериментов, experiment - количество экспериментов.
+        """
+        totals: dict[str, dict] = {}
+        for record in self.report():
+            entry = totals.setdefault(record['stage'], {'experiment': 0, 'stage': record['stage'], 'calls': 0,
+                                                        'wall': 0.0, 'cpu': 0.0, 'peak_memory': 0, 'rows': 0})
+            entry['experiment'] += 1
+            for name in ('calls', 'wall', 'cpu', 'rows'):
+                entry[name] += record[name]
+            entry['peak_memory'] = max(entry['peak_memory'], record['peak_memory'])
+        return list(totals.values())
+
+    def format_report(self, by_experiment: bool = False) -> str:
+        """
+        Текстовая таблица отчета: по этапам (summary) или по этапам каждого эксперимента (report).
+        """
+        lines = [f'{"этап":<24} {"вызовов":>8} {"время, с":>9} {"CPU, с":>8} {"память, МБ":>11} {"строк":>10}']
+        for record in (self.report() if by_experiment else self.summary()):
+            if by_experiment and (len(lines) == 1 or record['experiment'] != previous):
+                lines.append(record['experiment'])
+                previous = record['experiment']
+            lines.append(f'{record["stage"]:<24} {record["calls"]:>8} {record["wall"]:9.3f} {record["cpu"]:8.3f} '
+                         f'{record["peak_memory"] / 2 ** 20:11.1f} {record["rows"]:>10}')
+        return '\n'.join(lines)
+
+    def save(self, path: str) -> None:
+        """
+        Запись отчета в json: {'summary': [...], 'experiments': [...]}.
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({'summary': self.summary(), 'experiments': self.report()}, file, ensure_ascii=False, indent=2)
+
+
+# Активный профилировщик задается для потока (контекста), выполняющего блок profiling():
+# новые потоки начинают с пустым контекстом и не записывают замеры в чужой отчет
+_active: ContextVar[Optional[StageProfiler]] = ContextVar('active_profiler', default=None)
+# tracemalloc включен для всего процесса, пока выполняется хотя бы один блок profiling() с замером памяти
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+
+
+def active_profiler() -> Optional[StageProfiler]:
+    return _active.get()
+
+
+def stage(name: str, experiment: str = ''):
+    """
+    Замер этапа в активном профилировщике:
+        with stage('strength.regression', key) as record:
+            ...
+            record.rows = len(data_frame)
+    Если профилирование не включено, возвращается пустой замер.
+    """
+    profiler = _active.get()
+    if profiler is None:
+        return _DISABLED
+    return profiler.stage(name, experiment)
+
+
+def profiled_chunks(chunks: Iterable, name: str, experiment: str = '') -> Iterable:
+    """
+    Замер времени получения каждой части из итератора (например чтения и разбора файла по частям)
+    как отдельного этапа, количество строк - сумма длин частей.
+    При выключенном профилировании итератор возвращается без изменений.
+    """
+    profiler = _active.get()
+    if profiler is None:
+        return chunks
+    return _profiled_chunks(profiler, iter(chunks), name, experiment)
+
+
+def _profiled_chunks(profiler: StageProfiler, chunks: Iterator, name: str, experiment: str) -> Iterator:
+    while True:
+        with profiler.stage(name, experiment) as record:
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                # Время последнего обращения (чтение конца файла) учитывается, но не как отдельная часть
+                record.calls = 0
+                return
+            record.rows = len(chunk)
+        yield chunk
+
+
+@contextmanager
+def profiling(profiler: Optional[StageProfiler] = None) -> Iterator[StageProfiler]:
+    """
+    Включение профилирования на время блока with.
+    :param profiler: StageProfiler - профилировщик, в который добавляются замеры, по умолчанию новый.
+    """
+    global _tracing_users
+    profiler = StageProfiler() if profiler is None else profiler
+    started = False
+    if profiler.track_memory:
+        with _tracing_lock:
+            # tracemalloc, включенный не профилированием, не останавливается
+            if _tracing_users or not tracemalloc.is_tracing():
+                if not _tracing_users:
+                    tracemalloc.start()
+                _tracing_users += 1
+                started = True
+    token = _active.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _active.reset(token)
+        if started:
+            with _tracing_lock:
+                _tracing_users -= 1
+                if not _tracing_users:
+                    tracemalloc.stop()
@@ -0,0 +1,146 @@
+import os
+from typing import Callable, Optional
+import pandas as pd
+
+# Количество байт начала файла, по которым определяется формат
+SNIFF_SIZE = 8192
+
+
+class RawFormat:
+    """
+    Параметры чтения исходного файла прибора: строка заголовка, кодировка, разделитель и десятичный знак.
+    """
+
+    def __init__(self,
+                 name: str,
+                 header: int,
+                 encoding: str = 'utf-8',
+                 sep: str = ';',
+                 decimal: str = ',',
+                 names: Optional[list[str]] = None,
+                 on_bad_lines: str = 'error'):
+        self.name = name
+        self.header = header
+        self.encoding = encoding
+        self.sep = sep
+        self.decimal = decimal
+        self.names = names
+        self.on_bad_lines = on_bad_lines
+
+    def read_csv(self, path: str, **kwargs):
+        """
+        Чтение файла в этом формате, kwargs передаются в pd.read_csv (например chunksize).
+        """
+        return pd.read_csv(path, sep=self.sep, header=self.header, decimal=self.decimal, encoding=self.encoding,
+                           names=self.names, on_bad_lines=self.on_bad_lines, dtype='float', **kwargs)
+
+    def __eq__(self, other):
+        return isinstance(other, RawFormat) and vars(self) == vars(other)
+
+    def __repr__(self):
+        return f"RawFormat({self.name!r}, header={self.header}, encoding={self.encoding!r}, sep={self.sep!r})"
+
+
+class DelimitedTable:
+    """
+    Определение формата таблицы чисел с текстовой шапкой произвольной длины.
+    Заголовком считается строка перед первыми min_rows строками, состоящими из columns чисел.
+    Кодировки и разделители перебираются в указанном порядке, десятичный знак определяется по данным.
+    """
+
+    def __init__(self,
+                 name: str,
+                 columns: int,
+                 encodings: tuple[str, ...] = ('utf-8', 'windows-1251'),
+                 separators: tuple[str, ...] = (';', '\t'),
+                 names: Optional[list[str]] = None,
+                 on_bad_lines: str = 'error',
+                 min_rows: int = 3):
+        self.name = name
+        self.columns = columns
+        self.encodings = encodings
+        self.separators = separators
+        self.names = names
+        self.on_bad_lines = on_bad_lines
+        self.min_rows = min_rows
+
+    def __call__(self, head: bytes) -> Optional[RawFormat]:
+        for encoding in self.encodings:
+            try:
+                text = head.decode(encoding)
+            except UnicodeDecodeError:
+                continue
+            # Последняя строка может быть обрезана на границе SNIFF_SIZE
+            lines = text.splitlines()[:-1] if len(head) >= SNIFF_SIZE else text.splitlines()
+            for sep in self.separators:
+                header = self._header_line(lines, sep)
+                if header is not None:
+                    decimal = ',' if sep != ',' and any(',' in line for line in lines[header + 1:]) else '.'
+                    return RawFormat(self.name, header, encoding, sep, decimal, self.names, self.on_bad_lines)
+        return None
+
+    def _header_line(self, lines: list[str], sep: str) -> Optional[int]:
+        numeric = [_numeric_fields(line, sep) == self.columns for line in lines]
+        for index in range(1, len(lines)):
+            rows = numeric[index:index + self.min_rows]
+            if rows and all(rows) and (len(rows) == self.min_rows or index + len(rows) == len(lines)):
+                return index - 1
+        return None
+
+
+def _numeric_fields(line: str, sep: str) -> int:
+    """
+    Количество полей строки, если все они числа (с точкой или запятой), иначе 0.
+    """
+    fields = line.strip().split(sep)
+    try:
+        for field in fields:
+            float(field.replace(',', '.') if sep != ',' else field)
+    except ValueError:
+        return 0
+    return len(fields)
+
+
+Detector = Callable[[bytes], Optional[RawFormat]]
+FORMATS: dict[str, list[Detector]] = {'strength': [], 'temperature': []}
+_directory_detectors: dict[tuple[str, str], Detector] = {}
+
+
+def register_format(kind: str, detector: Detector) -> Detector:
+    """
+    Регистрация формата исходных файлов.
+    :param kind: str - вид данных: 'strength' или 'temperature'.
+    :param detector: функция detector(head: bytes) -> RawFormat | None, по началу файла
+    возвращает параметры чтения или None, если файл не в этом формате.
+    :return: detector
+    """
+    FORMATS.setdefault(kind, []).insert(0, detector)
+    _directory_detectors.clear()
+    return detector
+
+
+def detect_format(path: str, kind: str) -> RawFormat:
+    """
+    Определение формата исходного файла по первым SNIFF_SIZE байтам.
+    Формат, найденный для файла, запоминается для его папки и для следующих файлов этой папки проверяется первым.
+    :param path: str - путь к исходному файлу.
+    :param kind: str - вид данных: 'strength' или 'temperature'.
+    :return: RawFormat
+    """
+    with open(path, 'rb') as file:
+        head = file.read(SNIFF_SIZE)
+    directory = (os.path.dirname(os.path.abspath(path)), kind)
+    cached = _directory_detectors.get(directory)
+    for detector in ([cached] if cached else []) + FORMATS[kind]:
+        raw_format = detector(head)
+        if raw_format is not None:
+            _directory_detectors[directory] = detector
+            return raw_format
+    raise ValueError(f'Неизвестный формат файла {path}')
+
+
+# Динамометр: 4 столбца (Time, Fx, Fy, Fz), шапка 2 строки в utf-8 либо 19 строк в windows-1251 у старых файлов
+register_format('strength', DelimitedTable('dynamometer', columns=4))
+# Термопара: 2 столбца (время, напряжение) через табуляцию, шапка 11 строк в windows-1251
+register_format('temperature', DelimitedTable('thermocouple', columns=2, encodings=('windows-1251',),
+                                              separators=('\t',), names=['Time', 'Voltage'], on_bad_lines='skip'))
@@ -0,0 +1,78 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from data_class_communication.class_for_communication import Couple, Strength, Temperature
+
+
+@pytest.fixture
+def couple():
+    params = dict(material='ХН50', coating='AlTiN3', tool='Фреза 12', feed=53.0, spindle_speed=800.0,
+                  stage='4 этап', from_files=True)
+    time = np.arange(10, dtype=float)
+    strength = Strength(path_strength='', **params)
+    strength.data_frame = pd.DataFrame({'Time': time, 'Fy': 10 + time, 'Model_strength': 10 + time})
+    strength.start_day = '2023.06.15-13:14:28'
+    strength.last_day = '2023.06.15-14:07:06'
+    strength.unique_id = 'strength-id'
+    strength.passes = 2
+    strength.strength_mean = 14.5
+    strength.coefficient_mnk = 10.0, 1.0
+    strength.equation_mnk = '10.00 + 1.00·T = Fy'
+    strength.processing_time = 9.0
+    strength.filename_base = strength.filename = 'Фреза 12;ХН50;AlTiN3;53.0;800.0;4 этап'
+
+    temperature = Temperature(path_temperature='', **params)
+    temperature.data_frame = pd.DataFrame({'Time': time, 'Voltage': time / 2, 'Temperature': time * 12.04,
+                                           'Model_temp': time * 12.04})
+    temperature.unique_id = 'temperature-id'
+    temperature.passes = 2
+    temperature.temperature_mean = 54.18
+    temperature.coefficient_mnk = 0.0, 12.04
+    temperature.equation_mnk = '0.00  +  12.04·t = T'
+    temperature.processing_time = 9.0
+    temperature.couple_strength_data = strength.data_frame
+    return Couple(strength, temperature)
+
+
+def write_raw_pass(path_strength: str, path_temperature: str, name: str, seed: int, samples: int = 2000,
+                   cutting: bool = True) -> None:
+    """
+    Запись одного прохода в формате динамометра (заголовок в 3 строке) и термопары (заголовок в 12 строке).
+    При cutting=False сила не поднимается выше уровня шума, как в проходе без резания.
+    """
+    rng = np.random.default_rng(seed)
+    cut = slice(samples // 10, samples - samples // 10)
+    time = np.arange(samples) * 0.01
+    fy = rng.normal(1, 0.2, samples)
+    if cutting:
+        fy[cut] += 20 + 0.5 * time[cut]
+    strength = pd.DataFrame({'Time': time, 'Fx': fy / 2, 'Fy': fy, 'Fz': fy / 3})
+    with open(os.path.join(path_strength, f'{name}.csv'), 'w', encoding='utf-8') as file:
+        file.write('Dynamometer\nRate: 100 Hz\n')
+        strength.to_csv(file, sep=';', decimal=',', index=False)
+
+    voltage = rng.normal(2, 0.1, samples // 4)
+    voltage[samples // 40: samples // 4 - samples // 40] += 12
+    with open(os.path.join(path_temperature, f'{name}.txt'), 'w', encoding='windows-1251') as file:
+        file.write(''.join(f'Заголовок {i}\n' for i in range(11)))
+        file.write('Время\tНапряжение\n')
+        pd.DataFrame({'Time': np.arange(voltage.size) * 0.04, 'Voltage': voltage}).to_csv(
+            file, sep='\t', decimal=',', index=False, header=False)
+
+
+@pytest.fixture
+def raw_campaign(tmp_path):
+    """
+    Папка с исходниками двух экспериментов по три прохода; во втором эксперименте нет сил выше порога.
+    """
+    root = tmp_path / 'campaign'
+    for number, experiment in enumerate(['4 этап/VT18U/nACo3', '4 этап/HN50/AlTiN3']):
+        path_strength = root / experiment / 'Силы'
+        path_temperature = root / experiment / 'Температура'
+        path_strength.mkdir(parents=True)
+        path_temperature.mkdir(parents=True)
+        for i in range(3):
+            write_raw_pass(str(path_strength), str(path_temperature), f'pass_{i}', seed=10 * number + i,
+                           cutting=number == 0)
+    return root
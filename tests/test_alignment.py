@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+from analytical_functions.alignment import align_frames, align_to_grid, time_grid
+
+
+def test_nearest_matches_outer_merge_on_seconds():
+    rng = np.random.default_rng(0)
+    strength_time = np.sort(rng.choice(np.arange(500.0), 400, replace=False))
+    temperature_time = np.arange(450.0)
+    strength = pd.DataFrame({'Time': strength_time, 'Fy': rng.normal(20, 1, strength_time.size)})
+    temperature = pd.DataFrame({'Time': temperature_time, 'Temperature': rng.normal(300, 5, temperature_time.size)})
+    expected = pd.merge(strength, temperature, how='outer', on='Time').sort_values(by='Time').reset_index(drop=True)
+    pd.testing.assert_frame_equal(align_frames([strength, temperature]), expected)
+
+
+def test_float_jitter_in_one_row():
+    strength = pd.DataFrame({'Time': [0.0, 1.0000001, 2.0], 'Fy': [1.0, 2.0, 3.0]})
+    temperature = pd.DataFrame({'Time': [0.0, 0.9999999, 2.0000001], 'Temperature': [10.0, 20.0, 30.0]})
+    result = align_frames([strength, temperature])
+    pd.testing.assert_frame_equal(result, pd.DataFrame({'Time': [0.0, 1.0, 2.0], 'Fy': [1.0, 2.0, 3.0],
+                                                        'Temperature': [10.0, 20.0, 30.0]}))
+    assert len(pd.merge(strength, temperature, how='outer', on='Time')) == 5
+
+
+def test_methods():
+    time = np.array([0.0, 2.0, 6.0])
+    values = np.array([0.0, 4.0, 12.0])
+    grid = np.arange(8.0)
+    nan = np.nan
+    np.testing.assert_array_equal(align_to_grid(time, values, grid, 'nearest'),
+                                  [0, nan, 4, nan, nan, nan, 12, nan])
+    np.testing.assert_array_equal(align_to_grid(time, values, grid, 'interp'), [0, 2, 4, 6, 8, 10, 12, nan])
+    np.testing.assert_array_equal(align_to_grid(time, values, grid, 'asof'), [0, 0, 4, 4, nan, nan, 12, 12])
+    np.testing.assert_array_equal(align_to_grid(time, values, grid, 'asof', tolerance=np.inf),
+                                  [0, 0, 4, 4, 4, 4, 12, 12])
+    # Неотсортированное время и несколько столбцов
+    matrix = align_to_grid(time[::-1], np.column_stack((values, -values))[::-1], grid, 'interp')
+    np.testing.assert_array_equal(matrix[:, 1], -matrix[:, 0])
+    with pytest.raises(ValueError):
+        align_to_grid(time, values, grid, 'cubic')
+
+
+def test_inner_grid():
+    np.testing.assert_array_equal(time_grid([np.array([0.0, 10.0]), np.array([3.2, 20.0])], how='inner'),
+                                  np.arange(3.0, 11.0))
+    strength = pd.DataFrame({'Time': np.arange(10.0), 'Fy': np.arange(10.0)})
+    temperature = pd.DataFrame({'Time': np.arange(5.0, 20.0, 2), 'Temperature': np.arange(5.0, 20.0, 2)})
+    result = align_frames([strength, temperature], 'interp', how='inner')
+    assert result['Time'].tolist() == [5.0, 6.0, 7.0, 8.0, 9.0]
+    assert result.notna().all().all()
+    with pytest.raises(ValueError):
+        align_frames([strength, strength])
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+from analytical_functions.analysis_functions import add_names_fields, determination_zero_strength, \
+    determination_zero_strength_list
+from analytical_functions.baseline import (correct_baseline, first_crossings, linear_drift_baseline,
+                                           pass_baselines, trimmed_mean_baseline)
+from analytical_functions.time_processing import pass_bounds
+from data_class_communication.func_init import read_strength_chunks
+from data_class_communication.raw_formats import detect_format
+from conftest import write_raw_pass
+
+
+def zero_reference(data_frame: pd.DataFrame, min_strength: float) -> pd.DataFrame:
+    # Прежняя реализация determination_zero_strength
+    data_frame = data_frame.copy()
+    first_index = data_frame.loc[data_frame['Fy'] > min_strength].index.values[0]
+    median_const = data_frame['Fy'][:first_index].sort_values().median()
+    data_frame['Fy'] = data_frame['Fy'] - median_const
+    return data_frame
+
+
+def make_passes(count: int = 4, seed: int = 0) -> list[pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    passes = []
+    for number in range(count):
+        size = 2000 + 137 * number
+        fy = rng.normal(number, 0.3, size)
+        fy[size // 5:] += 25
+        passes.append(pd.DataFrame({'Time': np.arange(size) * 0.01, 'Fy': fy}))
+    return passes
+
+
+def test_first_crossings():
+    values = np.array([0, 5, 1, 0, 0, 7, 9, 8], dtype=float)
+    assert first_crossings(values, np.array([0, 3, 6]), 4).tolist() == [1, 2, 0]
+    with pytest.raises(IndexError):
+        first_crossings(values, np.array([0, 2, 4]), 4)
+
+
+def test_zero_matches_previous_implementation():
+    passes = make_passes()
+    originals = [data_frame.copy() for data_frame in passes]
+    corrected = determination_zero_strength_list(passes, 12)
+    for data_frame, result, original in zip(passes, corrected, originals):
+        pd.testing.assert_frame_equal(result, zero_reference(original, 12))
+        # Исходные таблицы не изменяются
+        pd.testing.assert_frame_equal(data_frame, original)
+    pd.testing.assert_frame_equal(determination_zero_strength(passes[0], 12), corrected[0])
+
+
+def test_estimators():
+    rng = np.random.default_rng(1)
+    idle = rng.normal(3, 0.1, 1000)
+    idle[:10] = 100
+    assert trimmed_mean_baseline(idle)[0] == pytest.approx(3, abs=0.02)
+    assert trimmed_mean_baseline(idle)[1] == 0
+    drift = 2 + 0.01 * np.arange(500)
+    assert linear_drift_baseline(drift) == pytest.approx((2, 0.01))
+
+    passes = [data_frame.assign(Fy=data_frame['Fy'] + 0.01 * np.arange(len(data_frame)))
+              for data_frame in make_passes(seed=2)]
+    list_fy = [data_frame['Fy'].to_numpy() for data_frame in passes]
+    bounds = pass_bounds(list_fy)
+    coefficients = pass_baselines(np.concatenate(list_fy), bounds, 12, 'linear')
+    assert coefficients[:, 1] == pytest.approx([0.01] * len(passes), abs=1e-3)
+    corrected = determination_zero_strength_list(passes, 12, 'linear')
+    # После учета дрейфа силы покоя около нуля
+    assert all(abs(data_frame['Fy'].iloc[:300].mean()) < 0.1 for data_frame in corrected)
+    with pytest.raises(KeyError):
+        pass_baselines(np.concatenate(list_fy), bounds, 12, 'mode')
+
+
+@pytest.mark.parametrize('estimator', ['median', 'trimmed_mean', 'linear'])
+@pytest.mark.parametrize('chunk_size', [100, 1000, 100000])
+def test_read_strength_chunks_zero(tmp_path, chunk_size, estimator):
+    write_raw_pass(str(tmp_path), str(tmp_path), 'pass', seed=5)
+    path = str(tmp_path / 'pass.csv')
+    raw = add_names_fields(detect_format(path, 'strength').read_csv(path))
+    chunks = pd.concat(read_strength_chunks(path, 12, chunk_size, estimator), ignore_index=True)
+    expected = correct_baseline(raw['Fy'].to_numpy(), np.array([0]), 12, estimator)
+    np.testing.assert_allclose(chunks['Fy'].to_numpy(), expected)
+    if estimator == 'median':
+        pd.testing.assert_series_equal(chunks['Fy'], zero_reference(raw, 12)['Fy'])
@@ -0,0 +1,60 @@
+import os
+import pytest
+from data_class_communication.batch_import import ImportTask, find_import_tasks, run_import, default_cutting_params
+from data_class_communication.experiment_store import ExperimentStore
+
+
+def test_find_import_tasks(raw_campaign):
+    tasks = find_import_tasks(str(raw_campaign))
+    assert sorted(os.path.basename(os.path.dirname(task.path_strength)) for task in tasks) == ['AlTiN3', 'nACo3']
+    assert all(task.path_temperature.endswith('Температура') for task in tasks)
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_run_import(tmp_path, raw_campaign, jobs):
+    main_path = tmp_path / 'main'
+    main_path.mkdir()
+    tasks = sorted(find_import_tasks(str(raw_campaign)), key=str)
+    for task, material in zip(tasks, ['ХН50', 'ВТ18У']):
+        task.material = material
+    progress = []
+    results = run_import(tasks, str(main_path), jobs=jobs,
+                         progress=lambda done, total, result: progress.append((done, total)))
+
+    assert sorted(progress) == [(1, 2), (2, 2)]
+    failed = [result for result in results if not result.ok]
+    assert len(failed) == 1
+    assert failed[0].task.path_strength == tasks[0].path_strength
+    assert failed[0].error.startswith('IndexError')
+
+    store = ExperimentStore(str(main_path / 'data_base'))
+    records = store.records()
+    assert [record.material for record in records] == ['ВТ18У']
+    assert records[0].passes == 3
+    assert os.path.isdir(main_path / records[0].key)
+
+
+def test_default_cutting_params():
+    assert default_cutting_params('ХН58') == (53.0, 800.0)
+    assert default_cutting_params('ВТ41') == (200.0, 2000.0)
+
+
+def test_estimator(tmp_path, raw_campaign):
+    main_path = tmp_path / 'main'
+    main_path.mkdir()
+    task = [task for task in find_import_tasks(str(raw_campaign)) if 'nACo3' in task.path_strength][0]
+    task.estimator = 'linear'
+    [result] = run_import([task], str(main_path), jobs=1, excel=False)
+    assert result.ok and result.couple.strength.estimator == 'linear'
+    store = ExperimentStore(str(main_path / 'data_base'))
+    record = store.record(result.key)
+    assert record.baseline_estimator == 'linear'
+    assert ImportTask.from_record(record).estimator == 'linear'
+    linear = store.load_frame(result.key, 'strength')
+
+    # Другой способ оценки нуля меняет хэш исходников: эксперимент обрабатывается заново, а не берется из кэша
+    task.estimator = 'median'
+    [result] = run_import([task], str(main_path), jobs=1, excel=False)
+    assert result.ok and not result.skipped
+    assert store.record(result.key).baseline_estimator == 'median'
+    assert not linear['Fy'].equals(store.load_frame(result.key, 'strength')['Fy'])
@@ -0,0 +1,24 @@
+import json
+from benchmarks import bench_pipeline
+
+STAGES = ['create_file_list', 'parse', 'zero', 'binning', 'regression', 'merge', 'build', 'save', 'store',
+          'import']
+
+
+def test_pipeline_stages(tmp_path):
+    result = bench_pipeline.run(passes=2, samples=6000, repeat=1, root=str(tmp_path))
+    assert list(result['stages']) == STAGES
+    assert all(stage['rows'] > 0 and len(stage['runs']) == 1 for stage in result['stages'].values())
+    # Исходные файлы обоих форматов динамометра прочитаны целиком
+    assert result['stages']['parse']['rows'] == 2 * 2 * (6000 + 6000 // 40)
+    json.dumps(result)
+
+
+def test_compare(capsys):
+    baseline = {'params': {'passes': 1, 'samples': 1},
+                'stages': {'parse': {'seconds': 1.0}, 'zero': {'seconds': 0.01}, 'merge': {'seconds': 1.0}}}
+    current = {'params': {'passes': 1, 'samples': 1},
+               'stages': {'parse': {'seconds': 1.5}, 'zero': {'seconds': 0.02}, 'merge': {'seconds': 1.1},
+                          'store': {'seconds': 0.1}}}
+    assert bench_pipeline.compare(baseline, current, threshold=0.2) == ['parse']
+    assert 'store' in capsys.readouterr().out
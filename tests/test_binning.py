@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+from analytical_functions.binning import SecondBins, bin_statistics
+from data_class_communication.func_init import create_data_strength_from_list
+
+
+def groupby_reference(time: np.ndarray, values: np.ndarray) -> pd.DataFrame:
+    data_frame = pd.DataFrame({'Time': np.ceil(time), 'Fy': values})
+    grouped = data_frame.groupby('Time')['Fy']
+    return pd.DataFrame({'Time': grouped.mean().index.to_numpy(),
+                         'Fy': grouped.mean().round(2).to_numpy(),
+                         'Fy_max': grouped.max().round(2).to_numpy(),
+                         'Fy_std': grouped.std().round(2).to_numpy(),
+                         'Fy_count': grouped.count().to_numpy()})
+
+
+def test_bin_statistics_matches_groupby():
+    rng = np.random.default_rng(0)
+    time = np.sort(rng.uniform(0, 300, 20000))
+    time[::7] = np.round(time[::7])
+    values = 1000 + rng.normal(0, 3, time.size)
+    expected = groupby_reference(time, values)
+    result = bin_statistics(time, values, 'Fy', ('mean', 'max', 'std', 'count'))
+    pd.testing.assert_frame_equal(result, expected)
+
+    # Части, в том числе с общими интервалами на границах и в произвольном порядке
+    bins = SecondBins()
+    for part in np.array_split(rng.permutation(time.size), 13):
+        bins.add(time[part], values[part])
+    pd.testing.assert_frame_equal(bins.frame('Fy', ('mean', 'max', 'std', 'count')), expected, atol=0.011)
+
+
+def test_bin_statistics_single_point():
+    result = bin_statistics(np.array([0.5, 3.0, 2.5]), np.array([1.0, 4.0, 2.0]), 'Voltage', ('count', 'std'))
+    pd.testing.assert_frame_equal(result, pd.DataFrame({'Time': [1.0, 3.0], 'Voltage_count': [1, 2],
+                                                        'Voltage_std': [np.nan, 1.41]}))
+    with pytest.raises(KeyError):
+        bin_statistics(np.array([0.5]), np.array([1.0]), 'Fy', ('median',))
+
+
+def test_strength_statistics():
+    rng = np.random.default_rng(1)
+    passes = [pd.DataFrame({'Time': np.arange(3000) * 0.01, 'Fy': rng.normal(20, 1, 3000)}) for _ in range(3)]
+    mean = create_data_strength_from_list(passes, 12)
+    full = create_data_strength_from_list(passes, 12, ('mean', 'max', 'std', 'count'))
+    pd.testing.assert_frame_equal(full[['Time', 'Fy']], mean)
+    assert list(full.columns) == ['Time', 'Fy', 'Fy_max', 'Fy_std', 'Fy_count']
+    assert full['Fy_count'].sum() == 9000
+    assert (full['Fy_max'] >= full['Fy']).all()
+
+
+def test_second_bins_step_and_nan():
+    bins = SecondBins(step=0.5)
+    bins.add(np.array([0.2, 0.5, np.nan, 1.4, 1.6]), np.array([1.0, 3.0, 100.0, 5.0, np.nan]))
+    result = bins.frame('Fy', ('mean', 'count'))
+    np.testing.assert_array_equal(result['Time'], [0.5, 1.5])
+    np.testing.assert_array_equal(result['Fy'], [2.0, 5.0])
+    np.testing.assert_array_equal(bins.means(), [np.nan, 2.0, np.nan, 5.0])
@@ -0,0 +1,59 @@
+import json
+import os
+import subprocess
+import sys
+import argparse
+import pytest
+import cli
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_parse_range():
+    assert cli.parse_range('50..100', 'feed') == (50.0, 100.0)
+    assert cli.parse_range('..100', 'feed') == (None, 100.0)
+    assert cli.parse_range('2023.06.15-13:00:00..', 'start_day') == ('2023.06.15-13:00:00', None)
+    with pytest.raises(argparse.ArgumentTypeError):
+        cli.parse_range('50', 'feed')
+    with pytest.raises(argparse.ArgumentTypeError):
+        cli.parse_range('a..b', 'feed')
+
+
+def test_commands(tmp_path, raw_campaign, capsys):
+    main_path = str(tmp_path / 'main')
+    # Во втором эксперименте нет сил выше порога
+    assert cli.main(['import', str(raw_campaign), '--main-path', main_path, '--jobs', '1', '--no-excel']) == 1
+    assert 'added 1, skipped 0, errors 1' in capsys.readouterr().out
+
+    assert cli.main(['query', '--main-path', main_path, '--json', '--fields', 'key,passes,feed']) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert len(rows) == 1 and rows[0]['passes'] == 3
+    assert cli.main(['query', '--main-path', main_path, '--feed', f'..{rows[0]["feed"] - 1}']) == 0
+    assert capsys.readouterr().out.splitlines() == ['\t'.join(cli.QUERY_FIELDS)]
+
+    # Исходники не изменились: import пропускает эксперимент, reanalyze обрабатывает заново
+    assert cli.main(['import', str(raw_campaign), '--main-path', main_path, '--jobs', '1', '--no-excel']) == 1
+    assert 'added 0, skipped 1' in capsys.readouterr().out
+    assert cli.main(['reanalyze', '--main-path', main_path, '--jobs', '1', '--no-excel', '--profile']) == 0
+    captured = capsys.readouterr()
+    assert f'[1/1] ok {rows[0]["key"]}' in captured.out
+    assert 'strength.regression' in captured.err
+
+    assert cli.main(['export', '--main-path', main_path, '--format', 'files']) == 0
+    assert capsys.readouterr().out.split() == ['ok', *rows[0]['key'].split(), 'files']
+    with pytest.raises(SystemExit):
+        cli.main(['query', '--main-path', str(tmp_path / 'missing')])
+
+
+def test_no_gui_imports(tmp_path, raw_campaign):
+    code = ('import sys, cli\n'
+            f'cli.main(["import", {str(raw_campaign)!r}, "--main-path", {str(tmp_path / "main")!r}, "--jobs", "1"])\n'
+            f'cli.main(["query", "--main-path", {str(tmp_path / "main")!r}])\n'
+            'print(sorted({name.split(".")[0] for name in sys.modules} & {"tkinter", "matplotlib", "seaborn"}))')
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, encoding='utf-8')
+    assert result.stdout.splitlines()[-1] == '[]'
+
+
+def test_estimators_match_baseline():
+    from analytical_functions.baseline import BASELINE_ESTIMATORS
+    assert cli.ESTIMATORS == tuple(BASELINE_ESTIMATORS)
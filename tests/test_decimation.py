@@ -0,0 +1,64 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from analytical_functions.decimation import DecimationPyramid, PyramidCache
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    x = np.arange(100_003, dtype=float)
+    return x, np.cumsum(rng.normal(0, 1, x.size))
+
+
+def test_small_series_not_decimated():
+    x = np.arange(10, dtype=float)
+    pyramid = DecimationPyramid(x, x ** 2)
+    np.testing.assert_array_equal(pyramid.view(width=100)[1], x ** 2)
+
+
+def test_view_keeps_envelope(series):
+    x, y = series
+    pyramid = DecimationPyramid(x, y)
+    view_x, view_y = pyramid.view(width=500)
+    assert view_x.size <= 2 * 500 + 4
+    assert np.all(np.diff(view_x) >= 0)
+    assert view_y.min() == y.min() and view_y.max() == y.max()
+
+
+def test_view_zoom(series):
+    x, y = series
+    pyramid = DecimationPyramid(x, y)
+    view_x, view_y = pyramid.view(50_000, 50_300, width=1000)
+    np.testing.assert_array_equal(view_x, x[49_999:50_302])
+    view_x, view_y = pyramid.view(20_000, 60_000, width=300)
+    assert view_x[0] <= 20_000 and view_x[-1] >= 60_000
+    inside = (x >= 20_000) & (x <= 60_000)
+    assert view_y.max() >= y[inside].max() and view_y.min() <= y[inside].min()
+
+
+def test_nan_dropped():
+    pyramid = DecimationPyramid(np.arange(4.0), np.array([1.0, np.nan, 3.0, 4.0]))
+    assert len(pyramid) == 3
+
+
+def test_pyramid_cache():
+    cache = PyramidCache(maxsize=2)
+    calls = []
+
+    def build(key):
+        calls.append(key)
+        return DecimationPyramid(np.arange(3.0), np.arange(3.0))
+
+    for key in ['a', 'b', 'a', 'c', 'b']:
+        cache.get(key, lambda: build(key))
+    assert calls == ['a', 'b', 'c', 'b']
+
+
+def test_plot_updates_on_zoom(couple):
+    fig, ax1, ax2 = couple.plot.show_plots()
+    line = ax1.get_lines()[0]
+    assert line.get_xdata().size == 10
+    ax1.set_xlim(2, 4)
+    assert list(line.get_xdata()) == [1.0, 2.0, 3.0, 4.0, 5.0]
+    plt.close(fig)
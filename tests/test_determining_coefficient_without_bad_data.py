@@ -1,11 +1,48 @@
 import numpy as np
 import pytest
 from analytical_functions.analysis_functions import determining_coefficient_without_bad_data
+from analytical_functions.regression import trimmed_least_squares, least_squares
 import pandas as pd
 
 
+def trimmed_least_squares_reference(x: np.ndarray, y: np.ndarray, percent: float) -> tuple[float, float]:
+    alive = np.ones(x.size, dtype=bool)
+    w0, w1 = np.polynomial.polynomial.polyfit(x, y, 1)
+    for _ in range(int(np.ceil(x.size * percent))):
+        error = (y - w0 - w1 * x) ** 2
+        error[~alive] = -1
+        alive[np.argmax(error)] = False
+        w0, w1 = np.polynomial.polynomial.polyfit(x[alive], y[alive], 1)
+    return w0, w1
+
+
 def test_determining_coefficient_without_bad_data():
-    pass
+    x = np.arange(100, dtype=float)
+    y = 2 + 0.5 * x
+    y[[5, 40, 77]] += [50, -80, 120]
+    data = pd.DataFrame({'Time': x, 'Fy': y})
+    w0, w1 = determining_coefficient_without_bad_data(data, 0.05)
+    assert w0 == pytest.approx(2)
+    assert w1 == pytest.approx(0.5)
+
+
+def test_trimmed_least_squares_without_trimming():
+    rng = np.random.default_rng(1)
+    x = np.arange(50, dtype=float)
+    y = 3 - 0.2 * x + rng.normal(0, 1, 50)
+    np.testing.assert_allclose(trimmed_least_squares(x, y, 0), np.polynomial.polynomial.polyfit(x, y, 1))
+    np.testing.assert_allclose(least_squares(x, y), np.polynomial.polynomial.polyfit(x, y, 1))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_trimmed_least_squares_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    x = np.arange(1000, dtype=float)
+    y = 10 + 0.05 * x + rng.normal(0, 2, 1000)
+    outliers = rng.random(1000) < 0.05
+    y[outliers] += rng.normal(0, 30, outliers.sum())
+    np.testing.assert_allclose(trimmed_least_squares(x, y, 0.22),
+                               trimmed_least_squares_reference(x, y, 0.22), rtol=1e-9)
 
 
 if __name__ == "__main__":
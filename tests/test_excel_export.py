@@ -0,0 +1,37 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from data_class_communication import excel_export
+from data_class_communication.excel_export import write_workbook
+
+
+def test_write_workbook_matches_to_excel(tmp_path, monkeypatch):
+    monkeypatch.setattr(excel_export, 'CHUNK_ROWS', 7)
+    data_frame = pd.DataFrame({'Time': np.arange(20, dtype=float), 'Fy': np.linspace(0, 1, 20)})
+    data_frame.loc[3, 'Fy'] = np.nan
+    path = str(tmp_path / 'book.xlsx')
+    write_workbook(path, {'Data_strength': data_frame, 'Empty': data_frame.iloc[:0]})
+    sheets = pd.read_excel(path, sheet_name=None, index_col=0)
+    assert list(sheets) == ['Data_strength', 'Empty']
+    pd.testing.assert_frame_equal(sheets['Data_strength'], data_frame, check_dtype=False)
+    assert list(sheets['Empty'].columns) == ['Time', 'Fy']
+    assert os.listdir(tmp_path) == ['book.xlsx']
+
+
+def test_write_workbook_row_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(excel_export, 'EXCEL_MAX_ROWS', 10)
+    with pytest.raises(ValueError):
+        write_workbook(str(tmp_path / 'book.xlsx'), {'Data': pd.DataFrame({'a': range(10)})})
+    assert os.listdir(tmp_path) == []
+
+
+def test_couple_save_file_excel(tmp_path, couple):
+    couple.save_file(str(tmp_path), data_base=False, excel=False)
+    path = tmp_path / couple.strength.filename / f'{couple.strength.filename}.xlsx'
+    assert not path.exists()
+
+    assert os.path.samefile(couple.export_excel(str(tmp_path)), path)
+    sheets = pd.read_excel(path, sheet_name=None, index_col=0)
+    assert list(sheets) == ['Data_temperature', 'Data_strength', 'Couple_data']
+    pd.testing.assert_frame_equal(sheets['Data_strength'], couple.strength.data_frame, check_dtype=False)
@@ -0,0 +1,23 @@
+from data_class_communication.experiment_store import ExperimentRecord
+from tkinter_models.experiment_list import COLUMNS, row_values, sort_key
+
+
+def make_record(key: str, feed=None, strength_mean=None) -> ExperimentRecord:
+    fields = {name: None for name, title, width in COLUMNS}
+    fields.update(key=key, material='ХН50', feed=feed, strength_mean=strength_mean)
+    return ExperimentRecord(**fields)
+
+
+def test_row_values():
+    values = row_values(make_record('a', feed=53.0, strength_mean=14.567))
+    assert len(values) == len(COLUMNS)
+    assert values[0] == 'a' and values[1] == 'ХН50'
+    assert '53.00' in values and '14.57' in values
+    assert values[2] == ''
+
+
+def test_sort_key_numeric_with_missing_last():
+    records = [make_record('a', feed=100.0), make_record('b'), make_record('c', feed=20.0),
+               make_record('d', feed=100.0)]
+    assert [record.key for record in sorted(records, key=sort_key('feed'))] == ['c', 'a', 'd', 'b']
+    assert [record.key for record in sorted(records, key=sort_key('key'), reverse=True)] == ['d', 'c', 'b', 'a']
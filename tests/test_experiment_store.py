@@ -0,0 +1,150 @@
+import copy
+import os
+import shelve
+import threading
+import pandas as pd
+import pytest
+from data_class_communication.class_for_communication import Couple
+from data_class_communication.experiment_store import CLEANUP_AGE, ExperimentStore, migrate_shelve
+
+
+def test_store_round_trip(tmp_path, couple):
+    store = ExperimentStore(str(tmp_path))
+    store.add_couple(couple)
+    assert store.keys() == [str(couple)]
+    record = store.record(str(couple))
+    assert record.material == 'ХН50'
+    assert record.w1 == couple.strength.coefficient_mnk[1]
+
+    loaded = Couple.from_store(store, str(couple))
+    pd.testing.assert_frame_equal(loaded.strength.data_frame, couple.strength.data_frame)
+    pd.testing.assert_frame_equal(loaded.temperature.data_frame, couple.temperature.data_frame)
+    assert loaded.temperature.equation_mnk == couple.temperature.equation_mnk
+
+
+def test_store_records_filter(tmp_path, couple):
+    store = ExperimentStore(str(tmp_path))
+    store.add_couple(couple)
+    assert len(store.records(material='ХН50', coating='AlTiN3')) == 1
+    assert store.records(material='ВТ41') == []
+    assert len(store.records(material='', stage=None)) == 1
+    with pytest.raises(KeyError):
+        store.records(color='red')
+
+
+def test_store_replace_and_remove(tmp_path, couple):
+    store = ExperimentStore(str(tmp_path))
+    store.add_couple(couple)
+    store.add_couple(couple)
+    assert len(store) == 1
+    assert len(os.listdir(store.series_path)) == 1
+    store.remove(str(couple))
+    assert str(couple) not in store
+    assert os.listdir(store.series_path) == []
+
+
+def test_migrate_shelve(tmp_path, couple):
+    shelve_path = str(tmp_path / 'shelve_db')
+    with shelve.open(shelve_path) as db:
+        db[str(couple)] = couple
+    store = ExperimentStore(str(tmp_path))
+    assert store.created
+    assert migrate_shelve(shelve_path, store) == 1
+    assert store.keys() == [str(couple)]
+    assert migrate_shelve(str(tmp_path / 'missing'), store) == 0
+    # Перенос уже выполнен, повторный запуск ничего не добавляет
+    assert migrate_shelve(shelve_path, store) == 0
+
+
+def test_migrate_legacy_shelve(tmp_path, couple):
+    # Объекты Strength, сохраненные до выбора способа оценки нуля, не содержат атрибута estimator
+    strength = copy.copy(couple.strength)
+    del strength.__dict__['estimator']
+    legacy = copy.copy(couple)
+    legacy.strength = strength
+    shelve_path = str(tmp_path / 'shelve_db')
+    with shelve.open(shelve_path) as db:
+        db['legacy'] = legacy
+    # Каталог уже создан прерванным запуском, но отметки о переносе нет
+    ExperimentStore(str(tmp_path))
+    store = ExperimentStore(str(tmp_path))
+    assert not store.created
+    assert migrate_shelve(shelve_path, store) == 1
+    assert store.record('legacy').baseline_estimator == 'median'
+    assert migrate_shelve(shelve_path, store) == 0
+
+
+def test_store_batch_commit_and_rollback(tmp_path, couple):
+    store = ExperimentStore(str(tmp_path))
+    with store.batch():
+        store.add('a', couple.catalog_row(), couple.series())
+        store.add('b', couple.catalog_row(), couple.series())
+        assert store.keys() == ['a', 'b']
+    assert store.keys() == ['a', 'b']
+
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            store.add('a', {**couple.catalog_row(), 'material': 'ВТ41'}, couple.series())
+            store.remove('b')
+            store.add('c', couple.catalog_row(), couple.series())
+            raise RuntimeError('crash')
+    assert store.keys() == ['a', 'b']
+    assert store.record('a').material == 'ХН50'
+    assert len(os.listdir(store.series_path)) == 2
+    pd.testing.assert_frame_equal(store.load_frame('b', 'strength'), couple.strength.data_frame)
+
+
+def test_store_update_keeps_series(tmp_path, couple):
+    store = ExperimentStore(str(tmp_path))
+    store.add_couple(couple)
+    series = os.listdir(store.series_path)
+    store.update(str(couple), coating='TiN', plot_labels='{"title": "new"}')
+    assert store.record(str(couple)).coating == 'TiN'
+    assert os.listdir(store.series_path) == series
+    assert Couple.from_store(store, str(couple)).plot.title == 'new'
+    with pytest.raises(KeyError):
+        store.update('missing', coating='TiN')
+    with pytest.raises(KeyError):
+        store.update(str(couple), series_dir='other')
+
+
+def test_store_cleanup(tmp_path, couple):
+    store = ExperimentStore(str(tmp_path))
+    store.add_couple(couple)
+    interrupted = os.path.join(store.series_path, '.tmp-interrupted')
+    os.makedirs(os.path.join(interrupted, 'strength'))
+    # Недавнюю папку может записывать другой процесс
+    assert store.cleanup() == 0
+    old = os.path.getmtime(interrupted) - CLEANUP_AGE - 1
+    os.utime(interrupted, (old, old))
+    assert store.cleanup() == 1
+    assert not os.path.exists(interrupted)
+    assert len(store.load_frame(str(couple), 'strength')) == len(couple.strength.data_frame)
+
+
+def test_store_batch_is_per_thread(tmp_path, couple):
+    store = ExperimentStore(str(tmp_path))
+    seen = {}
+
+    def read():
+        seen['transaction'] = store.transaction
+        seen['keys'] = store.keys()
+
+    with store.batch():
+        store.add('a', couple.catalog_row(), couple.series())
+        # Другой поток не использует транзакцию этого потока и не видит незафиксированных изменений
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join()
+    assert seen == {'transaction': None, 'keys': []}
+    assert store.keys() == ['a']
+
+    # Запись другого потока ждет окончания транзакции и не откатывается вместе с ней
+    thread = threading.Thread(target=store.add, args=('b', couple.catalog_row(), couple.series()))
+    with pytest.raises(RuntimeError):
+        with store.batch():
+            store.remove('a')
+            thread.start()
+            raise RuntimeError('crash')
+    thread.join()
+    assert store.keys() == ['a', 'b']
@@ -0,0 +1,189 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+import pandas as pd
+import pytest
+from data_class_communication import export_queue
+from data_class_communication.batch_import import find_import_tasks, run_import
+from data_class_communication.experiment_store import ExperimentStore, connect_sqlite
+from data_class_communication.manifest import read_manifest
+from data_class_communication.export_queue import ExportQueue, register_exporter, DONE, FAILED, PENDING, RUNNING
+
+
+@pytest.fixture
+def restore_exporters():
+    exporters = dict(export_queue.EXPORTERS)
+    yield
+    export_queue.EXPORTERS.clear()
+    export_queue.EXPORTERS.update(exporters)
+
+
+def test_export_from_store(tmp_path, couple):
+    store = ExperimentStore(str(tmp_path / 'data_base'))
+    store.add_couple(couple)
+    queue = ExportQueue(store, str(tmp_path))
+    queue.enqueue(str(couple))
+    assert queue.counts() == {PENDING: 2}
+    queue.run_pending()
+    assert [job['status'] for job in queue.status(str(couple))] == [DONE, DONE]
+
+    folder = tmp_path / str(couple)
+    assert sorted(os.listdir(folder)) == sorted(f'{couple}{suffix}' for suffix in (
+        '_manifest.json', '_силы.csv', '_силы.series', '_temperature.csv', '_temperature.series', '.xlsx'))
+    sheets = pd.read_excel(folder / f'{couple}.xlsx', sheet_name=None, index_col=0)
+    pd.testing.assert_frame_equal(sheets['Data_strength'], couple.strength.data_frame, check_dtype=False)
+
+
+def test_retry_and_failure(tmp_path, couple, restore_exporters):
+    calls = []
+
+    def flaky(couple_, main_path):
+        calls.append(str(couple_))
+        if len(calls) < 2:
+            raise OSError('disk busy')
+
+    register_exporter('flaky', flaky)
+    register_exporter('broken', lambda couple_, main_path: 1 / 0)
+    store = ExperimentStore(str(tmp_path / 'data_base'))
+    store.add_couple(couple)
+    queue = ExportQueue(store, str(tmp_path), max_attempts=3, retry_delay=0)
+    queue.enqueue_all(['flaky', 'broken'])
+    queue.run_pending()
+
+    jobs = {job['format']: job for job in queue.status()}
+    assert jobs['flaky']['status'] == DONE and jobs['flaky']['attempts'] == 2
+    assert jobs['broken']['status'] == FAILED and jobs['broken']['attempts'] == 3
+    assert jobs['broken']['error'].startswith('ZeroDivisionError')
+    with pytest.raises(KeyError):
+        queue.enqueue(str(couple), ['pdf'])
+
+
+def test_interrupted_jobs_are_resumed(tmp_path, couple):
+    store = ExperimentStore(str(tmp_path / 'data_base'))
+    store.add_couple(couple)
+    queue = ExportQueue(store, str(tmp_path))
+    queue.enqueue(str(couple), ['files'])
+    with connect_sqlite(queue.path) as conn:
+        conn.execute('UPDATE exports SET status = ?', (RUNNING,))
+    assert ExportQueue(store, str(tmp_path)).counts() == {PENDING: 1}
+
+
+def test_running_jobs_of_live_owner_are_kept(tmp_path, couple, restore_exporters):
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow(couple_, main_path):
+        started.set()
+        release.wait(5)
+
+    register_exporter('slow', slow)
+    store = ExperimentStore(str(tmp_path / 'data_base'))
+    store.add_couple(couple)
+    queue = ExportQueue(store, str(tmp_path), stale_after=0.3)
+    queue.enqueue(str(couple), ['slow'])
+    thread = threading.Thread(target=queue.run_next)
+    thread.start()
+    started.wait(5)
+    # Владелец отмечает задание, поэтому другой процесс не возвращает его в очередь и не выполняет повторно
+    time.sleep(0.6)
+    other = ExportQueue(store, str(tmp_path), stale_after=0.3)
+    assert other.counts() == {RUNNING: 1}
+    assert not other.run_next()
+    release.set()
+    thread.join()
+    assert queue.counts() == {DONE: 1}
+
+    # Задание процесса, который перестал отмечать его, выполняется заново
+    queue.enqueue(str(couple), ['slow'])
+    with connect_sqlite(queue.path) as conn:
+        conn.execute('UPDATE exports SET status = ?, owner = ?, updated = ?', (RUNNING, 'host:1:dead', time.time() - 1))
+    assert ExportQueue(store, str(tmp_path), stale_after=0.3).counts() == {PENDING: 1}
+
+
+def test_background_thread(tmp_path, couple):
+    store = ExperimentStore(str(tmp_path / 'data_base'))
+    store.add_couple(couple)
+    queue = ExportQueue(store, str(tmp_path))
+    queue.start()
+    queue.enqueue(str(couple), ['files'])
+    for _ in range(100):
+        if queue.counts() == {DONE: 1}:
+            break
+        queue.stopped.wait(0.05)
+    queue.stop(timeout=5)
+    assert queue.counts() == {DONE: 1}
+
+
+def test_run_import_with_export_queue(tmp_path, raw_campaign):
+    tasks = [task for task in find_import_tasks(str(raw_campaign)) if 'nACo3' in task.path_strength]
+    direct, deferred = tmp_path / 'direct', tmp_path / 'deferred'
+    direct.mkdir()
+    deferred.mkdir()
+    run_import(tasks, str(direct), jobs=1)
+
+    store = ExperimentStore(str(deferred / 'data_base'))
+    queue = ExportQueue(store, str(deferred))
+    results = run_import(tasks, str(deferred), jobs=1, exports=queue)
+    key = results[0].key
+    assert key in store and os.listdir(deferred / key) == []
+    queue.run_pending()
+    assert sorted(os.listdir(deferred / key)) == sorted(os.listdir(direct / key))
+    # Уникальные идентификаторы создаются заново при каждой обработке
+    ids = ('unique_id', 'temperature_unique_id')
+    expected = {name: value for name, value in read_manifest(str(direct / key)).items() if name not in ids}
+    assert {name: value for name, value in read_manifest(str(deferred / key)).items() if name not in ids} == expected
+
+
+def test_claim_is_atomic(tmp_path, couple, monkeypatch, restore_exporters):
+    # Второй процесс забирает задание между SELECT и UPDATE первого: первый не должен выполнить его повторно
+    calls = []
+    register_exporter('count', lambda couple_, main_path: calls.append(str(couple_)))
+    store = ExperimentStore(str(tmp_path / 'data_base'))
+    store.add_couple(couple)
+    first = ExportQueue(store, str(tmp_path))
+    second = ExportQueue(store, str(tmp_path))
+    first.enqueue(str(couple), ['count'])
+
+    class Rows:
+        def __init__(self, rows):
+            self.rows = rows
+
+        def fetchone(self):
+            return self.rows[0] if self.rows else None
+
+    class Interleaved:
+        def __init__(self, conn):
+            self.conn = conn
+
+        def execute(self, query, *args):
+            cursor = self.conn.execute(query, *args)
+            if query.startswith('SELECT key, format') and not interleaved:
+                interleaved.append(True)
+                rows = cursor.fetchall()
+                assert second.run_next()
+                return Rows(rows)
+            return cursor
+
+    interleaved = []
+    original = export_queue.connect_sqlite
+
+    @contextmanager
+    def connect(path):
+        with original(path) as conn:
+            yield Interleaved(conn) if not interleaved else conn
+
+    monkeypatch.setattr(export_queue, 'connect_sqlite', connect)
+    assert not first.run_next()
+    assert calls == [str(couple)]
+    assert [job['status'] for job in first.status()] == [DONE]
+
+
+def test_counts_do_not_wait_for_lock(tmp_path, couple):
+    store = ExperimentStore(str(tmp_path / 'data_base'))
+    queue = ExportQueue(store, str(tmp_path))
+    queue.enqueue(str(couple))
+    with connect_sqlite(queue.path) as conn:
+        conn.execute('BEGIN EXCLUSIVE')
+        assert queue.counts(timeout=0.01) is None
+    assert queue.counts(timeout=0.01) == {PENDING: 2}
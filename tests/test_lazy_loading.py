@@ -0,0 +1,35 @@
+import os
+import pandas as pd
+from data_class_communication.class_for_communication import Couple
+from data_class_communication.experiment_store import ExperimentStore
+
+
+def test_from_dir_lazy(tmp_path, couple):
+    couple.save_file(str(tmp_path))
+    path_dir = os.path.join(tmp_path, str(couple))
+    lazy = Couple.from_dir(path_dir, lazy=True)
+    assert 'data_frame' not in vars(lazy.strength)
+    assert 'data_frame' not in vars(lazy.temperature)
+    assert 'couple_data' not in vars(lazy)
+    assert lazy.strength.coefficient_mnk == couple.strength.coefficient_mnk
+
+    pd.testing.assert_frame_equal(lazy.couple_data, Couple.from_dir(path_dir).couple_data)
+    assert 'data_frame' in vars(lazy.strength)
+    assert lazy.plot.title == 'ХН50, AlTiN3'
+
+
+def test_from_main_path(tmp_path, couple):
+    name = str(couple)
+    couple.save_file(str(tmp_path))
+    couple.save_file(str(tmp_path))
+    list_couple = Couple.from_main_path(str(tmp_path))
+    assert [str(elem) for elem in list_couple] == [name, f'{name}_1']
+    pd.testing.assert_frame_equal(list_couple[1].strength.data_frame, couple.strength.data_frame)
+
+
+def test_from_store_lazy(tmp_path, couple):
+    store = ExperimentStore(str(tmp_path))
+    store.add_couple(couple)
+    lazy = Couple.from_store(store, str(couple), lazy=True)
+    assert 'data_frame' not in vars(lazy.temperature)
+    pd.testing.assert_frame_equal(lazy.temperature.data_frame, couple.temperature.data_frame)
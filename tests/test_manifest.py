@@ -0,0 +1,107 @@
+import json
+import os
+import shutil
+import numpy as np
+import pytest
+from data_class_communication.class_for_communication import Couple
+from data_class_communication.manifest import (CATALOG_NAME, MANIFEST_VERSION, manifest_path, read_catalog,
+                                               read_experiment_metadata, read_info_txt, read_manifest,
+                                               rebuild_catalog, update_catalog, write_manifest)
+
+LEGACY_DIR = os.path.join(os.path.dirname(__file__), '..', 'files', 'Фреза 12;ВТ18У;nACo3;200.0;2000.0;4 этап')
+
+
+def test_manifest_round_trip(tmp_path, couple):
+    couple.plot_labels = {'title': 'Сила', 'xlabel': 'Время, с'}
+    couple.save_file(str(tmp_path), data_base=False, filename=str(couple), excel=False)
+    path_dir = str(tmp_path / str(couple))
+
+    manifest = read_manifest(path_dir)
+    assert manifest == couple.manifest()
+    assert manifest['passes'] == 2 and manifest['w1_t'] == 12.04
+    assert manifest['start_day'] == '2023.06.15-13:14:28'
+    assert manifest['plot_labels'] == {'title': 'Сила', 'xlabel': 'Время, с'}
+
+    loaded = Couple.from_dir(path_dir)
+    assert loaded.manifest() == manifest
+    assert np.allclose(loaded.strength.data_frame['Fy'], couple.strength.data_frame['Fy'])
+
+
+def test_manifest_types(tmp_path):
+    path_dir = tmp_path / 'exp'
+    path_dir.mkdir()
+    written = write_manifest(str(path_dir), {'feed': np.float64(53), 'passes': np.int64(2), 'extra': 1})
+    assert written == {'feed': 53.0, 'passes': 2}
+    with open(manifest_path(str(path_dir)), encoding='utf-8') as file:
+        assert json.load(file) == {'schema_version': MANIFEST_VERSION, 'feed': 53.0, 'passes': 2}
+
+    write_manifest(str(path_dir), {'coating': 'AlTiN'}, update=True)
+    assert read_manifest(str(path_dir)) == {'feed': 53.0, 'passes': 2, 'coating': 'AlTiN'}
+
+
+def test_manifest_newer_schema(tmp_path):
+    path_dir = tmp_path / 'exp'
+    path_dir.mkdir()
+    with open(manifest_path(str(path_dir)), 'w', encoding='utf-8') as file:
+        json.dump({'schema_version': MANIFEST_VERSION + 1}, file)
+    with pytest.raises(ValueError):
+        read_manifest(str(path_dir))
+
+
+def test_read_legacy_info():
+    info = read_info_txt(os.path.join(LEGACY_DIR, f'{os.path.basename(LEGACY_DIR)}_info.txt'))
+    assert info['material'] == 'ВТ18У'
+    assert info['stage'] == '4 этап'
+    assert isinstance(info['feed'], float) and isinstance(info['passes'], int)
+    # Время после первого ':' не обрезается
+    assert info['start_day'].count(':') == 2
+    assert read_experiment_metadata(LEGACY_DIR) == info
+
+
+def test_catalog(tmp_path, couple):
+    main_path = str(tmp_path)
+    assert read_catalog(main_path) is None
+    shutil.copytree(LEGACY_DIR, tmp_path / os.path.basename(LEGACY_DIR))
+    couple.save_file(main_path, data_base=False, filename=str(couple), excel=False)
+
+    catalog = rebuild_catalog(main_path)
+    assert sorted(catalog) == sorted([str(couple), os.path.basename(LEGACY_DIR)])
+    assert read_catalog(main_path) == catalog
+
+    update_catalog(main_path, {str(couple): {**couple.manifest(), 'stage': '5 этап'}})
+    assert read_catalog(main_path)[str(couple)]['stage'] == '5 этап'
+
+    # Удаленная папка не возвращается из каталога
+    shutil.rmtree(tmp_path / os.path.basename(LEGACY_DIR))
+    assert list(read_catalog(main_path)) == [str(couple)]
+
+
+def test_from_main_path_catalog(tmp_path, couple):
+    main_path = str(tmp_path)
+    couple.save_file(main_path, data_base=True, filename=str(couple), excel=False)
+    assert os.path.exists(tmp_path / CATALOG_NAME)
+
+    couples = Couple.from_main_path(main_path)
+    assert [str(item) for item in couples] == [str(couple)]
+    assert couples[0].strength.strength_mean == couple.strength.strength_mean
+    assert np.allclose(couples[0].temperature.data_frame['Temperature'], couple.temperature.data_frame['Temperature'])
+
+
+def test_catalog_keeps_legacy_dirs(tmp_path, couple):
+    main_path = str(tmp_path)
+    legacy = [name for name in sorted(os.listdir(os.path.join(LEGACY_DIR, '..')))
+              if os.path.isdir(os.path.join(LEGACY_DIR, '..', name)) and name != 'data_base'][:3]
+    for name in legacy:
+        shutil.copytree(os.path.join(LEGACY_DIR, '..', name), tmp_path / name)
+    # Первый импорт в основную папку без каталога: прежние папки попадают в каталог вместе с новой
+    couple.save_file(main_path, data_base=True, filename=str(couple), excel=False)
+    assert sorted(read_catalog(main_path)) == sorted(legacy + [str(couple)])
+    assert sorted(str(item) for item in Couple.from_main_path(main_path)) == sorted(legacy + [str(couple)])
+
+    # Папка, скопированная после создания каталога, добавляется при чтении
+    shutil.copytree(LEGACY_DIR, tmp_path / 'copied')
+    os.rename(tmp_path / 'copied' / f'{os.path.basename(LEGACY_DIR)}_info.txt',
+              tmp_path / 'copied' / 'copied_info.txt')
+    assert 'copied' in read_catalog(main_path)
+    with open(tmp_path / CATALOG_NAME, encoding='utf-8') as file:
+        assert 'copied' in json.load(file)['experiments']
@@ -0,0 +1,62 @@
+import pytest
+from data_class_communication.experiment_store import ExperimentRecord, ExperimentStore
+from data_class_communication.metadata_index import MetadataIndex, coating_components
+
+
+def make_record(key: str, material: str, coating: str, stage: str, feed: float, start_day: str,
+                strength_mean: float = None) -> ExperimentRecord:
+    return ExperimentRecord(key=key, material=material, coating=coating, stage=stage, feed=feed,
+                            spindle_speed=800.0, start_day=start_day, strength_mean=strength_mean,
+                            temperature_mean=None)
+
+
+@pytest.fixture
+def index():
+    return MetadataIndex([
+        make_record('a', 'ХН50', 'AlTiN', '4 этап', 53.0, '2023.06.15-13:14:28', 20.0),
+        make_record('b', 'ХН50', 'AlTiN + TiN', '4 этап', 80.0, '2023.07.01-10:00:00', 35.0),
+        make_record('c', 'ВТ18У', 'nACo3', '3 этап', 53.0, '2022.12.01-09:00:00'),
+    ])
+
+
+def test_coating_components():
+    assert coating_components('AlTiN + TiN') == {'AlTiN', 'TiN'}
+    assert coating_components(None) == set()
+
+
+def test_category_filters(index):
+    assert index.keys() == ['a', 'b', 'c']
+    assert index.keys(material='ХН50') == ['a', 'b']
+    assert index.keys(coating='AlTiN') == ['a', 'b']
+    assert index.keys(coating='TiN+AlTiN') == ['b']
+    assert index.keys(material='ХН50', stage='3 этап') == []
+    assert index.keys(material='', coating=None) == ['a', 'b', 'c']
+    assert index.values('coating') == ['AlTiN', 'TiN', 'nACo3']
+    with pytest.raises(KeyError):
+        index.keys(color='red')
+
+
+def test_range_filters(index):
+    assert index.keys(feed=(53.0, 53.0)) == ['a', 'c']
+    assert index.keys(feed=(60.0, None)) == ['b']
+    assert index.keys(start_day=('2023.01.01', None)) == ['a', 'b']
+    assert index.keys(strength_mean=(None, 30.0)) == ['a']
+    assert index.keys(material='ХН50', feed=(None, 60.0)) == ['a']
+
+
+def test_add_replace_remove(index):
+    index.add(make_record('a', 'ВТ41', 'TiN', '4 этап', 100.0, '2024.01.01-00:00:00'))
+    assert index.keys(material='ХН50') == ['b']
+    assert index.keys(coating='TiN') == ['a', 'b']
+    assert index.keys(feed=(90.0, None)) == ['a']
+    index.remove('b')
+    assert 'b' not in index and len(index) == 2
+    assert index.keys(coating='TiN') == ['a']
+    assert 'AlTiN' not in index.values('coating')
+
+
+def test_index_from_store(tmp_path, couple):
+    store = ExperimentStore(str(tmp_path))
+    store.add_couple(couple)
+    index = MetadataIndex(store.records())
+    assert [record.key for record in index.query(coating='AlTiN3', feed=(50, 60))] == [str(couple)]
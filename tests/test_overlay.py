@@ -0,0 +1,63 @@
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from analytical_functions.overlay import resample_to_grid, AlignedGrid
+from data_class_communication.class_for_communication import ComparisonPlot
+
+
+def test_resample_to_grid_matches_per_cell_mean():
+    rng = np.random.default_rng(0)
+    time = np.sort(rng.uniform(0, 20, 500))
+    values = rng.normal(size=500)
+    grid = resample_to_grid(time, values)
+    cells = np.ceil(time).astype(int)
+    for cell in range(grid.size):
+        expected = values[cells == cell]
+        if expected.size:
+            assert np.isclose(grid[cell], expected.mean())
+        else:
+            assert np.isnan(grid[cell])
+
+
+def test_resample_to_grid_gaps_are_nan():
+    grid = resample_to_grid(np.array([0.5, 0.7, 3.0]), np.array([1.0, 3.0, 5.0]))
+    np.testing.assert_array_equal(grid, [np.nan, 2.0, np.nan, 5.0])
+    assert resample_to_grid(np.empty(0), np.empty(0)).size == 0
+
+
+def test_aligned_grid_caches_and_pads():
+    grid = AlignedGrid()
+    grid.add('a', 'Fy', np.arange(5, dtype=float), np.ones(5))
+    cached = grid.rows['a']['Fy']
+    grid.add('a', 'Fy', np.arange(50, dtype=float), np.zeros(50))
+    assert grid.rows['a']['Fy'] is cached
+    grid.add('b', 'Fy', np.arange(3, dtype=float), np.full(3, 2.0))
+
+    grid_time, matrix = grid.matrix('Fy')
+    np.testing.assert_array_equal(grid_time, np.arange(5))
+    assert matrix.shape == (2, 5)
+    assert np.isnan(matrix[1, 3:]).all()
+    np.testing.assert_array_equal(matrix[1, :3], 2.0)
+
+    grid.remove('a')
+    assert 'a' not in grid and grid.keys() == ['b']
+
+
+def test_comparison_plot(couple):
+    comparison = ComparisonPlot()
+    comparison.add(couple)
+    comparison.add(couple, 'second')
+    comparison.add(couple, 'second')
+    assert list(comparison.couples) == [str(couple), 'second']
+
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    fig, ax1, ax2 = comparison.show_plots(figure)
+    assert fig is figure
+    # Ряд и прямая регрессии на каждый эксперимент
+    assert len(ax1.lines) == 4 and len(ax2.lines) == 4
+    np.testing.assert_array_equal(ax1.lines[0].get_ydata()[1:], couple.strength.data_frame['Fy'][1:])
+
+    comparison.remove('second')
+    fig, ax1, ax2 = comparison.show_plots(figure)
+    assert len(ax1.lines) == 2 and len(figure.axes) == 2
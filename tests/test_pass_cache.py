@@ -0,0 +1,52 @@
+import os
+import numpy as np
+import pandas as pd
+from data_class_communication.batch_import import find_import_tasks, run_import
+from data_class_communication.experiment_store import ExperimentStore
+from data_class_communication.manifest import CATALOG_NAME, read_catalog
+from data_class_communication.pass_cache import PassCache
+from conftest import write_raw_pass
+
+
+def test_pass_cache_load(tmp_path):
+    source = tmp_path / 'pass.csv'
+    source.write_text('1;2\n')
+    cache = PassCache(str(tmp_path / 'cache'))
+    calls = []
+
+    def loader(path, scale):
+        calls.append(path)
+        return pd.DataFrame({'Time': np.arange(3.0) * scale, 'Fy': np.ones(3)})
+
+    first = cache.load(str(source), 'test', loader, 2)
+    second = cache.load(str(source), 'test', loader, 2)
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+    source.write_text('1;3\n')
+    cache.load(str(source), 'test', loader, 2)
+    assert len(calls) == 2
+
+
+def test_reimport_skips_unchanged(tmp_path, raw_campaign):
+    main_path = tmp_path / 'main'
+    main_path.mkdir()
+    tasks = [task for task in find_import_tasks(str(raw_campaign)) if 'nACo3' in task.path_strength]
+
+    first = run_import(tasks, str(main_path), jobs=1)
+    assert first[0].ok and not first[0].skipped
+    key = first[0].key
+
+    second = run_import(tasks, str(main_path), jobs=1)
+    assert second[0].skipped
+    assert second[0].key == key
+
+    write_raw_pass(tasks[0].path_strength, tasks[0].path_temperature, 'pass_3', seed=99)
+    third = run_import(tasks, str(main_path), jobs=1)
+    assert third[0].ok and not third[0].skipped
+
+    store = ExperimentStore(str(main_path / 'data_base'))
+    assert store.keys() == [key]
+    assert store.record(key).passes == 4
+    assert sorted(os.listdir(main_path)) == sorted(['data_base', CATALOG_NAME, key])
+    assert read_catalog(str(main_path))[key]['passes'] == 4
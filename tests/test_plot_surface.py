@@ -0,0 +1,51 @@
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from analytical_functions.decimation import DecimationPyramid
+from data_class_communication.plot_surface import PlotSurface
+
+
+def make_surface() -> PlotSurface:
+    surface = PlotSurface(Figure())
+    FigureCanvasAgg(surface.figure)
+    return surface
+
+
+def test_show_reuses_axes_and_blits():
+    surface = make_surface()
+    ax1, ax2 = surface.ax1, surface.ax2
+    x = np.arange(100, dtype=float)
+    assert not surface.show('first', DecimationPyramid(x, x), DecimationPyramid(x, 2 * x))
+    # Те же пределы осей - обновляются только линии
+    assert surface.show('second', DecimationPyramid(x, x[::-1]), DecimationPyramid(x, 2 * x[::-1]))
+    assert surface.ax1 is ax1 and surface.ax2 is ax2
+    assert surface.title.get_text() == 'second'
+    np.testing.assert_array_equal(surface.line_strength.get_ydata(), x[::-1])
+
+    assert not surface.show('third', DecimationPyramid(x, 3 * x))
+    assert surface.ax1.get_ylim()[1] > 250
+    assert len(surface.line_temperature.get_xdata()) == 0
+
+
+def test_limits_cover_full_series():
+    surface = make_surface()
+    x = np.arange(100_000, dtype=float)
+    y = np.sin(x / 1000)
+    surface.show('sin', DecimationPyramid(x, y))
+    x_min, x_max = surface.ax1.get_xlim()
+    assert x_min < 0 and x_max > x[-1]
+
+
+def test_limits_reset_after_zoom():
+    surface = make_surface()
+    x = np.arange(100, dtype=float)
+    surface.show('first', DecimationPyramid(x, x))
+    # Масштабирование панелью инструментов задает пределы явно и отключает автомасштаб
+    surface.ax1.set_xlim(10, 20)
+    surface.ax1.set_ylim(10, 20)
+    assert not surface.ax1.get_autoscalex_on()
+    x = np.arange(1000, dtype=float)
+    surface.show('second', DecimationPyramid(x, 5 * x))
+    x_min, x_max = surface.ax1.get_xlim()
+    assert x_min < 0 and x_max > x[-1]
+    assert surface.ax1.get_ylim()[1] > 5 * x[-1]
@@ -1,6 +1,7 @@
 import numpy as np
 import pytest
 from analytical_functions.analysis_functions import processing_time
+from analytical_functions.time_processing import pass_bounds, adding_time_in_temperature
 
 
 def test_processing_time_main_case():
@@ -23,6 +24,25 @@ def test_processing_time_mixed_time():
         processing_time(start_time)
 
 
+def test_processing_time_empty():
+    result = processing_time(np.array([]))
+    assert result.size == 0
+
+
+def test_processing_time_pass_bounds():
+    passes = [np.array([1, 3, 6]), np.array([10, 12]), np.array([0, 5])]
+    bounds = pass_bounds(passes)
+    np.testing.assert_array_equal(bounds, [0, 3, 5])
+    # Положительный разрыв на границе файлов (6 -> 10) входит во время обработки, отрицательный (12 -> 0) - нет
+    result = processing_time(np.concatenate(passes))
+    expected = np.array([0, 2, 5, 9, 11, 11, 16])
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_adding_time_in_temperature():
+    np.testing.assert_allclose(adding_time_in_temperature(np.zeros(4), 10.0), [0, 2.5, 5, 7.5])
+    np.testing.assert_allclose(adding_time_in_temperature(np.zeros(3)), [0, 0.28, 0.56])
+
 
 if __name__ == '__main__':
     pytest.main()
@@ -0,0 +1,103 @@
+import json
+import threading
+import tracemalloc
+import pytest
+from data_class_communication import profiling
+from data_class_communication.batch_import import find_import_tasks, run_import
+from data_class_communication.profiling import StageProfiler, profiled_chunks
+
+
+def test_disabled_stage_is_noop():
+    assert profiling.active_profiler() is None
+    with profiling.stage('parse', 'a') as record:
+        record.rows = 10
+    chunks = [[1, 2]]
+    assert profiled_chunks(chunks, 'parse') is chunks
+
+
+def test_nested_stages_and_memory():
+    with profiling.profiling() as profiler:
+        with profiling.stage('outer', 'a') as outer:
+            with profiling.stage('inner', 'a') as inner:
+                block = bytearray(4 * 2 ** 20)
+                inner.rows = len(block)
+            del block
+            outer.rows = 1
+        with profiling.stage('inner', 'a'):
+            pass
+    assert profiling.active_profiler() is None
+    records = {record['stage']: record for record in profiler.report()}
+    assert records['inner']['calls'] == 2 and records['inner']['rows'] == 4 * 2 ** 20
+    # Пик вложенного этапа учитывается и во внешнем
+    assert records['outer']['peak_memory'] >= 4 * 2 ** 20
+    assert records['inner']['peak_memory'] >= 4 * 2 ** 20
+    assert records['outer']['wall'] >= records['inner']['wall'] - records['inner']['wall'] / 2
+
+
+def test_profiled_chunks_and_summary(tmp_path):
+    with profiling.profiling(StageProfiler(track_memory=False)) as profiler:
+        for experiment in ('a', 'b'):
+            assert list(profiled_chunks(iter([[1, 2], [3]]), 'parse', experiment)) == [[1, 2], [3]]
+    assert [(record['experiment'], record['calls'], record['rows']) for record in profiler.report()] == \
+           [('a', 2, 3), ('b', 2, 3)]
+    summary = profiler.summary()
+    assert [(record['stage'], record['experiment'], record['calls'], record['rows']) for record in summary] == \
+           [('parse', 2, 4, 6)]
+    merged = StageProfiler()
+    merged.extend(profiler.report())
+    merged.extend(profiler.report())
+    assert merged.summary()[0]['rows'] == 12
+    assert 'parse' in profiler.format_report() and 'b' in profiler.format_report(by_experiment=True)
+    profiler.save(str(tmp_path / 'profile.json'))
+    with open(tmp_path / 'profile.json', encoding='utf-8') as file:
+        assert json.load(file)['summary'] == summary
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_run_import_profile(tmp_path, raw_campaign, jobs):
+    tasks = find_import_tasks(str(raw_campaign))
+    main_path = tmp_path / 'main'
+    main_path.mkdir()
+    profiler = StageProfiler()
+    results = run_import(tasks, str(main_path), jobs=jobs, excel=False, profiler=profiler)
+    # Во втором эксперименте нет сил выше порога, он завершается ошибкой при разборе проходов
+    assert sum(result.ok for result in results) == 1
+    stages = {record['stage']: record for record in profiler.summary()}
+    # Пакетный импорт читает проходы через кэш
+    for name in ('strength.file_list', 'strength.cache', 'strength.regression', 'temperature.cache',
+                 'couple.merge', 'save.files', 'import.commit'):
+        assert name in stages
+    assert stages['strength.file_list']['calls'] == len(tasks)
+    assert stages['strength.regression']['calls'] == 1
+    assert stages['strength.cache']['rows'] > 0
+
+
+def test_profiling_is_per_thread():
+    # Этапы другого потока (очередь выгрузки, цикл Tk) не попадают в отчет и не нарушают вложенность
+    inside = threading.Event()
+    finished = threading.Event()
+
+    def other_thread():
+        inside.wait()
+        assert profiling.active_profiler() is None
+        with profiling.stage('other', 'b'):
+            pass
+        with profiling.profiling(other) as profiler:
+            with profiling.stage('other', 'b'):
+                finished.wait()
+        assert profiler is other
+
+    other = StageProfiler()
+    thread = threading.Thread(target=other_thread)
+    thread.start()
+    with profiling.profiling() as profiler:
+        with profiling.stage('outer', 'a'):
+            inside.set()
+            with profiling.stage('inner', 'a'):
+                pass
+            finished.set()
+            thread.join()
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+    assert [record['stage'] for record in profiler.report()] == ['inner', 'outer']
+    assert [(record['stage'], record['calls']) for record in other.report()] == [('other', 1)]
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data_class_communication import raw_formats
+from data_class_communication.raw_formats import RawFormat, DelimitedTable, detect_format, register_format, FORMATS
+from data_class_communication.func_init import create_data_frame_strength
+from conftest import write_raw_pass
+
+
+def write_legacy_pass(path: str, samples: int = 500) -> pd.DataFrame:
+    """
+    Проход в старом формате динамометра: шапка 19 строк на русском, кодировка windows-1251.
+    """
+    time = np.arange(samples) * 0.01
+    fy = np.ones(samples)
+    fy[samples // 4:] += 30
+    data = pd.DataFrame({'Время': time, 'Fx': fy, 'Fy': fy, 'Fz': fy})
+    with open(path, 'w', encoding='windows-1251') as file:
+        file.write(''.join(f'Параметр {i}: значение\n' for i in range(19)))
+        data.to_csv(file, sep=';', decimal=',', index=False)
+    return data
+
+
+def test_detect_strength_formats(tmp_path):
+    write_raw_pass(str(tmp_path), str(tmp_path), 'pass', seed=0)
+    (tmp_path / 'old').mkdir()
+    write_legacy_pass(str(tmp_path / 'old' / 'pass.csv'))
+
+    assert detect_format(str(tmp_path / 'pass.csv'), 'strength') == RawFormat('dynamometer', header=2)
+    assert detect_format(str(tmp_path / 'old' / 'pass.csv'), 'strength') == \
+        RawFormat('dynamometer', header=19, encoding='windows-1251')
+    assert detect_format(str(tmp_path / 'pass.txt'), 'temperature') == \
+        RawFormat('thermocouple', header=11, encoding='windows-1251', sep='\t', names=['Time', 'Voltage'],
+                  on_bad_lines='skip')
+
+
+def test_legacy_strength_parsed_once(tmp_path, monkeypatch):
+    write_legacy_pass(str(tmp_path / 'pass.csv'))
+    calls = []
+    read_csv = pd.read_csv
+    monkeypatch.setattr(raw_formats.pd, 'read_csv', lambda *args, **kwargs: calls.append(kwargs) or
+                        read_csv(*args, **kwargs))
+    data_frame = create_data_frame_strength(str(tmp_path / 'pass.csv'), 12)
+    assert len(calls) == 1
+    assert list(data_frame.columns) == ['Time', 'Fy']
+    assert data_frame['Fy'].iloc[-1] == pytest.approx(30)
+
+
+def test_unknown_format(tmp_path):
+    (tmp_path / 'pass.csv').write_text('какой-то текст\nбез данных\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        detect_format(str(tmp_path / 'pass.csv'), 'strength')
+
+
+def test_register_format(tmp_path, monkeypatch):
+    monkeypatch.setitem(FORMATS, 'strength', list(FORMATS['strength']))
+    register_format('strength', DelimitedTable('comma', columns=4, separators=(',',)))
+    (tmp_path / 'pass.csv').write_text('Time,Fx,Fy,Fz\n' + ''.join(f'{i},1,2.5,3\n' for i in range(5)))
+    assert detect_format(str(tmp_path / 'pass.csv'), 'strength') == \
+        RawFormat('comma', header=0, sep=',', decimal='.')
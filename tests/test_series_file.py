@@ -0,0 +1,76 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from data_class_communication.class_for_communication import Couple
+from data_class_communication.experiment_store import read_frame
+from data_class_communication.series_file import write_series, open_series
+
+
+def is_mapped(array: np.ndarray) -> bool:
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+def test_write_open_series(tmp_path):
+    data_frame = pd.DataFrame({'Time': np.arange(1000, dtype=float), 'Fy': np.random.default_rng(0).random(1000)})
+    path = str(tmp_path / 'data.series')
+    write_series(path, data_frame)
+    opened = open_series(path)
+    pd.testing.assert_frame_equal(opened, data_frame)
+    # Небольшой ряд читается в память, файл можно сразу заменить или удалить (Windows)
+    assert not is_mapped(opened['Fy'].to_numpy())
+    os.remove(path)
+
+    write_series(path, data_frame)
+    mapped = open_series(path, mmap_min_bytes=0)
+    pd.testing.assert_frame_equal(mapped, data_frame)
+    assert is_mapped(mapped['Fy'].to_numpy())
+
+
+def test_open_series_does_not_modify_file(tmp_path):
+    path = str(tmp_path / 'data.series')
+    write_series(path, pd.DataFrame({'Time': [1.0, 2.0], 'Fy': [3.0, 4.0]}))
+    opened = open_series(path, mmap_min_bytes=0)
+    opened.loc[0, 'Fy'] = 100.0
+    opened['Model'] = opened['Fy'] * 2
+    assert open_series(path)['Fy'].tolist() == [3.0, 4.0]
+
+
+def test_series_float32_and_empty(tmp_path):
+    write_series(str(tmp_path / 'small.series'), pd.DataFrame({'Fy': [0.1, 0.2]}), dtype='float32')
+    assert open_series(str(tmp_path / 'small.series'))['Fy'].dtype == np.float32
+    write_series(str(tmp_path / 'empty.series'), pd.DataFrame({'Time': [], 'Fy': []}))
+    assert list(open_series(str(tmp_path / 'empty.series')).columns) == ['Time', 'Fy']
+
+
+def test_open_series_wrong_file(tmp_path):
+    (tmp_path / 'data.series').write_bytes(b'Time;Fy\n')
+    with pytest.raises(ValueError):
+        open_series(str(tmp_path / 'data.series'))
+
+
+def test_from_dir_uses_series(tmp_path, couple):
+    name = str(couple)
+    couple.save_file(str(tmp_path))
+    path_dir = os.path.join(tmp_path, name)
+    assert os.path.exists(os.path.join(path_dir, f'{name}_силы.series'))
+    loaded = Couple.from_dir(path_dir)
+    pd.testing.assert_frame_equal(loaded.strength.data_frame, couple.strength.data_frame)
+    assert not is_mapped(loaded.temperature.data_frame['Time'].to_numpy())
+
+    # Папки прежних версий без файлов ряда читаются из csv
+    os.remove(os.path.join(path_dir, f'{name}_силы.series'))
+    pd.testing.assert_frame_equal(Couple.from_dir(path_dir).strength.data_frame, couple.strength.data_frame,
+                                  check_index_type=False)
+
+
+def test_read_frame_legacy_layout(tmp_path):
+    legacy = tmp_path / 'strength'
+    legacy.mkdir()
+    np.save(legacy / 'Time.npy', np.arange(3.0))
+    (legacy / 'columns.json').write_text('["Time"]', encoding='utf-8')
+    assert read_frame(str(legacy))['Time'].tolist() == [0.0, 1.0, 2.0]
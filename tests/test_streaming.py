@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+from analytical_functions.streaming import StrengthStream, TemperatureStream, SecondBins
+from analytical_functions.time_processing import processing_time
+from data_class_communication.func_init import read_strength_chunks, create_data_frame_strength, \
+    create_data_strength_from_list
+from conftest import write_raw_pass
+
+
+def strength_reference(list_data_frame: list[pd.DataFrame], min_strength: float) -> pd.DataFrame:
+    data_frame = pd.concat(list_data_frame, ignore_index=True)
+    data_frame = data_frame.loc[data_frame['Fy'] > min_strength].copy()
+    data_frame['Time'] = np.ceil(processing_time(data_frame['Time'].to_numpy()))
+    df = data_frame.groupby(by='Time').mean().dropna().reset_index()
+    df['Fy'] = df['Fy'].round(2)
+    return df
+
+
+def test_second_bins():
+    bins = SecondBins()
+    bins.add(np.array([0.0, 0.5, 1.0]), np.array([1.0, 2.0, 4.0]))
+    bins.add(np.array([3.2]), np.array([5.0]))
+    pd.testing.assert_frame_equal(bins.frame('Fy'), pd.DataFrame({'Time': [0.0, 1.0, 4.0], 'Fy': [1.0, 3.0, 5.0]}))
+
+
+def test_strength_stream_matches_concat():
+    rng = np.random.default_rng(0)
+    passes = []
+    for i in range(3):
+        # Второй проход продолжает время первого: положительный разрыв на границе входит во время обработки
+        time = np.arange(3000) * 0.01 + (40 if i == 1 else 0)
+        fy = rng.normal(1, 0.2, 3000)
+        fy[300:2700] += 20
+        passes.append(pd.DataFrame({'Time': time, 'Fy': fy}))
+    expected = strength_reference(passes, 12)
+    pd.testing.assert_frame_equal(create_data_strength_from_list(passes, 12), expected)
+
+    stream = StrengthStream(12)
+    for data_frame in passes:
+        stream.add_pass(data_frame.iloc[start:start + 450] for start in range(0, len(data_frame), 450))
+    pd.testing.assert_frame_equal(stream.frame(), expected)
+
+
+@pytest.mark.parametrize('chunk_size', [100, 1000, 100000])
+def test_read_strength_chunks(tmp_path, chunk_size):
+    write_raw_pass(str(tmp_path), str(tmp_path), 'pass', seed=3)
+    path = str(tmp_path / 'pass.csv')
+    chunks = list(read_strength_chunks(path, 12, chunk_size))
+    assert all(len(chunk) <= chunk_size for chunk in chunks)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), create_data_frame_strength(path, 12))
+
+
+def test_read_strength_chunks_without_cutting(tmp_path):
+    write_raw_pass(str(tmp_path), str(tmp_path), 'pass', seed=3, cutting=False)
+    with pytest.raises(IndexError):
+        list(read_strength_chunks(str(tmp_path / 'pass.csv'), 12, 100))
+
+
+def test_temperature_stream():
+    voltage = np.array([1.0, 8.0, 9.0, 10.0, 2.0, 11.0])
+    stream = TemperatureStream(6, step=0.5)
+    stream.add_pass([pd.DataFrame({'Voltage': voltage[:3]})])
+    stream.add_pass([pd.DataFrame({'Voltage': voltage[3:]})])
+    pd.testing.assert_frame_equal(stream.frame(), pd.DataFrame({'Time': [0.0, 1.0, 2.0], 'Voltage': [8.0, 9.5, 11.0]}))
@@ -0,0 +1,51 @@
+import threading
+import pytest
+from tkinter_models.worker import BackgroundWorker
+from data_class_communication.batch_import import find_import_tasks, run_import
+
+
+def collect(worker: BackgroundWorker) -> list:
+    events = []
+    worker.poll(lambda kind, payload: events.append((kind, payload)))
+    return events
+
+
+def test_background_worker_events():
+    worker = BackgroundWorker()
+
+    def func(n):
+        for i in range(n):
+            worker.report(i, n)
+        return 'ok'
+
+    worker.submit(func, 3).result()
+    assert collect(worker) == [('progress', (0, 3)), ('progress', (1, 3)), ('progress', (2, 3)), ('done', 'ok')]
+    assert not worker.busy
+    worker.shutdown()
+
+
+def test_background_worker_error():
+    worker = BackgroundWorker()
+    worker.submit(lambda: 1 / 0).result()
+    (kind, payload), = collect(worker)
+    assert kind == 'error'
+    assert isinstance(payload, ZeroDivisionError)
+    worker.shutdown()
+
+
+def test_background_worker_busy():
+    worker = BackgroundWorker()
+    release = threading.Event()
+    worker.submit(release.wait)
+    with pytest.raises(RuntimeError):
+        worker.submit(print)
+    release.set()
+    worker.shutdown()
+
+
+def test_run_import_cancel(tmp_path, raw_campaign):
+    tasks = find_import_tasks(str(raw_campaign))
+    cancel_event = threading.Event()
+    results = run_import(tasks, str(tmp_path), jobs=1, progress=lambda *args: cancel_event.set(),
+                         cancel_event=cancel_event)
+    assert len(results) == 1
@@ -0,0 +1,149 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Optional
+from data_class_communication.experiment_store import ExperimentRecord
+
+# Столбцы списка: поле записи каталога, заголовок, ширина в пикселях
+COLUMNS = (
+    ('key', 'Эксперимент', 260),
+    ('material', 'Материал', 90),
+    ('coating', 'Покрытие', 90),
+    ('stage', 'Этап', 70),
+    ('feed', 'Подача', 60),
+    ('spindle_speed', 'Обороты', 60),
+    ('start_day', 'Дата', 130),
+    ('strength_mean', 'Fср, Н', 60),
+    ('temperature_mean', 'Tср, ℃', 60),
+)
+
+
+def row_values(record: ExperimentRecord) -> tuple[str, ...]:
+    """
+    Текст ячеек строки списка для записи каталога, числа округляются до сотых.
+    """
+    values = []
+    for name, title, width in COLUMNS:
+        value = getattr(record, name, None)
+        values.append('' if value is None else f'{value:.2f}' if isinstance(value, float) else f'{value}')
+    return tuple(values)
+
+
+def sort_key(column: str) -> Callable[[ExperimentRecord], tuple]:
+    """
+    Ключ сортировки записей по столбцу: числа сравниваются как числа, записи с равными значениями - по ключу.
+    По возрастанию пустые значения идут в конце. При сортировке по убыванию (sorted(..., reverse=True))
+    порядок обращается целиком: пустые значения идут в начале, равные значения - в обратном порядке ключей.
+    """
+    def key(record: ExperimentRecord) -> tuple:
+        value = getattr(record, column, None)
+        return (value is None, value if value is not None else 0, record.key)
+    return key
+
+
+class ExperimentList(ttk.Frame):
+    """
+    Список экспериментов на ttk.Treeview с полосой прокрутки.
+    Treeview отображает только видимые строки, поэтому список из тысяч экспериментов не создает виджетов на строку.
+    Строки идентифицируются ключом эксперимента: set_records и upsert добавляют, изменяют и удаляют только
+    отличающиеся строки, не перестраивая список. Щелчок по заголовку сортирует список по столбцу,
+    повторный щелчок меняет направление.
+    """
+
+    def __init__(self,
+                 master: tk.Misc,
+                 on_select: Callable[[ExperimentRecord], None],
+                 on_open: Optional[Callable[[ExperimentRecord], None]] = None,
+                 height: int = 25):
+        """
+        :param master: родительский виджет.
+        :param on_select: функция, вызываемая при выборе строки (щелчок, стрелки) с записью каталога.
+        :param on_open: функция, вызываемая при двойном щелчке по строке.
+        :param height: int - количество видимых строк.
+        """
+        super().__init__(master)
+        self.on_select = on_select
+        self.on_open = on_open
+        self.records: dict[str, ExperimentRecord] = {}
+        self.sort_column: Optional[str] = None
+        self.sort_descending = False
+
+        self.tree = ttk.Treeview(self, columns=[name for name, title, width in COLUMNS], show='headings',
+                                 height=height, selectmode='browse')
+        for name, title, width in COLUMNS:
+            self.tree.heading(name, text=title, command=lambda column=name: self.sort_by(column))
+            self.tree.column(name, width=width, anchor='w' if name == 'key' else 'center',
+                             stretch=name == 'key')
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+        self.tree.grid(row=0, column=0, sticky='nswe')
+        self.scrollbar.grid(row=0, column=1, sticky='ns')
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.tree.bind('<<TreeviewSelect>>', self._selected)
+        self.tree.bind('<Double-1>', self._opened)
+
+    def set_records(self, records: list[ExperimentRecord]) -> None:
+        """
+        Замена содержимого списка: строки, которых нет в records, удаляются, новые добавляются,
+        у оставшихся обновляется текст ячеек, если запись изменилась.
+        """
+        new = {record.key: record for record in records}
+        removed = [key for key in self.records if key not in new]
+        if removed:
+            self.tree.delete(*removed)
+        for key in removed:
+            del self.records[key]
+        for record in records:
+            self.upsert(record, resort=False)
+        self._reorder([record.key for record in records])
+
+    def upsert(self, record: ExperimentRecord, resort: bool = True) -> None:
+        """
+        Добавление строки или обновление строки с тем же ключом.
+        :param resort: bool - поставить строку на место в текущей сортировке.
+        """
+        values = row_values(record)
+        if record.key in self.records:
+            if row_values(self.records[record.key]) != values:
+                self.tree.item(record.key, values=values)
+        else:
+            self.tree.insert('', tk.END, iid=record.key, values=values)
+        self.records[record.key] = record
+        if resort and self.sort_column is not None:
+            self._reorder(list(self.records))
+
+    def remove(self, key: str) -> None:
+        if self.records.pop(key, None) is not None:
+            self.tree.delete(key)
+
+    def sort_by(self, column: str) -> None:
+        """
+        Сортировка по столбцу, повторный вызов для того же столбца меняет направление.
+        """
+        self.sort_descending = not self.sort_descending if column == self.sort_column else False
+        self.sort_column = column
+        for name, title, width in COLUMNS:
+            arrow = (' ▼' if self.sort_descending else ' ▲') if name == column else ''
+            self.tree.heading(name, text=title + arrow)
+        self._reorder(list(self.records))
+
+    def _reorder(self, keys: list[str]) -> None:
+        if self.sort_column is not None:
+            records = sorted((self.records[key] for key in keys), key=sort_key(self.sort_column),
+                             reverse=self.sort_descending)
+            keys = [record.key for record in records]
+        if list(self.tree.get_children()) == keys:
+            return
+        for position, key in enumerate(keys):
+            self.tree.move(key, '', position)
+
+    def _selected(self, event=None) -> None:
+        selection = self.tree.selection()
+        if selection:
+            self.on_select(self.records[selection[0]])
+
+    def _opened(self, event) -> None:
+        key = self.tree.identify_row(event.y)
+        if key and self.on_open is not None:
+            self.on_open(self.records[key])
@@ -2,16 +2,29 @@ import tkinter as tk
 import tkinter.filedialog as fd
 from tkinter import messagebox
 from tkinter import ttk
+import json
 import os
-from data_class_communication.class_for_communication import Temperature, Strength, Couple, Plot
-from analytical_functions.analysis_functions import extract_param_path, list_all_path_strength_temperature
-import shelve
-import matplotlib.pyplot as plt
+from data_class_communication.class_for_communication import Temperature, Strength, Couple, Plot, ComparisonPlot
+from data_class_communication.experiment_store import ExperimentStore, ExperimentRecord, migrate_shelve
+from analytical_functions.analysis_functions import extract_param_path
+from data_class_communication.plot_surface import PlotSurface
+from data_class_communication.metadata_index import MetadataIndex
+from data_class_communication.batch_import import ImportTask, find_import_tasks, run_import, default_cutting_params
+from data_class_communication.export_queue import ExportQueue, DEFAULT_FORMATS, FAILED, PENDING, RUNNING
+from data_class_communication.profiling import REPORT_FIELDS, StageProfiler
+from analytical_functions.baseline import BASELINE_ESTIMATORS, DEFAULT_ESTIMATOR
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import (
     FigureCanvasTkAgg, NavigationToolbar2Tk)
-from tkinter_models.function import enter, leave, open_folder_in_explorer, create_widgets_experiments
+from tkinter_models.function import open_folder_in_explorer
+from tkinter_models.experiment_list import ExperimentList
+from tkinter_models.worker import BackgroundWorker
 from typing import Any
 
+# Период обновления счетчика очереди выгрузки в мс и ожидание блокировки ее базы в секундах
+EXPORT_POLL_INTERVAL = 1000
+EXPORT_POLL_TIMEOUT = 0.05
+
 
 def extract_main_path() -> str:
     """
@@ -61,20 +74,24 @@ def extract_search_path() -> str:
             return extract_search_path()
 
 
-def update_plot_db(path: str, **dict_params: dict[str, Any]):
+def update_plot_db(store: ExperimentStore, keys: list[str] = None, **labels: str) -> None:
     """
-    Функция для обновления атрибутов эксземпляров классов в базу данных.
-    :param path: - путь к базе данных.
-    :param dict_params: dict - словарь с атрибутами эксземпляров классов и их значений.
+    Функция для изменения подписей графиков экспериментов в хранилище.
+    Изменяется только поле plot_labels каталога, временные ряды не перезаписываются,
+    все эксперименты обновляются одной транзакцией.
+    :param store: ExperimentStore - хранилище экспериментов.
+    :param keys: list[str] - ключи экспериментов, по умолчанию все эксперименты.
+    :param labels: новые подписи графика, например title='ХН50', name_y_1='Fy, Н' (см. Plot.LABELS).
     :return: None
     """
-    db = shelve.open(path)
-    for key in db.keys():
-        couple = db[key]
-        for name, items in dict_params.items():
-            couple.plot.name = items
-        db[key] = couple
-    db.close()
+    unknown = set(labels) - set(Plot.LABELS)
+    if unknown:
+        raise KeyError(f'Нет подписей графика: {", ".join(sorted(unknown))}')
+    with store.batch():
+        for record in store.records():
+            if keys is None or record.key in keys:
+                current = json.loads(record.plot_labels) if record.plot_labels else {}
+                store.update(record.key, plot_labels=json.dumps({**current, **labels}, ensure_ascii=False))
 
 
 class App(tk.Tk):
@@ -87,9 +104,35 @@ class App(tk.Tk):
         self.geometry("1400x700")
         self.main_path = extract_main_path()
         self.search_path = extract_search_path()
-        self.list_couple: list[Couple] = None
+        self.store = ExperimentStore(f"{self.main_path}/data_base")
+        # Перенос выполняется до первого успешного завершения (см. migrate_shelve)
+        migrate_shelve(f"{self.main_path}/data_base/shelve_db", self.store)
+        # Остатки записи, прерванной при предыдущем запуске
+        self.store.cleanup()
+        self.list_record: list[ExperimentRecord] = None
+        self.index = MetadataIndex()
         self.canvas_plot = None
-        self.create_widgets(material=None, coating=None, stage=None)
+        self.plot_frame = None
+        self.plot_surface: PlotSurface = None
+        self.toolbar = None
+        self.worker = BackgroundWorker()
+        self.progress_var = tk.DoubleVar(self, value=0)
+        self.status_var = tk.StringVar(self, value='')
+        # Книги эксель при импорте можно не записывать и создать позже (Couple.export_excel)
+        self.excel_var = tk.BooleanVar(self, value=True)
+        # Замер этапов импорта, отчет показывается после завершения импорта
+        self.profile_var = tk.BooleanVar(self, value=False)
+        self.import_profiler: StageProfiler = None
+        # Способ оценки нуля сил для импортируемых экспериментов
+        self.estimator_var = tk.StringVar(self, value=DEFAULT_ESTIMATOR)
+        self.import_errors: list[str] = []
+        # Файлы экспериментов (манифест, csv, xlsx) записываются в фоне после добавления в хранилище
+        self.exports = ExportQueue(self.store, self.main_path)
+        self.exports.start()
+        self.export_var = tk.StringVar(self, value='')
+        self.create_widgets()
+        self.after(100, self.poll_worker)
+        self.after(EXPORT_POLL_INTERVAL, self.poll_exports)
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
         self.grid_columnconfigure(2, weight=1)
@@ -100,96 +143,116 @@ class App(tk.Tk):
     def update_data_base(self) -> None:
         """
         Функция для обновления отображения базы данных в приложении.
+        Виджеты не пересоздаются: обновляются значения фильтров и строки списка экспериментов.
         :return: None
         """
-        self.list_couple = self.extract_data_base()
-        material = None
-        coating = None
-        stage = None
-        if self.combobox_material:
-            material = self.combobox_material.get()
-            coating = self.combobox_coating.get()
-            stage = self.combobox_stage.get()
-        for widget in self.winfo_children():
-            widget.destroy()
-        self.create_widgets(material, coating, stage)
-        self.canvas.update_idletasks()
-        self.canvas.config(scrollregion=self.canvas.bbox("all"))
+        self.list_record = self.extract_data_base()
+        self.update_filter_values()
+        self.apply_filter()
+
+    def update_filter_values(self) -> None:
+        for combobox, name in ((self.combobox_material, 'material'), (self.combobox_coating, 'coating'),
+                               (self.combobox_stage, 'stage')):
+            combobox['values'] = [''] + self.index.values(name)
 
     def extract_data_base(self):
         """
         Функция для извлечения данных из базы данных.
-        :return: list[Couple] - список экземпляров класса Couple.
+        Читаются только метаданные из каталога, временные ряды загружаются при построении графика.
+        По записям строится индекс метаданных для фильтров.
+        :return: list[ExperimentRecord] - список записей каталога.
         """
-        db = shelve.open(f"{self.main_path}/data_base/shelve_db")
-        self.list_couple: list[Couple] = [db[key] for key in db.keys()]
-        db.close()
-        return self.list_couple
+        self.list_record = self.store.records()
+        self.index = MetadataIndex(self.list_record)
+        return self.list_record
 
-    def plot_show(self, couple: Couple) -> None:
+    def filters(self) -> dict[str, str]:
         """
-        Функция для отображения графиков.
-        :param couple: принимает экземпляр класса Couple.
-        :return: None
+        Значения фильтров материала, покрытия и этапа.
         """
-        fig, ax1, ax2 = couple.plot.show_plots()
-        if self.canvas_plot:
-            self.canvas_plot.get_tk_widget().destroy()
-        self.canvas_plot = FigureCanvasTkAgg(fig, master=self)
-        self.canvas_plot.get_tk_widget().grid(row=0, column=2, padx=8, pady=8)
-        self.canvas_plot.draw()
-        plt.close()
+        return dict(material=self.combobox_material.get(), coating=self.combobox_coating.get(),
+                    stage=self.combobox_stage.get())
 
-    def clear_plot(self):
-        if self.canvas_plot:
-            self.canvas_plot.get_tk_widget().destroy()
+    def apply_filter(self, event=None) -> None:
+        """
+        Обновление строк списка экспериментов по индексу метаданных без повторного чтения каталога.
+        """
+        self.experiment_list.set_records(self.index.query(**self.filters()))
 
-    def create_widgets(self, material, coating, stage):
-        self.scrollbar = tk.Scrollbar(orient=tk.VERTICAL)
-        self.canvas = tk.Canvas(self, yscrollcommand=self.scrollbar.set)
+    def open_experiment_folder(self, record: ExperimentRecord) -> None:
+        open_folder_in_explorer(os.path.join(self.main_path, record.key))
 
-        self.scrollbar.config(command=self.canvas.yview)
-        self.canvas.grid(column=0, row=0, ipadx=8, ipady=8, sticky='nswe')
-        self.scrollbar.grid(row=0, column=1, sticky='ns')
+    def plot_show(self, record: ExperimentRecord) -> None:
+        """
+        Функция для отображения графиков.
+        :param record: принимает запись каталога, данные эксперимента загружаются из хранилища.
+        :return: None
+        """
+        couple = Couple.from_store(self.store, record.key, lazy=True)
+        if self.plot_surface is None:
+            self.create_plot_surface()
+        couple.plot.draw(self.plot_surface)
+        # История масштабирования относится к предыдущему эксперименту
+        self.toolbar.update()
+
+    def compare(self) -> None:
+        """
+        Открытие окна сравнения для экспериментов, подходящих под выбранные фильтры.
+        """
+        records = self.index.query(**self.filters())
+        if not records:
+            messagebox.showinfo("Compare", "Нет экспериментов, подходящих под фильтры")
+            return
+        CompareWindow(self.store, records)
 
-        self.viewing_frame = tk.Frame(self.canvas, width=600)
-        self.viewing_frame.pack(padx=8, pady=8)
-        self.canvas.create_window((0, 0), anchor='nw', window=self.viewing_frame)
+    def create_plot_surface(self) -> None:
+        """
+        Создание области графика, холста и панели инструментов. Они создаются один раз и используются
+        для всех экспериментов, при выборе другого эксперимента заменяются только данные линий.
+        """
+        self.plot_frame = tk.Frame(self)
+        self.plot_frame.grid(row=0, column=2, padx=8, pady=8)
+        self.plot_surface = PlotSurface(Figure())
+        self.canvas_plot = FigureCanvasTkAgg(self.plot_surface.figure, master=self.plot_frame)
+        self.canvas_plot.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        # Панель инструментов для масштабирования, точки графика пересчитываются под видимый диапазон
+        self.toolbar = NavigationToolbar2Tk(self.canvas_plot, self.plot_frame, pack_toolbar=False)
+        self.toolbar.pack(side=tk.BOTTOM, fill=tk.X)
 
-        self.label_main_path = tk.Label(self.viewing_frame, text=self.main_path)
+    def clear_plot(self):
+        if self.canvas_plot:
+            self.plot_frame.destroy()
+            self.canvas_plot = None
+            self.plot_surface = None
+
+    def create_widgets(self):
+        self.list_frame = tk.Frame(self)
+        self.list_frame.grid(column=0, row=0, padx=8, pady=8, sticky='nswe')
+        self.list_frame.grid_rowconfigure(1, weight=1)
+        self.list_frame.grid_columnconfigure(0, weight=1)
+        self.label_main_path = tk.Label(self.list_frame, text=self.main_path)
         self.label_main_path.grid(row=0, column=0, padx=8, pady=8, sticky='w')
-
-        if self.list_couple:
-            if self.combobox_material:
-                create_widgets_experiments(self, self.viewing_frame, self.list_couple, material, coating, stage)
-            else:
-                create_widgets_experiments(self, self.viewing_frame, self.list_couple)
-
-        self.canvas.update_idletasks()
-        self.canvas["scrollregion"] = self.canvas.bbox("all")
-        self.viewing_frame.bind('<MouseWheel>', lambda event: on_mouse_wheel(event, self.canvas))
-        self.bind('<MouseWheel>', lambda event: on_mouse_wheel(event, self.canvas))
+        # Выбор строки строит график эксперимента, двойной щелчок открывает папку эксперимента
+        self.experiment_list = ExperimentList(self.list_frame, on_select=self.plot_show,
+                                              on_open=self.open_experiment_folder)
+        self.experiment_list.grid(row=1, column=0, sticky='nswe')
 
         self.frame_filter_update = tk.LabelFrame(self, text="Experiment filter", padx=8, pady=8)
         self.frame_filter_update.grid(padx=5, pady=5, sticky='we')
         self.button_update = tk.Button(self.frame_filter_update, text="Update", command=self.update_data_base, width=15)
         self.button_update.grid(row=0, column=0, padx=5, pady=5)
-        if self.list_couple:
-            self.combobox_material = ttk.Combobox(self.frame_filter_update,
-                                                  values=list(
-                                                      set([couple.strength.material for couple in self.list_couple])),
-                                                  state='normal')
-            self.combobox_material.grid(row=0, column=1, padx=8, pady=8)
-            self.combobox_coating = ttk.Combobox(self.frame_filter_update,
-                                                 values=list(
-                                                     set([couple.strength.coating for couple in self.list_couple])),
-                                                 state='normal')
-            self.combobox_coating.grid(row=0, column=2, padx=8, pady=8)
-            self.combobox_stage = ttk.Combobox(self.frame_filter_update,
-                                               values=list(
-                                                   set([couple.strength.stage for couple in self.list_couple])),
-                                               state='normal')
-            self.combobox_stage.grid(row=0, column=3, padx=8, pady=8)
+        self.combobox_material = ttk.Combobox(self.frame_filter_update, state='normal')
+        self.combobox_material.grid(row=0, column=1, padx=8, pady=8)
+        self.combobox_coating = ttk.Combobox(self.frame_filter_update, state='normal')
+        self.combobox_coating.grid(row=0, column=2, padx=8, pady=8)
+        self.combobox_stage = ttk.Combobox(self.frame_filter_update, state='normal')
+        self.combobox_stage.grid(row=0, column=3, padx=8, pady=8)
+        for combobox in (self.combobox_material, self.combobox_coating, self.combobox_stage):
+            combobox.bind('<<ComboboxSelected>>', self.apply_filter)
+            combobox.bind('<Return>', self.apply_filter)
+        self.button_compare = tk.Button(self.frame_filter_update, text="Compare", command=self.compare,
+                                        width=15)
+        self.button_compare.grid(row=0, column=4, padx=5, pady=5)
 
         # self.search_widget = ttk.Combobox(self.frame_add_password,
         #                                   values=list(set([passw.company for passw in self.list_password.list_pass])),
@@ -204,47 +267,47 @@ class App(tk.Tk):
         self.button_full_data = tk.Button(self.create_data_frame, text="Create Full data", command=self.full_data,
                                           width=15)
         self.button_full_data.grid(row=0, column=2, padx=8, pady=8)
+        self.progress_bar = ttk.Progressbar(self.create_data_frame, variable=self.progress_var, maximum=100,
+                                            length=300)
+        self.progress_bar.grid(row=1, column=0, columnspan=2, padx=8, pady=8, sticky='we')
+        self.button_cancel = tk.Button(self.create_data_frame, text="Cancel", command=self.worker.cancel, width=15)
+        self.button_cancel.grid(row=1, column=2, padx=8, pady=8)
+        self.label_status = tk.Label(self.create_data_frame, textvariable=self.status_var)
+        self.label_status.grid(row=2, column=0, columnspan=3, padx=8, pady=8, sticky='w')
+        self.check_excel = tk.Checkbutton(self.create_data_frame, text="Excel", variable=self.excel_var)
+        self.check_excel.grid(row=0, column=3, padx=8, pady=8)
+        self.button_export = tk.Button(self.create_data_frame, text="Export all", command=self.export_all, width=15)
+        self.button_export.grid(row=1, column=3, padx=8, pady=8)
+        self.label_export = tk.Label(self.create_data_frame, textvariable=self.export_var)
+        self.label_export.grid(row=2, column=3, padx=8, pady=8, sticky='w')
+        self.check_profile = tk.Checkbutton(self.create_data_frame, text="Profile", variable=self.profile_var)
+        self.check_profile.grid(row=0, column=4, padx=8, pady=8)
+        tk.Label(self.create_data_frame, text="Zero").grid(row=1, column=4, padx=8, pady=(8, 0))
+        self.combobox_estimator = ttk.Combobox(self.create_data_frame, textvariable=self.estimator_var,
+                                               values=list(BASELINE_ESTIMATORS), state='readonly', width=12)
+        self.combobox_estimator.grid(row=2, column=4, padx=8, pady=(0, 8))
 
     def full_data(self):
         """
         Функция для для добавления данных в базу данных.
-        list_all_path_strength_temperature - находит все папки где есть папки Сила и Температура
+        find_import_tasks - находит все папки где есть папки Силы и Температура.
+        Метаданные всех найденных экспериментов подтверждаются один раз в таблице ConfirmImport,
+        затем эксперименты обрабатываются параллельно функцией run_import.
         :return: None
         """
         directory = fd.askdirectory(title="Выберите папку с данными", initialdir=self.search_path)
-        list_tuple_strength_temperature = list_all_path_strength_temperature(directory)
-        for strength, temperature in list_tuple_strength_temperature:
-            material, coating, tool, stage = extract_param_path(strength)
-            app_confirm = AddData(material, coating, tool, stage, strength)
-            app_confirm.mainloop()
-            material = app_confirm.material
-            coating = app_confirm.coating
-            tool = app_confirm.tool
-            stage = app_confirm.stage
-            speed = app_confirm.speed
-            feed = app_confirm.feed
-            app_confirm.destroy()
-            try:
-                strength = Strength(path_strength=strength,
-                                    material=material,
-                                    coating=coating,
-                                    tool=tool,
-                                    stage=stage,
-                                    spindle_speed=speed,
-                                    feed=feed)
-                temperature = Temperature(path_temperature=temperature,
-                                          material=material,
-                                          coating=coating,
-                                          tool=tool,
-                                          stage=stage,
-                                          spindle_speed=speed,
-                                          feed=feed,
-                                          couple_strength=strength)
-                couple = Couple(strength=strength,
-                                temperature=temperature)
-                couple.save_file(self.main_path)
-            except IndexError:
-                continue
+        if not directory:
+            return
+        tasks = find_import_tasks(directory)
+        if not tasks:
+            messagebox.showinfo("Import", "Папки Силы и Температура не найдены")
+            return
+        app_confirm = ConfirmImport(tasks)
+        app_confirm.mainloop()
+        tasks = app_confirm.tasks
+        app_confirm.destroy()
+        if tasks:
+            self.start_import(tasks)
 
     def add_data(self):
         """
@@ -263,28 +326,97 @@ class App(tk.Tk):
         speed = app_confirm.speed
         feed = app_confirm.feed
         app_confirm.destroy()
-        strength = Strength(path_strength=dir_strength,
-                            material=material,
-                            coating=coating,
-                            tool=tool,
-                            stage=stage,
-                            spindle_speed=speed,
-                            feed=feed)
-        temperature = Temperature(path_temperature=dir_temperature,
-                                  material=material,
-                                  coating=coating,
-                                  tool=tool,
-                                  stage=stage,
-                                  spindle_speed=speed,
-                                  feed=feed,
-                                  couple_strength=strength)
-
-        couple = Couple(strength=strength,
-                        temperature=temperature)
-
-        couple.save_file(self.main_path)
+        self.start_import([ImportTask(dir_strength, dir_temperature, material, coating, tool, stage, feed, speed)],
+                          jobs=1)
+
+    def start_import(self, tasks: list[ImportTask], jobs: int = None) -> None:
+        """
+        Запуск импорта в фоновом потоке. Ход импорта отображается в progress_bar,
+        готовые эксперименты добавляются в список по мере завершения (см. handle_worker_event).
+        :param tasks: list[ImportTask] - эксперименты для импорта.
+        :param jobs: int - количество процессов для run_import.
+        :return: None
+        """
+        if self.worker.busy:
+            messagebox.showwarning("Import", "Импорт уже выполняется")
+            return
+        self.import_errors = []
+        for task in tasks:
+            task.estimator = self.estimator_var.get()
+        self.import_profiler = StageProfiler() if self.profile_var.get() else None
+        self.progress_var.set(0)
+        self.status_var.set(f'0 / {len(tasks)}')
+        self.worker.submit(run_import, tasks, self.main_path, jobs=jobs, progress=self.worker.report,
+                           cancel_event=self.worker.cancel_event, excel=self.excel_var.get(), exports=self.exports,
+                           profiler=self.import_profiler)
+
+    def poll_worker(self) -> None:
+        """
+        Периодический разбор событий фонового потока в цикле Tk.
+        """
+        self.worker.poll(self.handle_worker_event)
+        self.after(100, self.poll_worker)
+
+    def poll_exports(self) -> None:
+        """
+        Обновление счетчика очереди выгрузки. База очереди читается редко и с коротким ожиданием блокировки:
+        пока ее записывает другой процесс, показываются прежние значения.
+        """
+        counts = self.exports.counts(timeout=EXPORT_POLL_TIMEOUT)
+        if counts is not None:
+            queued = counts.get(PENDING, 0) + counts.get(RUNNING, 0)
+            failed = counts.get(FAILED, 0)
+            self.export_var.set(f'Выгрузка: {queued}, ошибок {failed}' if queued or failed else '')
+        self.after(EXPORT_POLL_INTERVAL, self.poll_exports)
+
+    def export_all(self) -> None:
+        """
+        Повторная выгрузка файлов всех экспериментов из хранилища без повторной обработки исходников.
+        """
+        formats = DEFAULT_FORMATS if self.excel_var.get() else ('files',)
+        self.exports.enqueue_all(formats)
+
+    def handle_worker_event(self, kind: str, payload: Any) -> None:
+        if kind == 'progress':
+            done, total, result = payload
+            self.progress_var.set(100 * done / total)
+            self.status_var.set(f'{done} / {total}: {result.task}')
+            if result.ok and not result.skipped:
+                self.insert_experiment(self.store.record(result.key))
+            elif not result.ok:
+                self.import_errors.append(f'{result.task}: {result.error}')
+        elif kind == 'done':
+            imported = sum(result.ok and not result.skipped for result in payload)
+            skipped = sum(result.skipped for result in payload)
+            status = 'Импорт отменен' if self.worker.cancel_event.is_set() else 'Импорт завершен'
+            self.status_var.set(f'{status}: добавлено {imported}, без изменений {skipped}, '
+                                f'ошибок {len(self.import_errors)}')
+            if self.import_errors:
+                messagebox.showwarning("Import", "\n".join(self.import_errors))
+            if self.import_profiler is not None:
+                ProfileWindow(self.import_profiler)
+        elif kind == 'error':
+            self.status_var.set('Ошибка импорта')
+            messagebox.showerror("Import", f'{type(payload).__name__}: {payload}')
+
+    def insert_experiment(self, record: ExperimentRecord) -> None:
+        """
+        Добавление нового эксперимента в список без перестроения остальных строк.
+        Повторно импортированный эксперимент заменяет прежнюю запись и ее строку в списке.
+        """
+        replaced = record.key in self.index
+        self.index.add(record)
+        if replaced:
+            self.list_record = [record if item.key == record.key else item for item in self.list_record]
+        else:
+            self.list_record = (self.list_record or []) + [record]
+        self.update_filter_values()
+        if record.key in self.index.keys(**self.filters()):
+            self.experiment_list.upsert(record)
 
     def destroy(self):
+        self.worker.shutdown()
+        self.exports.stop(timeout=5)
         self.clear_plot()
         super().destroy()
 
@@ -298,31 +430,18 @@ class AddData(tk.Tk):
         self.title(path_strength)
         self.geometry("600x400")
 
-        if 'ХН' in material:
-            self.label_speed = tk.Label(self, text="Spindle Speed")
-            self.label_speed.pack()
-            self.entry_speed = tk.Entry(self)
-            self.entry_speed.insert(0, "800")
-            self.entry_speed.pack()
+        feed, speed = default_cutting_params(material)
+        self.label_speed = tk.Label(self, text="Spindle Speed")
+        self.label_speed.pack()
+        self.entry_speed = tk.Entry(self)
+        self.entry_speed.insert(0, f"{speed:g}")
+        self.entry_speed.pack()
 
-            self.label_feed = tk.Label(self, text="Feed")
-            self.label_feed.pack()
-            self.entry_feed = tk.Entry(self)
-            self.entry_feed.insert(0, "53")
-            self.entry_feed.pack()
-
-        else:
-            self.label_speed = tk.Label(self, text="Spindle Speed")
-            self.label_speed.pack()
-            self.entry_speed = tk.Entry(self)
-            self.entry_speed.insert(0, "2000")
-            self.entry_speed.pack()
-
-            self.label_feed = tk.Label(self, text="Feed")
-            self.label_feed.pack()
-            self.entry_feed = tk.Entry(self)
-            self.entry_feed.insert(0, "200")
-            self.entry_feed.pack()
+        self.label_feed = tk.Label(self, text="Feed")
+        self.label_feed.pack()
+        self.entry_feed = tk.Entry(self)
+        self.entry_feed.insert(0, f"{feed:g}")
+        self.entry_feed.pack()
 
         self.label_material = tk.Label(self, text="Material")
         self.label_material.pack()
@@ -359,3 +478,154 @@ class AddData(tk.Tk):
         self.speed = float(self.entry_speed.get())
         self.feed = float(self.entry_feed.get())
         self.quit()
+
+
+class ConfirmImport(tk.Tk):
+    """
+    Таблица для подтверждения метаданных всех найденных экспериментов перед пакетным импортом,
+    т.к. функция extract_param_path может работать некореектно. Каждая строка - один эксперимент,
+    снятый флажок исключает эксперимент из импорта. Закрытие окна отменяет импорт.
+    """
+    def __init__(self, tasks: list[ImportTask]):
+        super().__init__()
+        self.title("Confirm import")
+        self.geometry("1300x600")
+        self.tasks: list[ImportTask] = []
+        self.protocol("WM_DELETE_WINDOW", self.quit)
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL)
+        self.canvas = tk.Canvas(self, yscrollcommand=self.scrollbar.set)
+        self.scrollbar.config(command=self.canvas.yview)
+        self.canvas.grid(row=0, column=0, sticky='nswe')
+        self.scrollbar.grid(row=0, column=1, sticky='ns')
+        self.table = tk.Frame(self.canvas)
+        self.canvas.create_window((0, 0), anchor='nw', window=self.table)
+        self.bind('<MouseWheel>', lambda event: on_mouse_wheel(event, self.canvas))
+
+        tk.Label(self.table, text="Path").grid(row=0, column=1, padx=4, pady=4)
+        for column, name in enumerate(ImportTask.FIELDS, start=2):
+            tk.Label(self.table, text=name).grid(row=0, column=column, padx=4, pady=4)
+
+        self.rows: list[tuple[ImportTask, tk.BooleanVar, dict[str, tk.Entry]]] = []
+        for row, task in enumerate(tasks, start=1):
+            selected = tk.BooleanVar(self, value=True)
+            tk.Checkbutton(self.table, variable=selected).grid(row=row, column=0)
+            tk.Label(self.table, text=os.path.dirname(task.path_strength)).grid(row=row, column=1, sticky='w')
+            entries = {}
+            for column, name in enumerate(ImportTask.FIELDS, start=2):
+                entry = tk.Entry(self.table, width=14)
+                entry.insert(0, f"{getattr(task, name):g}" if name in ('feed', 'spindle_speed')
+                             else getattr(task, name))
+                entry.grid(row=row, column=column, padx=2, pady=2)
+                entries[name] = entry
+            self.rows.append((task, selected, entries))
+
+        self.table.update_idletasks()
+        self.canvas.config(scrollregion=self.canvas.bbox("all"))
+        self.button_confirm = tk.Button(self, text="Confirm", command=self.confirm_data, width=15)
+        self.button_confirm.grid(row=1, column=0, padx=10, pady=10)
+
+    def confirm_data(self):
+        self.tasks = []
+        for task, selected, entries in self.rows:
+            if not selected.get():
+                continue
+            values = {name: entry.get() for name, entry in entries.items()}
+            values['feed'] = float(values['feed'])
+            values['spindle_speed'] = float(values['spindle_speed'])
+            self.tasks.append(ImportTask(task.path_strength, task.path_temperature, **values))
+        self.quit()
+
+
+class CompareWindow(tk.Tk):
+    """
+    Окно сравнения экспериментов. Слева список экспериментов с флажками, справа графики силы и температуры
+    всех отмеченных экспериментов на общей сетке времени с прямыми регрессии (ComparisonPlot).
+    При изменении флажка загружается или убирается только этот эксперимент.
+    """
+    # Сколько экспериментов отмечено при открытии окна, чтобы не загружать сразу весь список
+    INITIAL_SELECTED = 5
+
+    def __init__(self, store: ExperimentStore, records: list[ExperimentRecord]):
+        super().__init__()
+        self.title("Compare experiments")
+        self.geometry("1400x800")
+        self.store = store
+        self.comparison = ComparisonPlot()
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(1, weight=1)
+
+        self.list_frame = tk.Frame(self)
+        self.list_frame.grid(row=0, column=0, padx=8, pady=8, sticky='ns')
+        self.selected: dict[str, tk.BooleanVar] = {}
+        for row, record in enumerate(records):
+            selected = tk.BooleanVar(self, value=row < self.INITIAL_SELECTED)
+            tk.Checkbutton(self.list_frame, text=f'{record}', variable=selected, anchor='w',
+                           command=lambda key=record.key: self.toggle(key)).grid(row=row, column=0, sticky='w')
+            self.selected[record.key] = selected
+
+        self.figure = Figure(figsize=(9, 7))
+        self.canvas_plot = FigureCanvasTkAgg(self.figure, master=self)
+        self.canvas_plot.get_tk_widget().grid(row=0, column=1, padx=8, pady=8, sticky='nswe')
+        toolbar = NavigationToolbar2Tk(self.canvas_plot, self, pack_toolbar=False)
+        toolbar.grid(row=1, column=1, sticky='we')
+
+        for key, selected in self.selected.items():
+            if selected.get():
+                self.comparison.add(Couple.from_store(self.store, key, lazy=True), key)
+        self.redraw()
+
+    def toggle(self, key: str) -> None:
+        if self.selected[key].get():
+            self.comparison.add(Couple.from_store(self.store, key, lazy=True), key)
+        else:
+            self.comparison.remove(key)
+        self.redraw()
+
+    def redraw(self) -> None:
+        self.comparison.show_plots(self.figure)
+        self.canvas_plot.draw_idle()
+
+
+class ProfileWindow(tk.Tk):
+    """
+    Отчет профилирования импорта: время, процессорное время, пиковая память и строки по этапам.
+    Переключатель показывает этапы всех экспериментов суммарно или по каждому эксперименту,
+    отчет можно сохранить в json.
+    """
+    TITLES = {'experiment': 'Эксперимент', 'stage': 'Этап', 'calls': 'Вызовов', 'wall': 'Время, с',
+              'cpu': 'CPU, с', 'peak_memory': 'Память, МБ', 'rows': 'Строк'}
+
+    def __init__(self, profiler: StageProfiler):
+        super().__init__()
+        self.title("Import profile")
+        self.geometry("1000x500")
+        self.profiler = profiler
+        self.by_experiment = tk.BooleanVar(self, value=False)
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(self, columns=REPORT_FIELDS, show='headings')
+        for name in REPORT_FIELDS:
+            self.tree.heading(name, text=self.TITLES[name])
+            self.tree.column(name, width=320 if name == 'experiment' else 90,
+                             anchor='w' if name in ('experiment', 'stage') else 'e')
+        self.tree.grid(row=0, column=0, columnspan=3, padx=8, pady=8, sticky='nswe')
+        tk.Checkbutton(self, text="By experiment", variable=self.by_experiment,
+                       command=self.fill).grid(row=1, column=0, padx=8, pady=8, sticky='w')
+        tk.Button(self, text="Save", command=self.save, width=15).grid(row=1, column=1, padx=8, pady=8)
+        self.fill()
+
+    def fill(self) -> None:
+        self.tree.delete(*self.tree.get_children())
+        for record in (self.profiler.report() if self.by_experiment.get() else self.profiler.summary()):
+            self.tree.insert('', tk.END, values=(record['experiment'], record['stage'], record['calls'],
+                                                 f'{record["wall"]:.3f}', f'{record["cpu"]:.3f}',
+                                                 f'{record["peak_memory"] / 2 ** 20:.1f}', record['rows']))
+
+    def save(self) -> None:
+        path = fd.asksaveasfilename(parent=self, defaultextension='.json', filetypes=[('JSON', '*.json')])
+        if path:
+            self.profiler.save(path)
@@ -0,0 +1,70 @@
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class BackgroundWorker:
+    """
+    Фоновый поток для долгих операций (импорт, запись файлов), чтобы окно Tk не зависало.
+    Функция выполняется в отдельном потоке, а о ходе работы сообщает через очередь событий,
+    которую цикл Tk разбирает методом poll, вызываемым через after. Виджеты изменяются только
+    в обработчике событий, т.е. в основном потоке.
+
+    События - кортежи (kind, payload):
+    ('progress', payload) - промежуточный результат, переданный в report;
+    ('done', result) - функция завершилась и вернула result;
+    ('error', exception) - функция завершилась с исключением.
+    """
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.events: queue.Queue[tuple[str, Any]] = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.future: Optional[Future] = None
+
+    @property
+    def busy(self) -> bool:
+        return self.future is not None and not self.future.done()
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        Запуск функции в фоновом потоке. Одновременно выполняется только одна функция.
+        Для отчета о ходе работы передайте в функцию self.report, для отмены - self.cancel_event.
+        """
+        if self.busy:
+            raise RuntimeError('Фоновая задача уже выполняется')
+        self.cancel_event.clear()
+        self.future = self.executor.submit(self._run, func, *args, **kwargs)
+        return self.future
+
+    def _run(self, func: Callable, *args, **kwargs) -> None:
+        try:
+            self.events.put(('done', func(*args, **kwargs)))
+        except Exception as error:
+            self.events.put(('error', error))
+
+    def report(self, *payload) -> None:
+        """
+        Отправка промежуточного результата из фонового потока.
+        """
+        self.events.put(('progress', payload))
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+
+    def poll(self, handler: Callable[[str, Any], None]) -> None:
+        """
+        Разбор накопившихся событий, вызывается из основного потока.
+        :param handler: функция handler(kind, payload).
+        """
+        while True:
+            try:
+                kind, payload = self.events.get_nowait()
+            except queue.Empty:
+                return
+            handler(kind, payload)
+
+    def shutdown(self) -> None:
+        self.cancel()
+        self.executor.shutdown(wait=False)